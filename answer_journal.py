@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+答题日志 - 答案先保存在内存中，定时或在翻题、交卷、退出时合并为一个事务写入数据库
+
+配合WAL模式的数据库，异常退出时最多丢失一个刷新周期内的答案。
+可以用take()取出缓冲交给后台数据库线程通过write_batch()写入
+"""
+
+import sqlite3
+from datetime import datetime
+
+# 定时刷新间隔（秒），也是异常退出时最多丢失答案的时间
+FLUSH_INTERVAL = 3
+
+
+class AnswerJournal:
+    """答案和练习位置的写缓冲"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._answers = {}  # {(bank_id, mode, question_id): (user_answer, answered_at)}
+        self._config = {}  # {key: value}，如上次练习位置
+
+    @property
+    def pending_count(self):
+        """尚未写入数据库的记录数"""
+        return len(self._answers) + len(self._config)
+
+    def record_answer(self, bank_id, mode, question_id, user_answer):
+        """记录一道题的答案，同一道题只保留最后一次的答案"""
+        self._answers[(bank_id, mode, question_id)] = (user_answer, datetime.now())
+
+    def record_config(self, key, value):
+        """记录一条配置项"""
+        self._config[key] = value
+
+    def take(self):
+        """
+        取出缓冲的全部记录并清空缓冲，用于交给后台数据库线程写入
+
+        Returns:
+            (答案, 配置项)，缓冲为空时返回None
+        """
+        if not self._answers and not self._config:
+            return None
+        batch = (self._answers, self._config)
+        self._answers = {}
+        self._config = {}
+        return batch
+
+    def restore(self, batch):
+        """写入失败时把取出的记录放回缓冲，取出后又有新记录的保留新记录"""
+        answers, config = batch
+        for key, value in answers.items():
+            self._answers.setdefault(key, value)
+        for key, value in config.items():
+            self._config.setdefault(key, value)
+
+    def flush(self):
+        """
+        将缓冲的记录在一个事务中写入数据库
+
+        写入失败时回滚并保留缓冲，抛出sqlite3.Error，下次刷新时重试
+
+        Returns:
+            写入的记录数
+        """
+        batch = self.take()
+        if batch is None:
+            return 0
+
+        try:
+            return write_batch(self.conn, batch)
+        except sqlite3.Error:
+            self.restore(batch)
+            raise
+
+
+def write_batch(conn, batch):
+    """
+    在一个事务中写入take()取出的记录，失败时回滚并抛出sqlite3.Error
+
+    Returns:
+        写入的记录数
+    """
+    answers, config = batch
+    cursor = conn.cursor()
+    try:
+        if answers:
+            cursor.executemany('''
+            INSERT OR REPLACE INTO progress
+            (bank_id, mode, question_id, user_answer, answered_at)
+            VALUES (?, ?, ?, ?, ?)
+            ''', [key + value for key, value in answers.items()])
+
+        if config:
+            cursor.executemany(
+                "INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)",
+                list(config.items())
+            )
+
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    return len(answers) + len(config)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+题库数据访问 - 题库、题目、答题进度和练习位置的查询
+
+函数的第一个参数都是数据库连接，可以直接调用，也可以提交给后台数据库线程执行
+"""
+
+from question_order import load_order
+from question_record import Question
+from wrong_set import load_all_wrong_questions
+
+
+def find_last_used_bank(conn):
+    """
+    查找上次使用的题库
+
+    Returns:
+        (题库ID, 题库名称)，没有时返回None
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, name FROM question_banks WHERE is_last_used = 1 LIMIT 1")
+    return cursor.fetchone()
+
+
+def set_last_used_bank(conn, bank_id):
+    """设置指定题库为上次使用的题库，调用方负责提交事务"""
+    cursor = conn.cursor()
+    # 先清除所有上次使用标记
+    cursor.execute("UPDATE question_banks SET is_last_used = 0")
+    # 设置当前题库为上次使用
+    cursor.execute("UPDATE question_banks SET is_last_used = 1 WHERE id = ?", (bank_id,))
+
+
+def load_questions(conn, bank_id):
+    """按ID顺序读取题库的全部题目"""
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT id, content, type, is_subquestion, options, difficulty, analysis, answer, score "
+        "FROM questions WHERE bank_id = ? ORDER BY id",
+        (bank_id,)
+    )
+    return [Question.from_row(row) for row in cursor.fetchall()]
+
+
+def load_bank(conn, bank_id):
+    """
+    读取题库的题目和错题集
+
+    Returns:
+        (题目列表, 错题列表)
+    """
+    return load_questions(conn, bank_id), load_all_wrong_questions(conn, bank_id)
+
+
+def load_progress(conn, bank_id, mode):
+    """读取某种练习模式的答题进度 {题目ID: 用户答案}"""
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT question_id, user_answer FROM progress WHERE bank_id = ? AND mode = ?",
+        (bank_id, mode)
+    )
+    return dict(cursor.fetchall())
+
+
+def load_position(conn, bank_id, mode):
+    """读取某种练习模式上次的位置，没有时返回None"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT value FROM config WHERE key = ?", (f"last_position_{mode}_{bank_id}",))
+    result = cursor.fetchone()
+    return int(result[0]) if result else None
+
+
+def save_exam_config(conn, exam_config):
+    """保存组卷的题目数量，调用方负责提交事务"""
+    conn.executemany(
+        "INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)",
+        [('single_count', str(exam_config['single'])),
+         ('multiple_count', str(exam_config['multiple'])),
+         ('judge_count', str(exam_config['judge']))]
+    )
+
+
+def save_font_size(conn, font_size):
+    """保存字体大小设置，调用方负责提交事务"""
+    conn.execute(
+        "INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)",
+        ('font_size', str(font_size))
+    )
+
+
+def load_practice_state(conn, bank_id, mode):
+    """
+    读取开始练习所需的数据
+
+    Returns:
+        (答题进度, 上次的位置, 保存的题目顺序)，没有位置或顺序时对应项为None
+    """
+    return (load_progress(conn, bank_id, mode),
+            load_position(conn, bank_id, mode),
+            load_order(conn, bank_id, mode))
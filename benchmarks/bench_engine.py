@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+刷题引擎吞吐量测试 - 不需要图形界面，测试开始练习、组卷和交卷判分的耗时
+
+在临时目录中的WAL数据库上测试，与程序实际使用的数据库设置相同
+
+用法:
+    python benchmarks/bench_engine.py --sizes 1000 10000 100000 --repeat 5
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_migrations import migrate  # noqa: E402
+from exam_engine import ExamEngine  # noqa: E402
+from practice_session import RANDOM, SEQUENCE  # noqa: E402
+
+TYPES = ["单选", "多选", "判断"]
+
+
+def create_database(path, count):
+    """创建包含count道题的题库，三种题型各占三分之一"""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    migrate(conn)
+    conn.execute("INSERT INTO question_banks (name, is_last_used) VALUES ('bench', 1)")
+    conn.executemany(
+        "INSERT INTO questions (bank_id, content, type, options, answer, score) VALUES (1, ?, ?, ?, ?, 1)",
+        [(f"题目{i}", TYPES[i % 3], "" if i % 3 == 2 else "选项A|选项B|选项C|选项D",
+          "正确" if i % 3 == 2 else "A") for i in range(count)]
+    )
+    conn.commit()
+    return conn
+
+
+def timed(fn):
+    """执行fn，返回(结果, 耗时毫秒)"""
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run(size, repeat, exam_size):
+    """在新数据库上测试，返回{操作: [耗时毫秒, ...]}"""
+    samples = {"加载题库": [], "顺序练习": [], "随机练习": [], "组卷": [], "交卷判分": []}
+    rng = random.Random(size)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = create_database(os.path.join(tmp, "bench.db"), size)
+        try:
+            for _ in range(repeat):
+                engine, elapsed = timed(lambda: ExamEngine(conn))
+                samples["加载题库"].append(elapsed)
+
+                _, elapsed = timed(lambda: engine.start_practice(SEQUENCE))
+                samples["顺序练习"].append(elapsed)
+                _, elapsed = timed(lambda: engine.start_practice(RANDOM, shuffle=rng.shuffle))
+                samples["随机练习"].append(elapsed)
+
+                per_type = min(exam_size // 3, size // 3)
+                config = {"single": per_type, "multiple": per_type, "judge": per_type}
+                session, elapsed = timed(lambda: engine.create_exam(config, sample=rng.sample))
+                samples["组卷"].append(elapsed)
+
+                # 一半答对，其余答错或未答
+                for question in session.questions:
+                    roll = rng.random()
+                    if roll < 0.5:
+                        session.record_answer(question.id, question.answer)
+                    elif roll < 0.8:
+                        session.record_answer(question.id, "B")
+                _, elapsed = timed(lambda: engine.calculate_exam_result(session))
+                samples["交卷判分"].append(elapsed)
+
+                # 清空错题集，下一轮重新写入
+                conn.execute("DELETE FROM wrong_questions")
+                conn.commit()
+        finally:
+            conn.close()
+    return samples
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="刷题引擎吞吐量测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="题库题目数量")
+    parser.add_argument("--repeat", type=int, default=5, help="每种规模的重复次数")
+    parser.add_argument("--exam-size", type=int, default=3000, help="试卷题目数量")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        print(f"{size} 题:")
+        for name, values in run(size, args.repeat, args.exam_size).items():
+            print(f"  {name}: 中位数 {statistics.median(values):.1f} ms, 最大 {max(values):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
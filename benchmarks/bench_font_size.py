@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+修改字体大小的耗时测试 - 对比逐个重新配置控件字体和样式的旧做法和共享的命名字体
+
+答题界面包含题目视图和大量题目的进度网格，每次修改后调用update_idletasks()，
+让布局和重绘计入耗时。需要图形界面（可在Xvfb中运行）
+
+用法:
+    python benchmarks/bench_font_size.py --questions 10000 --changes 20
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from progress_grid import ProgressGrid  # noqa: E402
+from question_index import QuestionNumbering  # noqa: E402
+from question_record import Question  # noqa: E402
+from question_view import QuestionView  # noqa: E402
+from ui_fonts import FontScheme  # noqa: E402
+
+FONT_FAMILY = "SimHei"
+COLORS = {
+    "card": "#ffffff",
+    "text": "#202124",
+    "text_light": "#5f6368",
+    "primary": "#4285f4",
+    "success": "#4caf50",
+    "danger": "#f44336",
+}
+
+# 样式名: (相对基础大小的增量, 粗细)，与原setup_styles相同
+STYLES = {
+    "TButton": (0, "normal"),
+    "TLabel": (0, "normal"),
+    "Header.TLabel": (6, "bold"),
+    "Title.TLabel": (14, "bold"),
+    "Question.TLabel": (2, "normal"),
+    "Option.TRadiobutton": (1, "normal"),
+    "Option.TCheckbutton": (1, "normal"),
+    "Status.TLabel": (0, "normal"),
+    "Primary.TButton": (0, "bold"),
+}
+
+
+def make_questions(count):
+    """按单选、多选、判断各占三分之一生成题目"""
+    types = ["单选", "多选", "判断"]
+    return [Question(
+        i, f"第{i}道合成题目，" + "题目内容" * 20, types[i % 3], 0,
+        "" if i % 3 == 2 else "|".join(f"选项{chr(65 + j)}" for j in range(4)), "中等", "", "A", 1
+    ) for i in range(count)]
+
+
+def build_screen(root, fonts, questions):
+    """创建题目视图和进度网格，返回(界面框架, 题目视图, 进度网格, 编号表)"""
+    frame = tk.Frame(root)
+    frame.pack(fill=tk.BOTH, expand=True)
+    canvas = tk.Canvas(frame, bg=COLORS["card"], highlightthickness=0)
+    scrollbar = ttk.Scrollbar(frame, orient="vertical")
+    canvas.pack(side=tk.LEFT, fill=tk.Y)
+    scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+    info_frame = tk.Frame(frame, bg=COLORS["card"])
+    info_frame.pack(fill=tk.X)
+    content_frame = tk.Frame(frame)
+    content_frame.pack(fill=tk.BOTH, expand=True)
+
+    numbering = QuestionNumbering(questions)
+    grid = ProgressGrid(canvas, scrollbar, fonts, COLORS, on_select=lambda index: None)
+    grid.set_questions(numbering, lambda index: index % 2 == 0, 0)
+    view = QuestionView(content_frame, info_frame, fonts, COLORS, on_answer=lambda q: None)
+    view.show(questions[0], None, numbering.number(0), len(questions))
+    root.update_idletasks()
+    return frame, view, grid, numbering
+
+
+def walk(widget):
+    """遍历控件及其全部子控件"""
+    yield widget
+    for child in widget.winfo_children():
+        yield from walk(child)
+
+
+def legacy_change(root, style, frame, view, grid, numbering, questions, size):
+    """旧做法：用字体元组重新配置全部样式和控件，重新显示题目并重建进度网格"""
+    for name, (delta, weight) in STYLES.items():
+        style.configure(name, font=(FONT_FAMILY, size + delta, weight))
+    for widget in walk(frame):
+        if isinstance(widget, (tk.Radiobutton, tk.Checkbutton)):
+            widget.config(font=(FONT_FAMILY, size + 1))
+        elif isinstance(widget, ttk.Label):
+            widget.config(font=(FONT_FAMILY, size))
+    view.show(questions[0], None, numbering.number(0), len(questions))
+    grid.fonts.size = size
+    grid.set_questions(numbering, grid.is_answered, grid.current_index)
+
+
+def named_change(fonts, grid, size):
+    """命名字体：只修改字体对象，进度网格重新布局一次"""
+    if fonts.set_size(size):
+        grid.relayout()
+
+
+def measure(root, changes, change):
+    """在两个字体大小之间来回切换，返回每次修改的耗时（毫秒）"""
+    samples = []
+    for i in range(changes):
+        size = 14 if i % 2 == 0 else 10
+        start = time.perf_counter()
+        change(size)
+        root.update_idletasks()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name, samples):
+    """打印耗时统计"""
+    samples = sorted(samples)
+    print(f"{name}: 中位数 {statistics.median(samples):.2f} ms, 最大 {samples[-1]:.2f} ms")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="修改字体大小的耗时测试")
+    parser.add_argument("--questions", type=int, default=10000, help="练习的题目数量")
+    parser.add_argument("--changes", type=int, default=20, help="修改字体大小的次数")
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"无法创建窗口（需要图形界面，可在Xvfb中运行）: {e}")
+        sys.exit(1)
+    root.geometry("1000x700")
+    style = ttk.Style()
+    questions = make_questions(args.questions)
+
+    # 旧做法
+    fonts = FontScheme(root, FONT_FAMILY)
+    frame, view, grid, numbering = build_screen(root, fonts, questions)
+    legacy = measure(root, args.changes,
+                     lambda size: legacy_change(root, style, frame, view, grid, numbering, questions, size))
+    frame.destroy()
+
+    # 命名字体
+    fonts = FontScheme(root, FONT_FAMILY)
+    frame, view, grid, numbering = build_screen(root, fonts, questions)
+    named = measure(root, args.changes, lambda size: named_change(fonts, grid, size))
+
+    root.destroy()
+
+    print(f"题目数量: {args.questions}, 修改次数: {args.changes}")
+    report("逐个配置控件", legacy)
+    report("命名字体", named)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量判分性能测试 - 生成题库和答题卡文件，用grade_sheets在不同进程数下判分
+
+用法:
+    python benchmarks/bench_grading.py --sheets 100000 --paper-size 50 --workers 1 4
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_engine import create_database  # noqa: E402
+from grade_sheets import grade_sheets, read_jsonl  # noqa: E402
+
+
+def write_sheets(path, count, question_ids, paper_size):
+    """生成JSONL答题卡：每张答题卡随机抽题，六成答A，两成答B，其余未答"""
+    rng = random.Random(count)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            paper = rng.sample(question_ids, paper_size)
+            answers = {}
+            for question_id in paper:
+                roll = rng.random()
+                if roll < 0.6:
+                    answers[question_id] = "A"
+                elif roll < 0.8:
+                    answers[question_id] = "B"
+            f.write(json.dumps({"sheet_id": f"s{i}", "questions": paper, "answers": answers}) + "\n")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="批量判分性能测试")
+    parser.add_argument("--sheets", type=int, default=100000, help="答题卡数量")
+    parser.add_argument("--questions", type=int, default=3000, help="题库题目数量")
+    parser.add_argument("--paper-size", type=int, default=50, help="每张答题卡的题目数")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1], help="判分进程数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        conn = create_database(db_path, args.questions)
+        question_ids = [row[0] for row in conn.execute("SELECT id FROM questions")]
+        conn.close()
+
+        sheets_path = os.path.join(tmp, "sheets.jsonl")
+        write_sheets(sheets_path, args.sheets, question_ids, args.paper_size)
+        print(f"答题卡: {args.sheets} 张，每张 {args.paper_size} 题")
+
+        for workers in dict.fromkeys(args.workers):
+            count = 0
+
+            def on_score(score):
+                nonlocal count
+                count += 1
+
+            start = time.perf_counter()
+            with open(sheets_path, encoding="utf-8") as f:
+                grade_sheets(db_path, 1, read_jsonl(f), on_score, workers)
+            elapsed = time.perf_counter() - start
+            assert count == args.sheets, "判分数量不一致"
+            print(f"{workers} 个进程: {elapsed:.2f} 秒, {count / elapsed:.0f} 张/秒")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+导入性能测试 - 生成与“100道计算机试题.xls”列结构相同的合成题库，
+对比逐行INSERT的旧导入方式和批量导入引擎的速度
+
+用法:
+    python benchmarks/bench_import.py --rows 65535
+    python benchmarks/bench_import.py --rows 100000 --no-xls
+
+.xls格式每个工作表最多65536行，超过时请使用--no-xls直接在内存中生成题目行
+
+参考结果（单核，100000行，--no-xls）：逐行导入约8.3万行/秒，批量导入约11万行/秒，约1.4倍。
+旧方式同样只提交一次事务，两者的主要耗时都是SQLite写入数据和维护索引，批量导入只省去了逐条execute的开销；
+从.xls导入时xlrd解析文件占大部分时间，两者基本持平
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_migrations import migrate  # noqa: E402
+from excel_importer import import_bank, read_excel_rows  # noqa: E402
+
+# 与示例题库相同的表头
+HEADER = [
+    "试题题干(必填)", "试题类型(必填，题型请用下拉菜单实现）", "是否阅读理解子题", "选项（用|隔开）",
+    "难易度 (必填，难易度请选择下拉菜单实现)", "试题解析", "答案（填空题用|隔开）(必填)", "分数"
+]
+
+XLS_MAX_ROWS = 65535
+
+
+def synthetic_row(i, rng):
+    """生成一行合成题目，题型和难度分布与示例题库接近"""
+    question_type = rng.choice(["单选", "单选", "多选", "判断", "判断", "判断"])
+    difficulty = rng.choice(["易", "中", "难"])
+    if question_type == "判断":
+        options = ""
+        answer = rng.choice(["正确", "错误"])
+    else:
+        options = "|".join(f"选项{i}-{j}" for j in range(4))
+        if question_type == "单选":
+            answer = rng.choice("ABCD")
+        else:
+            answer = "".join(sorted(rng.sample("ABCD", rng.randint(2, 4))))
+    return [
+        f"合成题目{i}：以下关于计算机系统的说法哪一项是正确的？",
+        question_type,
+        "否",
+        options,
+        difficulty,
+        f"第{i}题的解析",
+        answer,
+        float(rng.choice([2, 4, 5]))
+    ]
+
+
+def synthetic_rows(count, seed=0):
+    """生成 (行号, 行数据) 序列"""
+    rng = random.Random(seed)
+    return [(i + 2, synthetic_row(i, rng)) for i in range(count)]
+
+
+def write_synthetic_xls(path, count, seed=0):
+    """生成合成题库xls文件"""
+    import xlwt
+
+    workbook = xlwt.Workbook(encoding="utf-8")
+    sheet = workbook.add_sheet("Sheet1")
+    for col, title in enumerate(HEADER):
+        sheet.write(0, col, title)
+    for row_number, row in synthetic_rows(count, seed):
+        for col, value in enumerate(row):
+            sheet.write(row_number - 1, col, value)
+    workbook.save(path)
+
+
+def new_database(path):
+    """创建已升级到最新结构的空数据库"""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    migrate(conn)
+    return conn
+
+
+def legacy_import(conn, bank_name, rows):
+    """旧的导入方式：每行构造字典并单独执行一次INSERT"""
+    from datetime import datetime
+
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT INTO question_banks (name, created_at, updated_at) VALUES (?, ?, ?)",
+        (bank_name, datetime.now(), datetime.now())
+    )
+    bank_id = cursor.lastrowid
+
+    success_count = 0
+    for _, row in rows:
+        try:
+            if not row[0]:
+                continue
+            question = {
+                "bank_id": bank_id,
+                "content": row[0],
+                "type": row[1] if len(row) > 1 else "单选",
+                "is_subquestion": 1 if (len(row) > 2 and str(row[2]).lower() in ["true", "1", "是"]) else 0,
+                "options": "|".join(str(opt).strip() for opt in row[3].split('|')) if (
+                        len(row) > 3 and row[3]) else "",
+                "difficulty": row[4] if len(row) > 4 else "中等",
+                "analysis": row[5] if len(row) > 5 else "",
+                "answer": row[6] if len(row) > 6 else "",
+                "score": float(row[7]) if (len(row) > 7 and row[7]) else 0
+            }
+            if question["type"] == "判断" and not question["options"]:
+                question["options"] = "正确|错误"
+            cursor.execute('''
+            INSERT INTO questions 
+            (bank_id, content, type, is_subquestion, options, difficulty, analysis, answer, score)
+            VALUES (:bank_id, :content, :type, :is_subquestion, :options, :difficulty, :analysis, :answer, :score)
+            ''', question)
+            success_count += 1
+        except Exception as e:
+            print(f"导入失败: {str(e)}")
+    conn.commit()
+    return success_count
+
+
+def run(rows_count, use_xls, batch_size):
+    """执行对比测试，返回结果字典"""
+    with tempfile.TemporaryDirectory() as tmp:
+        if use_xls:
+            xls_path = os.path.join(tmp, "synthetic.xls")
+            write_synthetic_xls(xls_path, rows_count)
+
+            def rows():
+                return read_excel_rows(xls_path)
+        else:
+            data = synthetic_rows(rows_count)
+
+            def rows():
+                return iter(data)
+
+        conn = new_database(os.path.join(tmp, "legacy.db"))
+        start = time.perf_counter()
+        legacy_count = legacy_import(conn, "legacy", rows())
+        legacy_elapsed = time.perf_counter() - start
+        conn.close()
+
+        conn = new_database(os.path.join(tmp, "bulk.db"))
+        start = time.perf_counter()
+        _, progress = import_bank(conn, "bulk", rows(), batch_size=batch_size)
+        bulk_elapsed = time.perf_counter() - start
+        conn.close()
+
+    return {
+        "rows": rows_count,
+        "source": "xls" if use_xls else "memory",
+        "legacy_rows_per_sec": legacy_count / legacy_elapsed,
+        "bulk_rows_per_sec": progress.written / bulk_elapsed,
+        "speedup": legacy_elapsed / bulk_elapsed,
+    }
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="题库导入性能测试")
+    parser.add_argument("--rows", type=int, default=XLS_MAX_ROWS, help="合成题目数量")
+    parser.add_argument("--no-xls", action="store_true", help="不生成xls文件，直接在内存中生成题目行")
+    parser.add_argument("--batch-size", type=int, default=2000, help="每批写入的行数")
+    args = parser.parse_args()
+
+    use_xls = not args.no_xls
+    if use_xls and args.rows > XLS_MAX_ROWS:
+        print(f".xls最多支持{XLS_MAX_ROWS}行题目，请减少--rows或使用--no-xls")
+        return
+
+    result = run(args.rows, use_xls, args.batch_size)
+    print(f"题目数量: {result['rows']}（来源: {result['source']}）")
+    print(f"逐行导入: {result['legacy_rows_per_sec']:.0f} 行/秒")
+    print(f"批量导入: {result['bulk_rows_per_sec']:.0f} 行/秒")
+    print(f"加速比: {result['speedup']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
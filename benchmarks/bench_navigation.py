@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+翻题延迟测试 - 对比每次翻题销毁重建控件的旧做法和复用的题目视图
+
+每次翻题后调用update_idletasks()，让布局和重绘计入耗时。需要图形界面（可在Xvfb中运行）
+
+用法:
+    python benchmarks/bench_navigation.py --navigations 500 --options 6
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import tkinter as tk
+from tkinter import ttk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_record import Question  # noqa: E402
+from question_view import QuestionView  # noqa: E402
+from ui_fonts import FontScheme  # noqa: E402
+
+FONT_FAMILY = "SimHei"
+FONT_SIZE = 10
+COLORS = {
+    "card": "#ffffff",
+    "success": "#4caf50",
+    "danger": "#f44336",
+}
+
+# 每次翻题的延迟目标（毫秒）
+BUDGET_MS = 5.0
+
+
+def make_questions(count, options):
+    """生成多选题，每题options个选项"""
+    return [Question(
+        i, f"第{i}道合成题目，" + "题目内容" * 20, "多选", 0,
+        "|".join(f"选项{chr(65 + j)}的内容 {i}" for j in range(options)), "中等", "", "AC", 2
+    ) for i in range(count)]
+
+
+def legacy_show(content_frame, info_frame, question, number, total):
+    """旧做法：清除全部控件后重新创建（与原update_question_display相同的控件结构）"""
+    for widget in content_frame.winfo_children():
+        widget.destroy()
+    for widget in info_frame.winfo_children():
+        widget.destroy()
+
+    ttk.Label(info_frame, text="未答", font=(FONT_FAMILY, FONT_SIZE, "bold"),
+              foreground=COLORS["danger"], background=COLORS["card"]).pack(side=tk.LEFT, padx=10)
+    for text in (f"题型: {question.type}", f"难度: {question.difficulty}",
+                 f"分数: {question.score}", f"第 {number}/{total} 题"):
+        ttk.Label(info_frame, text=text, font=(FONT_FAMILY, FONT_SIZE),
+                  background=COLORS["card"]).pack(side=tk.LEFT, padx=10)
+
+    card = tk.Frame(content_frame, bg=COLORS["card"], bd=1, relief=tk.SOLID, padx=15, pady=15)
+    card.pack(fill=tk.X, pady=10)
+    ttk.Label(card, text=f"题目: {question.content}", font=(FONT_FAMILY, FONT_SIZE + 2),
+              wraplength=700, justify=tk.LEFT, background=COLORS["card"]).pack(anchor=tk.W, pady=10)
+    options_frame = tk.Frame(card, bg=COLORS["card"])
+    options_frame.pack(fill=tk.BOTH, expand=True, anchor=tk.W, pady=10)
+
+    for i, option in enumerate(question.options):
+        var = tk.BooleanVar()
+        tk.Checkbutton(options_frame, text=f"{chr(65 + i)}. {option}", variable=var,
+                       font=(FONT_FAMILY, FONT_SIZE + 1), anchor=tk.W, bg=COLORS["card"],
+                       cursor="hand2").pack(fill=tk.X, pady=5, padx=5)
+
+
+def measure(root, questions, show):
+    """逐题翻页，返回每次翻题的耗时（毫秒）"""
+    samples = []
+    for i, question in enumerate(questions):
+        start = time.perf_counter()
+        show(question, i + 1)
+        root.update_idletasks()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name, samples):
+    """打印耗时统计"""
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{name}: 中位数 {statistics.median(samples):.2f} ms, "
+          f"P95 {p95:.2f} ms, 最大 {samples[-1]:.2f} ms")
+    return p95
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="翻题延迟测试")
+    parser.add_argument("--navigations", type=int, default=500, help="翻题次数")
+    parser.add_argument("--options", type=int, default=6, help="每道多选题的选项数")
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"无法创建窗口（需要图形界面，可在Xvfb中运行）: {e}")
+        sys.exit(1)
+    root.geometry("1000x700")
+
+    questions = make_questions(args.navigations, args.options)
+    total = len(questions)
+
+    # 旧做法
+    info_frame = tk.Frame(root, bg=COLORS["card"])
+    info_frame.pack(fill=tk.X)
+    content_frame = tk.Frame(root)
+    content_frame.pack(fill=tk.BOTH, expand=True)
+    legacy = measure(root, questions,
+                     lambda q, n: legacy_show(content_frame, info_frame, q, n, total))
+    info_frame.destroy()
+    content_frame.destroy()
+
+    # 复用的题目视图
+    info_frame = tk.Frame(root, bg=COLORS["card"])
+    info_frame.pack(fill=tk.X)
+    content_frame = tk.Frame(root)
+    content_frame.pack(fill=tk.BOTH, expand=True)
+    fonts = FontScheme(root, FONT_FAMILY, FONT_SIZE)
+    view = QuestionView(content_frame, info_frame, fonts, COLORS, on_answer=lambda q: None)
+    reused = measure(root, questions, lambda q, n: view.show(q, None, n, total))
+
+    root.destroy()
+
+    print(f"翻题次数: {args.navigations}, 每题选项数: {args.options}")
+    report("销毁重建", legacy)
+    p95 = report("复用视图", reused)
+    print(f"目标: P95 < {BUDGET_MS} ms -> {'通过' if p95 < BUDGET_MS else '未通过'}")
+
+
+if __name__ == "__main__":
+    main()
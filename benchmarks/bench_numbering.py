@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+题目编号性能测试 - 对比按前缀重新计数的旧算法和编号表
+
+用法:
+    python benchmarks/bench_numbering.py --questions 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_index import QuestionNumbering  # noqa: E402
+from question_record import Question  # noqa: E402
+
+
+def make_paper(count, seed=0):
+    """生成按题型排列的合成试卷"""
+    rng = random.Random(seed)
+    types = sorted((rng.choice(["单选", "多选", "判断"]) for _ in range(count)),
+                   key=["单选", "多选", "判断"].index)
+    return [Question(i, "", question_type, 0, "", "中", "", "A", 1) for i, question_type in enumerate(types)]
+
+
+def legacy_numbers(questions):
+    """旧算法：calculate_exam_result中每道题调用三次index()并对前缀重新计数"""
+    numbers = []
+    for question in questions:
+        single_count = sum(1 for q in questions[:questions.index(question) + 1] if q.type == "单选")
+        multiple_count = sum(1 for q in questions[:questions.index(question) + 1] if q.type == "多选")
+        judge_count = sum(1 for q in questions[:questions.index(question) + 1] if q.type == "判断")
+
+        if question.type == "单选":
+            numbers.append(single_count)
+        elif question.type == "多选":
+            numbers.append(sum(1 for q in questions if q.type == "单选") + multiple_count)
+        else:
+            numbers.append(sum(1 for q in questions if q.type in ["单选", "多选"]) + judge_count)
+    return numbers
+
+
+def table_numbers(questions):
+    """编号表：构建一次，逐题查表"""
+    numbering = QuestionNumbering(questions)
+    return [numbering.number(i) for i in range(len(questions))]
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="题目编号性能测试")
+    parser.add_argument("--questions", type=int, default=5000, help="试卷题目数量")
+    args = parser.parse_args()
+
+    paper = make_paper(args.questions)
+
+    start = time.perf_counter()
+    legacy = legacy_numbers(paper)
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table = table_numbers(paper)
+    table_elapsed = time.perf_counter() - start
+
+    assert legacy == table, "编号结果不一致"
+    print(f"题目数量: {args.questions}")
+    print(f"旧算法: {legacy_elapsed * 1000:.1f} ms")
+    print(f"编号表: {table_elapsed * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+题目内存占用测试 - 对比每道题一个字典的旧做法和紧凑的题目记录
+
+在临时数据库中导入合成题库（一成题目在错题集中），分别在新的子进程中读取全部题目和错题，
+统计读取后常驻内存的增量、读取耗时和数据仍在内存中时一次完整垃圾回收的耗时
+
+用法:
+    python benchmarks/bench_question_memory.py --questions 200000
+"""
+
+import argparse
+import gc
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_import import new_database, synthetic_rows  # noqa: E402
+from bank_store import load_bank  # noqa: E402
+from excel_importer import import_bank  # noqa: E402
+from wrong_set import add_wrong_questions  # noqa: E402
+
+# 错题集占题库的比例
+WRONG_RATE = 0.1
+
+QUESTION_SELECT = (
+    "SELECT id, content, type, is_subquestion, options, difficulty, analysis, answer, score "
+    "FROM questions WHERE bank_id = ? ORDER BY id"
+)
+
+WRONG_SELECT = (
+    "SELECT q.id, q.content, q.type, q.is_subquestion, q.options, q.difficulty, q.analysis, q.answer, q.score, "
+    "w.user_answer, w.added_at FROM wrong_questions w JOIN questions q ON w.question_id = q.id "
+    "WHERE w.bank_id = ? ORDER BY w.added_at DESC, w.question_id DESC"
+)
+
+
+def legacy_question(row):
+    """旧做法：每道题一个字典，选项拆分为列表"""
+    question = {
+        "id": row[0],
+        "content": row[1],
+        "type": row[2],
+        "is_subquestion": row[3],
+        "options": row[4].split('|') if row[4] else [],
+        "difficulty": row[5],
+        "analysis": row[6],
+        "answer": row[7],
+        "score": row[8]
+    }
+    if question["type"] == "判断" and not question["options"]:
+        question["options"] = ["正确", "错误"]
+    return question
+
+
+def legacy_wrong_question(row):
+    """旧做法的错题字典"""
+    question = legacy_question(row)
+    question["user_answer"] = row[9]
+    question["added_at"] = row[10]
+    return question
+
+
+def legacy_load_bank(conn, bank_id):
+    """旧做法：读取题目和错题字典"""
+    questions = [legacy_question(row) for row in conn.execute(QUESTION_SELECT, (bank_id,)).fetchall()]
+    wrong = [legacy_wrong_question(row) for row in conn.execute(WRONG_SELECT, (bank_id,)).fetchall()]
+    return questions, wrong
+
+
+LOADERS = {
+    "字典": legacy_load_bank,
+    "紧凑记录": load_bank,
+}
+
+
+def current_rss():
+    """当前进程的常驻内存（字节），没有/proc时返回峰值"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def measure_child(loader_name, db_path):
+    """在子进程中执行：读取题库，输出一行JSON结果"""
+    conn = sqlite3.connect(db_path)
+    gc.collect()
+    before = current_rss()
+
+    start = time.perf_counter()
+    questions, wrong = LOADERS[loader_name](conn, 1)
+    load_seconds = time.perf_counter() - start
+    conn.close()
+
+    gc.collect()
+    after = current_rss()
+
+    gc_samples = []
+    for _ in range(3):
+        start = time.perf_counter()
+        gc.collect()
+        gc_samples.append(time.perf_counter() - start)
+
+    print(json.dumps({
+        "questions": len(questions),
+        "wrong": len(wrong),
+        "rss_bytes": after - before,
+        "load_ms": load_seconds * 1000,
+        "gc_ms": statistics.median(gc_samples) * 1000,
+        "gc_tracked": len(gc.get_objects()),
+    }))
+
+
+def prepare_database(path, count):
+    """导入合成题库，并将一部分题目放入错题集"""
+    conn = new_database(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    import_bank(conn, "synthetic", iter(synthetic_rows(count)))
+    question_ids = [row[0] for row in conn.execute("SELECT id FROM questions ORDER BY id")]
+    add_wrong_questions(conn, 1, [(qid, "A") for qid in question_ids[::int(1 / WRONG_RATE)]])
+    conn.close()
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="题目内存占用测试")
+    parser.add_argument("--questions", type=int, default=200000, help="题库题目数量")
+    parser.add_argument("--child", choices=sorted(LOADERS), help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_child(args.child, args.db)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "memory.db")
+        prepare_database(db_path, args.questions)
+
+        print(f"题库: {args.questions} 题，错题 {int(args.questions * WRONG_RATE)} 题")
+        for name in LOADERS:
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", name, "--db", db_path],
+                                    capture_output=True, text=True, check=True).stdout
+            result = json.loads(output)
+            print(f"  {name}: 常驻内存 +{result['rss_bytes'] / 1024 / 1024:.1f} MB, "
+                  f"每题 {result['rss_bytes'] / (result['questions'] + result['wrong']):.0f} 字节, "
+                  f"读取 {result['load_ms']:.0f} ms, 完整垃圾回收 {result['gc_ms']:.1f} ms "
+                  f"（跟踪对象 {result['gc_tracked']}）")
+
+
+if __name__ == "__main__":
+    main()
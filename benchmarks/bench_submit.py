@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+交卷写入错题集性能测试 - 对比逐题判重、插入、提交并重新加载错题集的旧做法和批量写入
+
+在临时目录中的WAL数据库上测试，与程序实际使用的数据库设置相同
+
+用法:
+    python benchmarks/bench_submit.py --sizes 100 1000 5000 --miss-rate 0.5
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_migrations import migrate  # noqa: E402
+from wrong_set import add_wrong_questions, load_all_wrong_questions  # noqa: E402
+
+
+def create_database(path, count):
+    """创建包含count道题的题库"""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    migrate(conn)
+    conn.execute("INSERT INTO question_banks (name) VALUES ('bench')")
+    conn.executemany(
+        "INSERT INTO questions (bank_id, content, type, options, answer, score) VALUES (1, ?, '单选', ?, 'A', 1)",
+        [(f"题目{i}", "选项A|选项B|选项C|选项D") for i in range(count)]
+    )
+    conn.commit()
+    return conn
+
+
+def legacy_submit(conn, misses):
+    """旧做法：每道错题判重、插入、提交，再重新加载整个错题集"""
+    cursor = conn.cursor()
+    for question_id, user_answer in misses:
+        cursor.execute(
+            "SELECT id FROM wrong_questions WHERE bank_id = ? AND question_id = ?",
+            (1, question_id)
+        )
+        if cursor.fetchone():
+            continue
+        cursor.execute('''
+        INSERT INTO wrong_questions (bank_id, question_id, user_answer, added_at)
+        VALUES (?, ?, ?, ?)
+        ''', (1, question_id, user_answer, datetime.now()))
+        conn.commit()
+        load_all_wrong_questions(conn, 1)
+
+
+def batched_submit(conn, misses):
+    """批量写入，之后重新加载一次错题集"""
+    if add_wrong_questions(conn, 1, misses):
+        load_all_wrong_questions(conn, 1)
+
+
+def run(size, miss_rate, submit):
+    """在新数据库上交一次卷，返回耗时（秒）"""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = create_database(os.path.join(tmp, "bench.db"), size)
+        try:
+            ids = [row[0] for row in conn.execute("SELECT id FROM questions ORDER BY id")]
+            rng = random.Random(size)
+            misses = [(qid, rng.choice("BCD")) for qid in ids if rng.random() < miss_rate]
+
+            start = time.perf_counter()
+            submit(conn, misses)
+            elapsed = time.perf_counter() - start
+
+            saved = conn.execute("SELECT COUNT(*) FROM wrong_questions").fetchone()[0]
+            assert saved == len(misses), "错题数量不一致"
+            return elapsed
+        finally:
+            conn.close()
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="交卷写入错题集性能测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000], help="试卷题目数量")
+    parser.add_argument("--miss-rate", type=float, default=0.5, help="答错（含未答）的比例")
+    args = parser.parse_args()
+
+    print(f"答错比例: {args.miss_rate}")
+    for size in args.sizes:
+        legacy = run(size, args.miss_rate, legacy_submit)
+        batched = run(size, args.miss_rate, batched_submit)
+        print(f"{size} 题: 逐题提交 {legacy * 1000:.1f} ms, 批量写入 {batched * 1000:.1f} ms, "
+              f"提升 {legacy / batched:.1f} 倍")
+
+
+if __name__ == "__main__":
+    main()
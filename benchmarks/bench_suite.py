@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+核心路径性能测试套件 - 在1千到100万题的合成题库上测试导入、加载、练习、组卷、交卷和错题集
+
+合成题目与“100道计算机试题.xls”的列结构相同（bench_import.synthetic_row），
+各阶段调用的函数与程序相同：
+    导入题库        excel_importer.import_bank（import_from_excel的逐行解析和批量写入）
+    加载题库        bank_store.load_bank + QuestionIndex + WrongSet（load_question_bank）
+    顺序练习/随机练习 ExamEngine.start_practice（读取进度、确定顺序并保存）
+    组卷            ExamEngine.create_exam（按题型随机抽题）
+    交卷判分        ExamEngine.calculate_exam_result（判分并批量写入错题集）
+    加载错题集      wrong_set.load_all_wrong_questions（load_wrong_questions）
+
+结果写入JSON文件，可以用--compare与之前的结果对比
+
+用法:
+    python benchmarks/bench_suite.py --sizes 1000 10000 100000 1000000 -o results.json
+    python benchmarks/bench_suite.py --sizes 1000 10000 --compare results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_import import synthetic_row  # noqa: E402
+from db_migrations import migrate  # noqa: E402
+from exam_engine import ExamEngine  # noqa: E402
+from excel_importer import import_bank  # noqa: E402
+from practice_session import RANDOM, SEQUENCE  # noqa: E402
+from wrong_set import add_wrong_questions, load_all_wrong_questions  # noqa: E402
+
+# 结果文件格式的版本，格式变化时递增
+RESULT_VERSION = 1
+
+# 错题集占题库的比例
+WRONG_RATE = 0.1
+
+
+def new_database(path):
+    """创建与程序设置相同的空数据库"""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    migrate(conn)
+    return conn
+
+
+def timed(fn):
+    """执行fn，返回(结果, 耗时毫秒)"""
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def git_revision():
+    """当前的git提交，不在git仓库中时返回None"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_size(size, repeat, exam_config, seed):
+    """
+    在一个合成题库上测试各阶段
+
+    Returns:
+        {阶段: [耗时毫秒, ...]}
+    """
+    samples = {}
+
+    def record(stage, elapsed):
+        samples.setdefault(stage, []).append(elapsed)
+
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        # 导入：每次导入到新数据库，题目行预先生成，不计入耗时
+        rows = [(i + 2, synthetic_row(i, rng)) for i in range(size)]
+        for i in range(repeat):
+            conn = new_database(os.path.join(tmp, f"import{i}.db"))
+            _, elapsed = timed(lambda: import_bank(conn, "synthetic", iter(rows)))
+            record("导入题库", elapsed)
+            conn.close()
+            if i < repeat - 1:
+                os.remove(os.path.join(tmp, f"import{i}.db"))
+        rows = None  # 释放内存
+
+        conn = sqlite3.connect(os.path.join(tmp, f"import{repeat - 1}.db"))
+        conn.execute("PRAGMA foreign_keys = ON")
+        try:
+            # 错题集中预先放入一部分题目
+            question_ids = [row[0] for row in conn.execute("SELECT id FROM questions ORDER BY id")]
+            add_wrong_questions(conn, 1, [(qid, "A") for qid in rng.sample(question_ids, int(size * WRONG_RATE))])
+
+            for _ in range(repeat):
+                engine, elapsed = timed(lambda: ExamEngine(conn, 1))
+                record("加载题库", elapsed)
+
+                _, elapsed = timed(lambda: engine.start_practice(SEQUENCE))
+                record("顺序练习", elapsed)
+                _, elapsed = timed(lambda: engine.start_practice(RANDOM, shuffle=rng.shuffle))
+                record("随机练习", elapsed)
+
+                config = {key: min(count, engine.index.count(question_type))
+                          for (key, count), question_type in zip(exam_config.items(), ["单选", "多选", "判断"])}
+                session, elapsed = timed(lambda: engine.create_exam(config, sample=rng.sample))
+                record("组卷", elapsed)
+
+                for question in session.questions:
+                    if rng.random() < 0.7:
+                        session.record_answer(question.id, question.answer if rng.random() < 0.7 else "B")
+                _, elapsed = timed(lambda: engine.calculate_exam_result(session))
+                record("交卷判分", elapsed)
+
+                _, elapsed = timed(lambda: load_all_wrong_questions(conn, 1))
+                record("加载错题集", elapsed)
+        finally:
+            conn.close()
+    return samples
+
+
+def summarize(size, stage, values):
+    """一个阶段的统计结果"""
+    return {
+        "size": size,
+        "stage": stage,
+        "samples_ms": [round(value, 3) for value in values],
+        "min_ms": round(min(values), 3),
+        "median_ms": round(statistics.median(values), 3),
+        "max_ms": round(max(values), 3),
+    }
+
+
+def compare(results, baseline_path):
+    """打印与之前结果的中位数对比"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(item["size"], item["stage"]): item for item in json.load(f)["results"]}
+
+    print(f"\n与 {baseline_path} 对比（中位数，比值小于1表示变快）:")
+    for item in results:
+        old = baseline.get((item["size"], item["stage"]))
+        if old is None or not old["median_ms"]:
+            continue
+        ratio = item["median_ms"] / old["median_ms"]
+        print(f"  {item['size']:>8} 题 {item['stage']}: {old['median_ms']:.1f} -> {item['median_ms']:.1f} ms"
+              f" ({ratio:.2f}x)")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="核心路径性能测试套件")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000],
+                        help="题库题目数量")
+    parser.add_argument("--repeat", type=int, default=3, help="每个阶段的重复次数")
+    parser.add_argument("--exam", type=int, nargs=3, default=[10, 5, 10], metavar=("单选", "多选", "判断"),
+                        help="组卷时各题型的数量")
+    parser.add_argument("--seed", type=int, default=0, help="随机数种子")
+    parser.add_argument("-o", "--output", help="结果JSON文件，默认只打印")
+    parser.add_argument("--compare", help="与之前的结果JSON文件对比")
+    args = parser.parse_args()
+
+    exam_config = dict(zip(["single", "multiple", "judge"], args.exam))
+    results = []
+    for size in args.sizes:
+        print(f"{size} 题:", flush=True)
+        for stage, values in run_size(size, args.repeat, exam_config, args.seed).items():
+            item = summarize(size, stage, values)
+            results.append(item)
+            print(f"  {stage}: 中位数 {item['median_ms']:.1f} ms, 最小 {item['min_ms']:.1f} ms, "
+                  f"最大 {item['max_ms']:.1f} ms", flush=True)
+
+    report = {
+        "version": RESULT_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "exam": exam_config,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入 {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+界面延迟回归测试 - 在合成题库上驱动ExamSoftware，记录各操作的耗时和控件数量，超出延迟预算时失败
+
+按脚本执行：进入练习、初始化答题界面、刷新题目和进度、翻题、作答、修改字体、组卷、交卷、查看错题集。
+每个操作之后调用update_idletasks()，让布局和重绘计入耗时；需要后台数据库线程的操作等到回调执行完。
+没有图形界面时自动启动Xvfb（需要已安装），也可以在xvfb-run中运行
+
+预算为各操作P95耗时的上限（毫秒），可以用--budgets指定JSON文件 {"操作": 毫秒, ...} 覆盖默认值。
+有操作超出预算时退出码为1，可用于持续集成
+
+用法:
+    python benchmarks/gui_latency.py --questions 10000 -o gui.json
+    xvfb-run -a python benchmarks/gui_latency.py --questions 100000 --budgets budgets.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tkinter as tk
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import main as exam_app  # noqa: E402
+from bench_engine import create_database  # noqa: E402
+from practice_session import EXAM, SEQUENCE  # noqa: E402
+from wrong_set import add_wrong_questions  # noqa: E402
+
+# 结果文件格式的版本，格式变化时递增
+RESULT_VERSION = 1
+
+# 各操作P95耗时的默认预算（毫秒），按1万题的题库设定
+DEFAULT_BUDGETS = {
+    "进入顺序练习": 300,
+    "init_question_interface": 150,
+    "update_question_display": 20,
+    "update_progress_display": 50,
+    "翻题": 20,
+    "作答": 10,
+    "修改字体": 100,
+    "组卷": 200,
+    "交卷": 300,
+    "show_exam_result": 250,
+    "view_wrong_questions": 300,
+}
+
+# 错题集占题库的比例
+WRONG_RATE = 0.1
+
+# 等待后台操作的超时（秒）
+WAIT_TIMEOUT = 60
+
+
+def start_virtual_display():
+    """
+    没有图形界面时启动Xvfb
+
+    Returns:
+        Xvfb进程，已有图形界面或未安装Xvfb时返回None
+    """
+    if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin"):
+        return None
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        return None
+
+    display = 99
+    while os.path.exists(f"/tmp/.X{display}-lock"):
+        display += 1
+    process = subprocess.Popen([xvfb, f":{display}", "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.time() + 10
+    while not os.path.exists(f"/tmp/.X11-unix/X{display}"):
+        if process.poll() is not None or time.time() > deadline:
+            process.kill()
+            return None
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = f":{display}"
+    return process
+
+
+class ScriptedDialogs:
+    """替换程序中的消息框：提示只记录，确认框总是选“是”"""
+
+    def __init__(self):
+        self.messages = []  # [(类型, 标题, 内容), ...]
+        self.errors = []
+
+    def install(self):
+        exam_app.messagebox.showinfo = lambda title, message, **kw: self.messages.append(("info", title, message))
+        exam_app.messagebox.showwarning = lambda title, message, **kw: self.messages.append(("warning", title, message))
+        exam_app.messagebox.showerror = self.showerror
+        exam_app.messagebox.askyesno = lambda title, message, **kw: True
+
+    def showerror(self, title, message, **kw):
+        self.errors.append((title, message))
+
+
+class GuiDriver:
+    """驱动ExamSoftware并记录每个操作的耗时和控件数量"""
+
+    def __init__(self, root, app):
+        self.root = root
+        self.app = app
+        self.samples = {}  # {操作: [耗时毫秒, ...]}
+        self.widgets = {}  # {操作: 操作后的控件数量}
+
+    def wait(self, predicate, timeout=WAIT_TIMEOUT):
+        """处理事件直到predicate()为真"""
+        deadline = time.perf_counter() + timeout
+        while not predicate():
+            if time.perf_counter() > deadline:
+                raise RuntimeError("等待界面操作超时")
+            self.root.update()
+            time.sleep(0.001)
+
+    def drain(self):
+        """等待后台数据库线程执行完已提交的请求，并调用它们的回调"""
+        done = []
+        self.app.db_worker.submit(lambda conn: None, callback=done.append)
+        self.wait(lambda: done)
+
+    def measure(self, operation, action, background=False):
+        """
+        执行一个操作并记录耗时
+
+        Args:
+            operation: 操作名称
+            action: 要执行的函数
+            background: 操作是否提交了后台请求，是则等待回调执行完
+        """
+        start = time.perf_counter()
+        result = action()
+        if background:
+            self.drain()
+        self.root.update_idletasks()
+        self.samples.setdefault(operation, []).append((time.perf_counter() - start) * 1000)
+        self.widgets[operation] = count_widgets(self.root)
+        return result
+
+    def settle(self):
+        """处理操作留下的事件（分批渲染、空闲回调），不计入耗时"""
+        self.root.update()
+        self.drain()
+        self.root.update()
+
+    def open_practice(self):
+        """进入顺序练习"""
+        self.app.create_main_interface()
+        self.settle()
+        session = self.app.session
+        self.measure("进入顺序练习", lambda: self.app.start_practice(SEQUENCE), background=True)
+        if self.app.session is session:
+            raise RuntimeError("未能进入练习")
+        self.settle()
+
+    def rebuild_question_interface(self):
+        """与show_practice相同的顺序重建答题界面"""
+        self.measure("init_question_interface", self.app.init_question_interface)
+        self.measure("update_question_display", self.app.update_question_display)
+        self.measure("update_progress_display", self.app.update_progress_display)
+        self.settle()
+
+    def navigate(self, count):
+        """翻题count次，到最后一题后回到第一题"""
+        for _ in range(count):
+            if self.app.session.is_last():
+                self.app.jump_to_question(0)
+                self.settle()
+            self.measure("翻题", self.app.next_question)
+        self.settle()
+
+    def answer(self):
+        """点击当前题目的第一个选项"""
+        buttons = self.app.question_view.visible_buttons
+        if buttons:
+            self.measure("作答", buttons[0].invoke)
+
+    def change_font(self, size):
+        """通过设置窗口的应用函数修改字体大小"""
+        settings_window = tk.Toplevel(self.root)
+        settings_window.withdraw()
+        self.measure("修改字体", lambda: self.app.apply_font_size(size, settings_window))
+        self.settle()
+
+    def create_exam(self):
+        """打开试卷配置窗口并点击确定"""
+        def create():
+            self.app.create_exam()
+            dialog = self.root.winfo_children()[-1]
+            find_button(dialog, "确定").invoke()
+
+        self.measure("组卷", create)
+        if self.app.session.mode != EXAM:
+            raise RuntimeError("未能组卷")
+        self.settle()
+
+    def submit_exam(self):
+        """作答约七成题目后交卷，再单独测试一次结果界面的创建"""
+        questions = self.app.session.questions
+        for i in range(len(questions)):
+            if i % 10 < 7:
+                self.app.jump_to_question(i)
+                self.app.question_view.visible_buttons[0].invoke()
+        self.settle()
+
+        self.measure("交卷", self.app.submit_exam, background=True)
+        self.settle()
+        self.measure("show_exam_result", self.app.show_exam_result)
+        self.settle()
+
+    def view_wrong_questions(self):
+        """打开错题集，等待第一页显示"""
+        self.measure("view_wrong_questions", self.app.view_wrong_questions, background=True)
+        self.settle()
+
+
+def count_widgets(widget):
+    """控件及其全部子控件的数量"""
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def find_button(widget, text):
+    """在widget中查找文字为text的按钮"""
+    for child in widget.winfo_children():
+        if isinstance(child, tk.Button) and child.cget("text") == text:
+            return child
+        found = find_button(child, text)
+        if found is not None:
+            return found
+    return None
+
+
+def git_revision():
+    """当前的git提交，不在git仓库中时返回None"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def prepare_database(path, count):
+    """创建合成题库，并将一部分题目放入错题集"""
+    conn = create_database(path, count)
+    question_ids = [row[0] for row in conn.execute("SELECT id FROM questions ORDER BY id")]
+    add_wrong_questions(conn, 1, [(qid, "B") for qid in question_ids[::int(1 / WRONG_RATE)]])
+    conn.close()
+
+
+def run_script(driver, args):
+    """按脚本执行全部操作"""
+    for i in range(args.repeat):
+        driver.open_practice()
+        driver.rebuild_question_interface()
+        driver.navigate(args.navigations)
+        for _ in range(args.navigations):
+            driver.answer()
+            driver.app.next_question()
+        driver.settle()
+        driver.change_font(14 if i % 2 == 0 else 10)
+
+        driver.create_exam()
+        driver.submit_exam()
+        driver.view_wrong_questions()
+
+
+def summarize(samples, widgets, budgets):
+    """各操作的统计结果和是否超出预算"""
+    results = []
+    for operation, values in samples.items():
+        ordered = sorted(values)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        budget = budgets.get(operation)
+        results.append({
+            "operation": operation,
+            "samples": len(values),
+            "median_ms": round(statistics.median(values), 3),
+            "p95_ms": round(p95, 3),
+            "max_ms": round(ordered[-1], 3),
+            "widgets": widgets.get(operation),
+            "budget_ms": budget,
+            "passed": budget is None or p95 <= budget,
+        })
+    return results
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="界面延迟回归测试")
+    parser.add_argument("--questions", type=int, default=10000, help="题库题目数量")
+    parser.add_argument("--repeat", type=int, default=3, help="整个脚本的重复次数")
+    parser.add_argument("--navigations", type=int, default=50, help="每轮翻题和作答的次数")
+    parser.add_argument("--budgets", help="延迟预算JSON文件，覆盖默认预算")
+    parser.add_argument("-o", "--output", help="结果JSON文件，默认只打印")
+    args = parser.parse_args()
+
+    budgets = dict(DEFAULT_BUDGETS)
+    if args.budgets:
+        try:
+            with open(args.budgets, encoding="utf-8") as f:
+                budgets.update(json.load(f))
+        except (OSError, ValueError) as e:
+            print(f"读取延迟预算失败: {e}")
+            sys.exit(2)
+
+    xvfb = start_virtual_display()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "gui.db")
+            prepare_database(db_path, args.questions)
+            exam_app.DB_FILE = db_path
+
+            try:
+                root = tk.Tk()
+            except tk.TclError as e:
+                print(f"无法创建窗口（需要图形界面，可安装Xvfb或在xvfb-run中运行）: {e}")
+                sys.exit(2)
+
+            dialogs = ScriptedDialogs()
+            dialogs.install()
+            app = exam_app.ExamSoftware(root)
+            driver = GuiDriver(root, app)
+            try:
+                driver.wait(lambda: not app.bank_loading and app.question_bank)
+                run_script(driver, args)
+            finally:
+                app.on_close()
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+    results = summarize(driver.samples, driver.widgets, budgets)
+    print(f"题库: {args.questions} 题, 重复 {args.repeat} 次")
+    for item in results:
+        budget = f"预算 {item['budget_ms']} ms" if item["budget_ms"] is not None else "无预算"
+        print(f"  {item['operation']}: 中位数 {item['median_ms']:.1f} ms, P95 {item['p95_ms']:.1f} ms, "
+              f"最大 {item['max_ms']:.1f} ms, 控件 {item['widgets']}, {budget}"
+              f"{'' if item['passed'] else ' -> 超出预算'}")
+    for title, message in dialogs.errors:
+        print(f"错误提示: {title}: {message}")
+
+    if args.output:
+        report = {
+            "version": RESULT_VERSION,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "tk": tk.TkVersion,
+            "platform": platform.platform(),
+            "questions": args.questions,
+            "repeat": args.repeat,
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入 {args.output}")
+
+    failed = [item["operation"] for item in results if not item["passed"]]
+    if failed or dialogs.errors:
+        if failed:
+            print(f"超出延迟预算: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
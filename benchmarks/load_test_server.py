@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+服务端模式压力测试 - 模拟多名学员同时组卷、交卷，统计持续的每秒请求数和延迟分位数
+
+默认在临时目录中生成题库并在子进程中启动exam_server.py；指定--port时测试已启动的服务。
+每名学员使用一个长连接，循环执行：组卷 -> 随机作答 -> 交卷
+
+用法:
+    python benchmarks/load_test_server.py --learners 200 --duration 20
+    python benchmarks/load_test_server.py --port 8765 --bank-id 1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_engine import create_database  # noqa: E402
+
+HOST = "127.0.0.1"
+
+
+async def request(reader, writer, method, path, payload=None):
+    """在长连接上发送一个请求，返回(状态码, 响应对象)"""
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {HOST}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def learner(port, bank_id, config, deadline, latencies, errors, rng):
+    """一名学员：在截止时间前反复组卷、交卷"""
+    reader, writer = await asyncio.open_connection(HOST, port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status, paper = await request(reader, writer, "POST", f"/banks/{bank_id}/papers", config)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+                continue
+
+            answers = {str(q["id"]): rng.choice("AB") for q in paper["questions"] if rng.random() < 0.9}
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, "POST", f"/papers/{paper['paper_id']}/submit",
+                                      {"learner": f"learner-{id(rng)}", "answers": answers})
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(port, bank_id, learners, duration, config):
+    """运行压力测试，返回(每个请求的耗时列表, 错误状态码列表, 实际时长)"""
+    latencies = []
+    errors = []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*[
+        learner(port, bank_id, config, deadline, latencies, errors, random.Random(i))
+        for i in range(learners)
+    ])
+    return latencies, errors, time.perf_counter() - start
+
+
+def free_port():
+    """获取一个空闲端口"""
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=10):
+    """等待服务开始监听"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((HOST, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("服务未能启动")
+
+
+def percentile(sorted_values, fraction):
+    """已排序列表的分位数"""
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="服务端模式压力测试")
+    parser.add_argument("--learners", type=int, default=200, help="同时在线的学员数")
+    parser.add_argument("--duration", type=float, default=20, help="测试时长（秒）")
+    parser.add_argument("--questions", type=int, default=3000, help="生成的题库题目数量")
+    parser.add_argument("--paper-size", type=int, default=30, help="每份试卷的题目数（三种题型平分）")
+    parser.add_argument("--pool-size", type=int, default=4, help="服务端数据库连接数")
+    parser.add_argument("--port", type=int, help="测试已启动的服务，不指定时自动启动")
+    parser.add_argument("--bank-id", type=int, default=1, help="测试的题库ID")
+    args = parser.parse_args()
+
+    per_type = args.paper_size // 3
+    config = {"single": per_type, "multiple": per_type, "judge": args.paper_size - per_type * 2}
+
+    server = None
+    tmp = None
+    port = args.port
+    if port is None:
+        tmp = tempfile.TemporaryDirectory()
+        db_path = os.path.join(tmp.name, "bench.db")
+        create_database(db_path, args.questions).close()
+        port = free_port()
+        server = subprocess.Popen([sys.executable, os.path.join(ROOT, "exam_server.py"), "--db", db_path,
+                                   "--port", str(port), "--pool-size", str(args.pool_size)],
+                                  stdout=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        latencies, errors, elapsed = asyncio.run(
+            run_load(port, args.bank_id, args.learners, args.duration, config))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        if tmp is not None:
+            tmp.cleanup()
+
+    latencies.sort()
+    print(f"学员: {args.learners}, 时长: {elapsed:.1f} 秒, 每份试卷 {args.paper_size} 题")
+    print(f"请求数: {len(latencies)}, 错误: {len(errors)}, 每秒请求数: {len(latencies) / elapsed:.0f}")
+    if latencies:
+        print(f"延迟: P50 {percentile(latencies, 0.5) * 1000:.1f} ms, "
+              f"P99 {percentile(latencies, 0.99) * 1000:.1f} ms, 最大 {latencies[-1] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
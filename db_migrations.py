@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数据库结构迁移 - 通过schema_version记录版本，按顺序执行幂等的升级步骤
+
+用法:
+    python db_migrations.py [数据库路径]            升级指定数据库
+    python db_migrations.py [数据库路径] --report   输出升级前后的查询计划对比
+"""
+
+import argparse
+import os
+import sqlite3
+from datetime import datetime
+
+from question_order import pack_order
+
+
+def _create_base_tables(cursor):
+    """版本1：基础表结构"""
+    # 创建题库表
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS question_banks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        description TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        is_last_used INTEGER DEFAULT 0
+    )
+    ''')
+
+    # 创建题目表
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS questions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        bank_id INTEGER NOT NULL,
+        content TEXT NOT NULL,
+        type TEXT NOT NULL,
+        is_subquestion INTEGER DEFAULT 0,
+        options TEXT,
+        difficulty TEXT,
+        analysis TEXT,
+        answer TEXT NOT NULL,
+        score REAL DEFAULT 0,
+        FOREIGN KEY (bank_id) REFERENCES question_banks (id) ON DELETE CASCADE
+    )
+    ''')
+
+    # 创建答题进度表
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS progress (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        bank_id INTEGER NOT NULL,
+        mode TEXT NOT NULL,
+        question_id INTEGER NOT NULL,
+        user_answer TEXT,
+        answered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (bank_id) REFERENCES question_banks (id) ON DELETE CASCADE,
+        FOREIGN KEY (question_id) REFERENCES questions (id) ON DELETE CASCADE,
+        UNIQUE(bank_id, mode, question_id)
+    )
+    ''')
+
+    # 创建题目顺序表
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS question_orders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        bank_id INTEGER NOT NULL,
+        mode TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        question_id INTEGER NOT NULL,
+        FOREIGN KEY (bank_id) REFERENCES question_banks (id) ON DELETE CASCADE,
+        FOREIGN KEY (question_id) REFERENCES questions (id) ON DELETE CASCADE,
+        UNIQUE(bank_id, mode, position)
+    )
+    ''')
+
+    # 创建错题集表
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS wrong_questions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        bank_id INTEGER NOT NULL,
+        question_id INTEGER NOT NULL,
+        user_answer TEXT,
+        added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (bank_id) REFERENCES question_banks (id) ON DELETE CASCADE,
+        FOREIGN KEY (question_id) REFERENCES questions (id) ON DELETE CASCADE,
+        UNIQUE(bank_id, question_id)
+    )
+    ''')
+
+    # 创建配置表
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS config (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        key TEXT NOT NULL UNIQUE,
+        value TEXT NOT NULL
+    )
+    ''')
+
+
+# 版本2创建的索引，查询计划报告会用到索引名
+SECONDARY_INDEXES = [
+    # 按题库加载题目并按ID排序，同时覆盖question_banks的级联删除
+    ("idx_questions_bank_id", "questions (bank_id, id)"),
+    # 按题库统计/筛选题型
+    ("idx_questions_bank_type", "questions (bank_id, type)"),
+    # 删除题目时级联清理子表
+    ("idx_progress_question", "progress (question_id)"),
+    ("idx_question_orders_question", "question_orders (question_id)"),
+    ("idx_wrong_questions_question", "wrong_questions (question_id)"),
+    # 错题集按加入时间倒序加载，包含连接和展示所需的列
+    ("idx_wrong_questions_bank_added", "wrong_questions (bank_id, added_at, question_id, user_answer)"),
+]
+
+
+def _create_secondary_indexes(cursor):
+    """版本2：外键列和常用查询的二级索引"""
+    for name, target in SECONDARY_INDEXES:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+def _create_order_blobs(cursor):
+    """版本3：题目顺序改为每个题库每种模式一行的BLOB，并迁移question_orders中的旧数据"""
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS question_order_blobs (
+        bank_id INTEGER NOT NULL,
+        mode TEXT NOT NULL,
+        question_count INTEGER NOT NULL,
+        checksum INTEGER NOT NULL,
+        order_data BLOB NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (bank_id, mode),
+        FOREIGN KEY (bank_id) REFERENCES question_banks (id) ON DELETE CASCADE
+    )
+    ''')
+
+    cursor.execute("SELECT DISTINCT bank_id, mode FROM question_orders")
+    for bank_id, mode in cursor.fetchall():
+        cursor.execute(
+            "SELECT question_id FROM question_orders WHERE bank_id = ? AND mode = ? ORDER BY position",
+            (bank_id, mode)
+        )
+        question_ids = [row[0] for row in cursor.fetchall()]
+        data, checksum = pack_order(question_ids)
+        cursor.execute('''
+        INSERT OR IGNORE INTO question_order_blobs
+        (bank_id, mode, question_count, checksum, order_data, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''', (bank_id, mode, len(question_ids), checksum, data, datetime.now()))
+
+    # 旧表保留结构，数据已迁移
+    cursor.execute("DELETE FROM question_orders")
+
+
+def _create_exam_submissions(cursor):
+    """版本4：服务端模式下学员交卷的成绩"""
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS exam_submissions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        bank_id INTEGER NOT NULL,
+        learner TEXT,
+        total INTEGER NOT NULL,
+        correct INTEGER NOT NULL,
+        score REAL NOT NULL,
+        total_score REAL NOT NULL,
+        submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (bank_id) REFERENCES question_banks (id) ON DELETE CASCADE
+    )
+    ''')
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_exam_submissions_bank ON exam_submissions (bank_id, submitted_at)"
+    )
+
+
+def _drop_question_orders_index(cursor):
+    """版本5：版本3起question_orders不再写入，删除其上的索引"""
+    cursor.execute("DROP INDEX IF EXISTS idx_question_orders_question")
+
+
+# 版本1之后创建的表，查询计划报告回退到版本1时删除（表上的索引随表删除）
+LATER_TABLES = ["question_order_blobs", "exam_submissions"]
+
+
+# 按版本号排列的升级步骤，只能追加，不能修改已发布的步骤
+MIGRATIONS = [
+    (1, "基础表结构", _create_base_tables),
+    (2, "二级索引", _create_secondary_indexes),
+    (3, "题目顺序BLOB", _create_order_blobs),
+    (4, "服务端交卷成绩", _create_exam_submissions),
+    (5, "删除question_orders索引", _drop_question_orders_index),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def ensure_version_table(cursor):
+    """创建schema_version表"""
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        description TEXT,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+
+def get_schema_version(conn):
+    """获取数据库当前的结构版本，未记录时返回0"""
+    cursor = conn.cursor()
+    ensure_version_table(cursor)
+    cursor.execute("SELECT MAX(version) FROM schema_version")
+    result = cursor.fetchone()
+    return result[0] if result and result[0] is not None else 0
+
+
+def migrate(conn, target_version=LATEST_VERSION):
+    """
+    将数据库升级到目标版本
+
+    每个步骤在独立事务中执行并写入schema_version，失败时回滚该步骤并抛出sqlite3.Error
+
+    Args:
+        conn: 数据库连接
+        target_version: 目标版本，默认为最新版本
+
+    Returns:
+        本次执行的版本号列表
+    """
+    current_version = get_schema_version(conn)
+    conn.commit()
+
+    applied = []
+    cursor = conn.cursor()
+    for version, description, step in MIGRATIONS:
+        if version <= current_version or version > target_version:
+            continue
+
+        try:
+            cursor.execute("BEGIN")
+            step(cursor)
+            cursor.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                (version, description, datetime.now())
+            )
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+        applied.append(version)
+
+    return applied
+
+
+# 需要检查的热点查询：(说明, SQL, 参数)
+HOT_QUERIES = [
+    ("加载题库",
+     "SELECT id, content, type, is_subquestion, options, difficulty, analysis, answer, score "
+     "FROM questions WHERE bank_id = ? ORDER BY id",
+     (1,)),
+    ("统计题型数量",
+     "SELECT COUNT(*) FROM questions WHERE bank_id = ? AND type = ?",
+     (1, "单选")),
+    ("加载答题进度",
+     "SELECT question_id, user_answer FROM progress WHERE bank_id = ? AND mode = ?",
+     (1, "sequence")),
+    ("加载题目顺序",
+     "SELECT checksum, order_data FROM question_order_blobs WHERE bank_id = ? AND mode = ?",
+     (1, "random")),
+    ("加载错题集",
+     "SELECT q.id, q.content, q.type, q.is_subquestion, q.options, q.difficulty, "
+     "q.analysis, q.answer, q.score, w.user_answer "
+     "FROM wrong_questions w JOIN questions q ON w.question_id = q.id "
+     "WHERE w.bank_id = ? ORDER BY w.added_at DESC, w.question_id DESC",
+     (1,)),
+    ("错题分页",
+     "SELECT q.id, q.content, q.type, q.is_subquestion, q.options, q.difficulty, "
+     "q.analysis, q.answer, q.score, w.user_answer, w.added_at "
+     "FROM wrong_questions w JOIN questions q ON w.question_id = q.id "
+     "WHERE w.bank_id = ? AND (w.added_at, w.question_id) < (?, ?) "
+     "ORDER BY w.added_at DESC, w.question_id DESC LIMIT ?",
+     (1, "2024-01-01 00:00:00", 1, 20)),
+    ("错题判重",
+     "SELECT id FROM wrong_questions WHERE bank_id = ? AND question_id = ?",
+     (1, 1)),
+    # 以下几条与删除题目/题库时外键级联执行的查找相同
+    ("级联删除答题进度",
+     "SELECT id FROM progress WHERE question_id = ?",
+     (1,)),
+    ("级联删除错题",
+     "SELECT id FROM wrong_questions WHERE question_id = ?",
+     (1,)),
+    ("级联删除题库题目",
+     "SELECT id FROM questions WHERE bank_id = ?",
+     (1,)),
+]
+
+
+def explain_hot_queries(conn):
+    """
+    获取热点查询的查询计划
+
+    Returns:
+        [(说明, [计划明细, ...]), ...]
+    """
+    cursor = conn.cursor()
+    plans = []
+    for title, sql, params in HOT_QUERIES:
+        try:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+        except sqlite3.OperationalError:
+            # 升级前的版本中还没有该表
+            plans.append((title, ["表不存在"]))
+            continue
+        plans.append((title, [row[-1] for row in cursor.fetchall()]))
+    return plans
+
+
+def is_index_backed(plan_details):
+    """判断查询计划是否完全走索引查找（没有整表或整个索引的扫描）"""
+    return not any(detail.startswith("SCAN") for detail in plan_details)
+
+
+def query_plan_report(db_path):
+    """
+    在数据库的内存副本上生成升级前后的查询计划对比，不会修改原数据库
+
+    升级前的状态指只有基础表结构（版本1）、没有二级索引的数据库
+
+    Returns:
+        报告文本
+    """
+    source = sqlite3.connect(db_path)
+    before_conn = sqlite3.connect(":memory:")
+    try:
+        source.backup(before_conn)
+    finally:
+        source.close()
+
+    try:
+        original_version = get_schema_version(before_conn)
+
+        # 回退到版本1：删除二级索引（包括版本5删除的索引）和之后版本创建的表
+        cursor = before_conn.cursor()
+        migrate(before_conn, target_version=1)
+        for name, _ in SECONDARY_INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        for table in LATER_TABLES:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.execute("DELETE FROM schema_version WHERE version > 1")
+        before_conn.commit()
+        before_plans = explain_hot_queries(before_conn)
+
+        migrate(before_conn)
+        after_plans = explain_hot_queries(before_conn)
+    finally:
+        before_conn.close()
+
+    lines = [
+        f"数据库: {db_path}",
+        f"当前结构版本: {original_version}，最新版本: {LATEST_VERSION}",
+        ""
+    ]
+    for (title, before), (_, after) in zip(before_plans, after_plans):
+        lines.append(f"[{title}]")
+        lines.append(f"  升级前{'' if is_index_backed(before) else '（全表扫描）'}:")
+        lines.extend(f"    {detail}" for detail in before)
+        lines.append(f"  升级后{'' if is_index_backed(after) else '（全表扫描）'}:")
+        lines.extend(f"    {detail}" for detail in after)
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="exerciser数据库结构迁移")
+    parser.add_argument("db_path", nargs="?", default="exam_software.db", help="数据库文件路径")
+    parser.add_argument("--report", action="store_true", help="只输出升级前后的查询计划对比，不修改数据库")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db_path):
+        print(f"错误：找不到数据库文件 {args.db_path}")
+        return
+
+    if args.report:
+        print(query_plan_report(args.db_path))
+        return
+
+    conn = sqlite3.connect(args.db_path)
+    try:
+        before = get_schema_version(conn)
+        applied = migrate(conn)
+    finally:
+        conn.close()
+
+    if applied:
+        print(f"数据库已从版本 {before} 升级到 {applied[-1]}")
+    else:
+        print(f"数据库已是最新版本 {before}")
+
+
+if __name__ == "__main__":
+    main()
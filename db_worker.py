@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+后台数据库线程 - 使用独立的连接按提交顺序执行请求，结果通过root.after轮询回到界面线程
+
+请求是形如fn(conn, *args)的函数，每个请求作为一个事务执行：
+正常返回时提交未提交的修改，抛出异常时回滚。回调总是在界面线程中调用
+"""
+
+import queue
+import threading
+import time
+
+import sql_profiler
+from tracing import record
+
+# 界面线程检查结果的间隔（毫秒）
+POLL_INTERVAL = 20
+
+
+class DatabaseWorker:
+    """拥有独立数据库连接的后台线程"""
+
+    def __init__(self, db_path, root):
+        """
+        Args:
+            db_path: 数据库文件路径
+            root: Tk根窗口，用于轮询结果
+        """
+        self.db_path = db_path
+        self.root = root
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.closed = False
+
+        self.thread = threading.Thread(target=self._run, name="db-worker", daemon=True)
+        self.thread.start()
+        self._poll_id = self.root.after(POLL_INTERVAL, self._poll)
+
+    def submit(self, fn, *args, callback=None, errback=None):
+        """
+        提交一个请求
+
+        Args:
+            fn: 在后台线程中执行的函数，第一个参数为数据库连接
+            callback: 成功时在界面线程中调用，参数为fn的返回值
+            errback: 失败时在界面线程中调用，参数为异常；为空时打印错误
+        """
+        if self.closed:
+            raise RuntimeError("数据库线程已关闭")
+        self.requests.put((fn, args, callback, errback))
+
+    def _run(self):
+        conn = sql_profiler.connect(self.db_path)
+        conn.execute("PRAGMA foreign_keys = ON")
+        try:
+            while True:
+                request = self.requests.get()
+                if request is None:
+                    break
+
+                fn, args, callback, errback = request
+                start = time.perf_counter()
+                try:
+                    result = fn(conn, *args)
+                    if conn.in_transaction:
+                        conn.commit()
+                except Exception as e:
+                    if conn.in_transaction:
+                        conn.rollback()
+                    self.results.put((errback, e, True))
+                else:
+                    self.results.put((callback, result, False))
+                record(f"db.{getattr(fn, '__name__', 'request')}", start)
+        finally:
+            conn.close()
+
+    def _deliver(self):
+        """在界面线程中调用已完成请求的回调"""
+        while True:
+            try:
+                handler, value, failed = self.results.get_nowait()
+            except queue.Empty:
+                return
+
+            if failed and handler is None:
+                print(f"数据库操作失败: {str(value)}")
+            elif handler is not None:
+                handler(value)
+
+    def _poll(self):
+        self._deliver()
+        if not self.closed:
+            self._poll_id = self.root.after(POLL_INTERVAL, self._poll)
+
+    def close(self, timeout=10):
+        """执行完已提交的请求后关闭线程，并调用剩余的回调"""
+        if self.closed:
+            return
+        self.closed = True
+        self.root.after_cancel(self._poll_id)
+        self.requests.put(None)
+        self.thread.join(timeout)
+        self._deliver()
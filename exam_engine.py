@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+无界面的刷题引擎 - 在一个数据库连接上组合题库读取、练习会话、组卷、判分和错题集
+
+与答题界面使用同样的规则（practice_session、exam_paper、wrong_set、bank_store），
+用于批量判分、服务端和性能测试。答题界面通过后台数据库线程调用同样的函数
+"""
+
+import random
+from datetime import datetime
+
+import bank_store
+from answer_journal import write_batch
+from exam_paper import build_exam, grade_exam
+from practice_session import EXAM, RANDOM, SEQUENCE, WRONG, PracticeSession, practice_order
+from question_index import QuestionIndex
+from question_order import save_order
+from wrong_set import WrongSet, add_wrong_questions, load_all_wrong_questions
+
+
+class ExamEngine:
+    """一个题库上的练习、考试和错题集"""
+
+    def __init__(self, conn, bank_id=None):
+        """
+        Args:
+            conn: 数据库连接
+            bank_id: 题库ID，为空时使用上次使用的题库
+        """
+        self.conn = conn
+        self.bank_id = None
+        self.index = QuestionIndex()
+        self.wrong_set = WrongSet()
+
+        if bank_id is None:
+            last_used = bank_store.find_last_used_bank(conn)
+            bank_id = last_used[0] if last_used else None
+        if bank_id is not None:
+            self.load_bank(bank_id)
+
+    def load_bank(self, bank_id):
+        """读取题库的题目和错题集"""
+        questions, wrong_questions = bank_store.load_bank(self.conn, bank_id)
+        self.bank_id = bank_id
+        self.index = QuestionIndex(questions)
+        self.wrong_set = WrongSet(wrong_questions)
+
+    def start_practice(self, mode, reshuffle=True, shuffle=random.shuffle):
+        """
+        开始顺序或随机练习，恢复答题进度和上次的位置，并保存题目顺序
+
+        Args:
+            mode: SEQUENCE或RANDOM
+            reshuffle: 随机练习时是否重新打乱，否则沿用上次保存的顺序
+            shuffle: 打乱函数
+
+        Returns:
+            PracticeSession
+        """
+        user_answers, last_index, saved_order = bank_store.load_practice_state(self.conn, self.bank_id, mode)
+        questions, reshuffled = practice_order(self.index, mode, saved_order, reshuffle, shuffle)
+        session = PracticeSession(self.bank_id, mode, questions, user_answers,
+                                  None if reshuffled else last_index)
+
+        if mode == SEQUENCE or (mode == RANDOM and reshuffled):
+            save_order(self.conn, self.bank_id, mode, session.question_ids())
+            self.conn.commit()
+        return session
+
+    def start_wrong_practice(self):
+        """开始错题练习"""
+        user_answers = bank_store.load_progress(self.conn, self.bank_id, WRONG)
+        return PracticeSession(self.bank_id, WRONG, self.wrong_set.questions(), user_answers)
+
+    def create_exam(self, exam_config, sample=random.sample):
+        """
+        组卷并保存组卷配置
+
+        Args:
+            exam_config: 各题型数量 {"single": 单选数, "multiple": 多选数, "judge": 判断数}
+            sample: 抽样函数
+
+        Returns:
+            考试的PracticeSession
+        """
+        questions = build_exam(self.index, exam_config, sample)
+        bank_store.save_exam_config(self.conn, exam_config)
+        self.conn.commit()
+        return PracticeSession(self.bank_id, EXAM, questions)
+
+    def save_answers(self, session):
+        """在一个事务中保存会话的全部答案和当前位置"""
+        now = datetime.now()
+        answers = {(session.bank_id, session.mode, question_id): (user_answer, now)
+                   for question_id, user_answer in session.user_answers.items()}
+        config = {session.position_key: str(session.current_index)}
+        return write_batch(self.conn, (answers, config))
+
+    def calculate_exam_result(self, session, added_at=None):
+        """
+        交卷：判分，并把答错和未答的题目加入错题集
+
+        Returns:
+            考试结果，格式见exam_paper.grade_exam
+        """
+        results, wrong_entries = grade_exam(session.questions, session.user_answers, session.numbering)
+        self.add_wrong_questions(wrong_entries, added_at)
+        return results
+
+    def add_wrong_questions(self, entries, added_at=None):
+        """
+        在一个事务中把多道题加入错题集，并同步更新内存中的错题集
+
+        Returns:
+            新加入的数量
+        """
+        entries = self.wrong_set.new_entries(entries)
+        if not entries:
+            return 0
+
+        added_at = added_at or datetime.now()
+        added = add_wrong_questions(self.conn, self.bank_id, entries, added_at)
+        if not self.wrong_set.add_entries(self.index, entries, added_at):
+            self.wrong_set = WrongSet(load_all_wrong_questions(self.conn, self.bank_id))
+        return added
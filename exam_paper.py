@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+组卷和判分 - 按各题型数量随机抽题组成试卷，按标准答案判分
+
+不依赖界面和数据库，只处理题目记录，答题界面、批量判分和服务端使用同样的规则
+"""
+
+import random
+
+from question_index import QUESTION_TYPES
+
+# 组卷配置中各题型的键
+EXAM_CONFIG_KEYS = {"单选": "single", "多选": "multiple", "判断": "judge"}
+
+# 未作答题目在考试结果中显示的答案
+UNANSWERED = "未回答"
+
+
+def build_exam(index, exam_config, sample=random.sample):
+    """
+    按题型顺序随机抽题组成试卷
+
+    Args:
+        index: 题库的QuestionIndex
+        exam_config: 各题型数量 {"single": 单选数, "multiple": 多选数, "judge": 判断数}
+        sample: 抽样函数
+
+    Returns:
+        试卷题目列表
+
+    Raises:
+        ValueError: 某题型的数量超过题库中的题目数
+    """
+    exam_questions = []
+    for question_type in QUESTION_TYPES:
+        count = exam_config.get(EXAM_CONFIG_KEYS[question_type], 0)
+        if count > 0:
+            exam_questions.extend(sample(index.of_type(question_type), count))
+    return exam_questions
+
+
+def is_correct(question, user_answer):
+    """答案是否正确"""
+    return user_answer == question.answer
+
+
+def grade_question(question, user_answer, number):
+    """
+    一道题的答题情况
+
+    Args:
+        question: 题目
+        user_answer: 用户答案，未作答时为None
+        number: 题目显示编号
+    """
+    correct = user_answer is not None and is_correct(question, user_answer)
+    score = float(question.score)
+    return {
+        "content": question.content,
+        "type": question.type,
+        "user_answer": UNANSWERED if user_answer is None else user_answer,
+        "correct_answer": question.answer,
+        "is_correct": correct,
+        "score": score if correct else 0,
+        "total_score": score,
+        "number": number
+    }
+
+
+def score_sheet(questions, user_answers):
+    """
+    只计算成绩，不生成每道题的答题情况，规则与grade_exam相同，用于批量判分
+
+    Args:
+        questions: 试卷题目列表
+        user_answers: {题目ID: 用户答案}
+
+    Returns:
+        (每道题是否正确的列表, 得分, 满分)
+    """
+    flags = []
+    total_score = 0
+    full_score = 0
+    for question in questions:
+        score = float(question.score)
+        full_score += score
+        user_answer = user_answers.get(question.id)
+        correct = user_answer is not None and is_correct(question, user_answer)
+        if correct:
+            total_score += score
+        flags.append(correct)
+    return flags, total_score, full_score
+
+
+def grade_exam(questions, user_answers, numbering):
+    """
+    计算考试结果
+
+    Args:
+        questions: 试卷题目列表
+        user_answers: {题目ID: 用户答案}
+        numbering: 试卷的QuestionNumbering
+
+    Returns:
+        (考试结果, 错题条目)。考试结果包含total、correct、wrong、scores、total_scores，
+        以及以题目ID为键的每道题的答题情况；错题条目为答错和未答题目的[(题目ID, 用户答案), ...]，
+        未答题目的用户答案为空字符串
+    """
+    results = {}
+    wrong_entries = []
+    correct_count = 0
+    total_score = 0
+    full_score = 0
+
+    for i, question in enumerate(questions):
+        user_answer = user_answers.get(question.id)
+        result = grade_question(question, user_answer, numbering.number(i))
+        results[question.id] = result
+
+        full_score += result["total_score"]
+        if result["is_correct"]:
+            correct_count += 1
+            total_score += result["score"]
+        else:
+            # 未答题也视为错误
+            wrong_entries.append((question.id, user_answer or ""))
+
+    results["total"] = len(questions)
+    results["correct"] = correct_count
+    results["wrong"] = len(questions) - correct_count
+    results["scores"] = total_score
+    results["total_scores"] = full_score
+    return results, wrong_entries
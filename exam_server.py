@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+服务端模式 - 基于asyncio的HTTP服务，培训室中的多台电脑共用同一个数据库的题库并集中保存成绩
+
+组卷与create_exam相同（按题型随机抽题），判分与交卷相同（exam_paper.grade_exam）。
+数据库访问在有上限的SQLite连接池中执行，连接使用WAL模式，读请求之间互不阻塞
+
+接口（请求和响应均为JSON）:
+    GET  /banks                  题库列表
+    GET  /banks/<题库ID>          题库信息和各题型题目数量
+    POST /banks/<题库ID>/papers   组卷，请求 {"single": 10, "multiple": 5, "judge": 10}，返回试卷（不含答案）
+    POST /papers/<试卷ID>/submit  交卷，请求 {"learner": "张三", "answers": {"12": "A"}}，返回成绩和每道题的答题情况
+
+用法:
+    python exam_server.py --host 0.0.0.0 --port 8765 --db exam_software.db --pool-size 4
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import secrets
+import sqlite3
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from bank_store import load_questions
+from db_migrations import migrate
+from exam_paper import EXAM_CONFIG_KEYS, build_exam, grade_exam
+from question_index import QUESTION_TYPES, QuestionIndex, QuestionNumbering
+
+# 默认的数据库文件，与main.py相同
+DB_FILE = 'exam_software.db'
+
+# 默认监听地址和端口
+HOST = "127.0.0.1"
+PORT = 8765
+
+# 连接池大小
+POOL_SIZE = 4
+
+# 题库在内存中缓存的时间（秒），过期后重新读取，以便看到其他电脑导入的题目
+BANK_CACHE_TTL = 60
+
+# 最多保存的未交卷试卷数量，超过时丢弃最早的试卷
+MAX_PAPERS = 100000
+
+# 请求体的最大长度
+MAX_BODY = 1024 * 1024
+
+# 等待请求的超时时间（秒），空闲的长连接超时后关闭
+IDLE_TIMEOUT = 30
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    """返回给客户端的错误"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ConnectionPool:
+    """
+    有上限的SQLite连接池
+
+    请求是形如fn(conn, *args)的函数，在线程中执行，每个请求作为一个事务：
+    正常返回时提交未提交的修改，抛出异常时回滚。
+    读请求使用size个连接并行执行；写请求只用一个连接按顺序执行，
+    避免多个连接争用写锁时SQLite按忙等待重试造成的延迟尖峰
+    """
+
+    def __init__(self, db_path, size=POOL_SIZE):
+        self.executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="db-read")
+        self.write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write")
+        self.idle = asyncio.Queue()
+        self.connections = []
+        for _ in range(size):
+            conn = self._connect(db_path)
+            self.connections.append(conn)
+            self.idle.put_nowait(conn)
+        self.writer = self._connect(db_path)
+        self.connections.append(self.writer)
+
+    @staticmethod
+    def _connect(db_path):
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA journal_mode = WAL")
+        # WAL模式下只在检查点时同步磁盘，断电时最多丢失最近提交的事务，数据库不会损坏
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA busy_timeout = 5000")
+        return conn
+
+    async def run(self, fn, *args):
+        """取得一个空闲连接执行读请求，没有空闲连接时等待"""
+        conn = await self.idle.get()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, self._call, conn, fn, args)
+        finally:
+            self.idle.put_nowait(conn)
+
+    async def write(self, fn, *args):
+        """在写连接上按提交顺序执行写请求"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self.write_executor, self._call, self.writer, fn, args)
+
+    @staticmethod
+    def _call(conn, fn, args):
+        try:
+            result = fn(conn, *args)
+            if conn.in_transaction:
+                conn.commit()
+            return result
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+
+    def close(self):
+        """关闭线程池和全部连接"""
+        self.executor.shutdown()
+        self.write_executor.shutdown()
+        for conn in self.connections:
+            conn.close()
+
+
+def list_banks(conn):
+    """题库列表及题目数量"""
+    cursor = conn.cursor()
+    cursor.execute('''
+    SELECT b.id, b.name, (SELECT COUNT(*) FROM questions q WHERE q.bank_id = b.id)
+    FROM question_banks b ORDER BY b.id
+    ''')
+    return [{"id": row[0], "name": row[1], "question_count": row[2]} for row in cursor.fetchall()]
+
+
+def load_bank_index(conn, bank_id):
+    """读取题库，返回(题库名称, QuestionIndex)，题库不存在时返回None"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM question_banks WHERE id = ?", (bank_id,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return row[0], QuestionIndex(load_questions(conn, bank_id))
+
+
+def save_submission(conn, bank_id, learner, results):
+    """保存交卷成绩，调用方负责提交事务"""
+    conn.execute('''
+    INSERT INTO exam_submissions (bank_id, learner, total, correct, score, total_score, submitted_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', (bank_id, learner, results["total"], results["correct"], results["scores"],
+          results["total_scores"], datetime.now()))
+
+
+def public_question(question, number):
+    """试卷中发给学员的题目，不含答案和解析"""
+    return {
+        "id": question.id,
+        "number": number,
+        "type": question.type,
+        "content": question.content,
+        "options": question.options,
+        "score": question.score
+    }
+
+
+class ExamServer:
+    """题库、试卷和交卷的接口"""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.banks = {}  # {题库ID: (读取时间, 读取任务)}
+        self.papers = OrderedDict()  # {试卷ID: (题库ID, 题目列表)}
+        self.routes = [
+            ("GET", re.compile(r"^/banks$"), self.get_banks),
+            ("GET", re.compile(r"^/banks/(\d+)$"), self.get_bank),
+            ("POST", re.compile(r"^/banks/(\d+)/papers$"), self.create_paper),
+            ("POST", re.compile(r"^/papers/([0-9a-f]+)/submit$"), self.submit_paper),
+        ]
+
+    async def bank(self, bank_id):
+        """
+        获取缓存的题库，过期或不存在时读取；同时到达的请求共用一次读取
+
+        Returns:
+            (题库名称, QuestionIndex)
+        """
+        entry = self.banks.get(bank_id)
+        if entry is None or time.monotonic() - entry[0] > BANK_CACHE_TTL:
+            entry = (time.monotonic(), asyncio.ensure_future(self.pool.run(load_bank_index, bank_id)))
+            self.banks[bank_id] = entry
+
+        try:
+            bank = await entry[1]
+        except Exception:
+            self._evict_bank(bank_id, entry)
+            raise
+        if bank is None:
+            self._evict_bank(bank_id, entry)
+            raise HttpError(404, f"题库{bank_id}不存在")
+        return bank
+
+    def _evict_bank(self, bank_id, entry):
+        """移除读取失败的缓存项，缓存已被更新的读取替换时保留新的"""
+        if self.banks.get(bank_id) is entry:
+            del self.banks[bank_id]
+
+    async def dispatch(self, method, path, body):
+        """按路径调用接口，返回响应对象"""
+        path = path.split("?", 1)[0]
+        allowed = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if not match:
+                continue
+            if route_method == method:
+                return await handler(*match.groups(), body=body)
+            allowed = True
+        if allowed:
+            raise HttpError(405, "不支持的请求方法")
+        raise HttpError(404, "接口不存在")
+
+    async def get_banks(self, body):
+        return {"banks": await self.pool.run(list_banks)}
+
+    async def get_bank(self, bank_id, body):
+        name, index = await self.bank(int(bank_id))
+        return {
+            "id": int(bank_id),
+            "name": name,
+            "question_count": len(index),
+            "counts": {question_type: index.count(question_type) for question_type in QUESTION_TYPES}
+        }
+
+    async def create_paper(self, bank_id, body):
+        bank_id = int(bank_id)
+        config = {}
+        for key in EXAM_CONFIG_KEYS.values():
+            value = body.get(key, 0)
+            if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+                raise HttpError(400, f"{key}必须是非负整数")
+            config[key] = value
+        if not any(config.values()):
+            raise HttpError(400, "至少选择一道题")
+
+        _, index = await self.bank(bank_id)
+        try:
+            questions = build_exam(index, config)
+        except ValueError:
+            raise HttpError(400, "题目数量超过题库中的题目数") from None
+
+        paper_id = secrets.token_hex(8)
+        self.papers[paper_id] = (bank_id, questions)
+        while len(self.papers) > MAX_PAPERS:
+            self.papers.popitem(last=False)
+
+        numbering = QuestionNumbering(questions)
+        return {
+            "paper_id": paper_id,
+            "bank_id": bank_id,
+            "questions": [public_question(question, numbering.number(i)) for i, question in enumerate(questions)]
+        }
+
+    async def submit_paper(self, paper_id, body):
+        # 每份试卷只能交一次
+        paper = self.papers.pop(paper_id, None)
+        if paper is None:
+            raise HttpError(404, "试卷不存在或已交卷")
+        bank_id, questions = paper
+
+        answers = body.get("answers") or {}
+        if not isinstance(answers, dict):
+            self.papers[paper_id] = paper
+            raise HttpError(400, "answers必须是对象")
+        try:
+            user_answers = {int(question_id): str(answer) for question_id, answer in answers.items() if answer}
+        except ValueError:
+            self.papers[paper_id] = paper
+            raise HttpError(400, "题目ID必须是整数") from None
+
+        results, _ = grade_exam(questions, user_answers, QuestionNumbering(questions))
+        learner = body.get("learner")
+        try:
+            await self.pool.write(save_submission, bank_id, None if learner is None else str(learner), results)
+        except BaseException:
+            # 保存失败时试卷仍可重新提交
+            self.papers[paper_id] = paper
+            raise
+
+        return {
+            "paper_id": paper_id,
+            "total": results["total"],
+            "correct": results["correct"],
+            "wrong": results["wrong"],
+            "score": results["scores"],
+            "total_score": results["total_scores"],
+            "questions": [{
+                "id": question.id,
+                "number": results[question.id]["number"],
+                "user_answer": user_answers.get(question.id),
+                "correct_answer": question.answer,
+                "is_correct": results[question.id]["is_correct"]
+            } for question in questions]
+        }
+
+    async def handle_connection(self, reader, writer):
+        """处理一个HTTP/1.1连接，支持长连接"""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), IDLE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if request is None:
+                    break
+
+                method, path, body, keep_alive = request
+                status, payload = await self.respond(method, path, body)
+                writer.write(encode_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except HttpError as e:
+            # 请求格式错误，返回错误后关闭连接
+            try:
+                writer.write(encode_response(e.status, {"error": e.message}, False))
+                await writer.drain()
+            except (ConnectionError, asyncio.IncompleteReadError):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, method, path, body):
+        """调用接口，返回(状态码, 响应对象)"""
+        try:
+            try:
+                data = json.loads(body) if body else {}
+            except (ValueError, UnicodeDecodeError):
+                raise HttpError(400, "请求体不是有效的JSON") from None
+            if not isinstance(data, dict):
+                raise HttpError(400, "请求体必须是JSON对象")
+            return 200, await self.dispatch(method, path, data)
+        except HttpError as e:
+            return e.status, {"error": e.message}
+        except Exception as e:
+            print(f"处理请求失败 {method} {path}: {str(e)}", file=sys.stderr)
+            return 500, {"error": "服务器内部错误"}
+
+
+async def read_request(reader):
+    """
+    读取一个HTTP请求
+
+    Returns:
+        (方法, 路径, 请求体, 是否保持连接)，连接已关闭时返回None
+    """
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, path, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(400, "请求行格式错误") from None
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HttpError(400, "Content-Length格式错误") from None
+    if length > MAX_BODY:
+        raise HttpError(413, "请求体过大")
+    body = await reader.readexactly(length) if length else b""
+
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+    return method.upper(), path, body, keep_alive
+
+
+def encode_response(status, payload, keep_alive):
+    """编码JSON响应"""
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+async def serve(db_path, host=HOST, port=PORT, pool_size=POOL_SIZE, ready=None):
+    """
+    启动服务并一直运行
+
+    Args:
+        ready: 开始监听后调用，参数为实际监听的端口
+    """
+    # 先在一个连接上升级表结构，再创建连接池
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+        migrate(conn)
+    finally:
+        conn.close()
+
+    pool = ConnectionPool(db_path, pool_size)
+    app = ExamServer(pool)
+    server = await asyncio.start_server(app.handle_connection, host, port, backlog=1024)
+    try:
+        actual_port = server.sockets[0].getsockname()[1]
+        if ready is not None:
+            ready(actual_port)
+        async with server:
+            await server.serve_forever()
+    finally:
+        pool.close()
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="刷题软件服务端模式")
+    parser.add_argument("--host", default=HOST, help=f"监听地址，默认为{HOST}")
+    parser.add_argument("--port", type=int, default=PORT, help=f"监听端口，默认为{PORT}，0表示随机端口")
+    parser.add_argument("--db", default=DB_FILE, help=f"数据库文件，默认为{DB_FILE}")
+    parser.add_argument("--pool-size", type=int, default=POOL_SIZE, help=f"数据库连接数，默认为{POOL_SIZE}")
+    args = parser.parse_args()
+
+    def ready(port):
+        print(f"服务已启动: http://{args.host}:{port}/", flush=True)
+
+    try:
+        asyncio.run(serve(args.db, args.host, args.port, args.pool_size, ready))
+    except KeyboardInterrupt:
+        pass
+    except (OSError, sqlite3.Error) as e:
+        print(f"启动服务失败: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
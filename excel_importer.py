@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+Excel题库导入引擎 - 按批解析题目行，在一个事务内用executemany批量写入
+
+每一批使用独立的保存点，某一行写入失败时只回滚该批并逐行重试，不影响其他行
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import sql_profiler
+
+# 每批写入的行数
+BATCH_SIZE = 2000
+
+INSERT_QUESTION_SQL = (
+    "INSERT INTO questions "
+    "(bank_id, content, type, is_subquestion, options, difficulty, analysis, answer, score) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+class ImportCancelled(Exception):
+    """导入被用户取消"""
+
+
+class ImportProgress:
+    """导入进度统计，计数器可由其他线程读取"""
+
+    def __init__(self):
+        self.total = 0  # Excel中的数据行数，读取文件后才知道
+        self.parsed = 0  # 已解析的行数（不含空行）
+        self.written = 0  # 已写入数据库的行数
+        self.failed = 0  # 失败的行数
+        self.errors = []  # 失败明细 [(行号, 错误信息), ...]
+        self.started_at = time.perf_counter()
+        self.elapsed = 0.0
+        self.cancel_requested = False
+
+    @property
+    def rows_per_sec(self):
+        """写入速度（行/秒）"""
+        return self.written / self.elapsed if self.elapsed > 0 else 0.0
+
+    def add_error(self, row_number, message):
+        """记录一行失败"""
+        self.failed += 1
+        self.errors.append((row_number, message))
+
+    def finish(self):
+        """记录总耗时"""
+        self.elapsed = time.perf_counter() - self.started_at
+
+
+def parse_question_row(bank_id, row):
+    """
+    将Excel中的一行解析为插入参数
+
+    列顺序：试题题干、试题类型、是否阅读理解子题、选项（用|隔开）、难易度、试题解析、答案、分数
+
+    Returns:
+        参数元组，空行返回None
+    """
+    if not row[0]:  # 跳过空行
+        return None
+
+    question_type = row[1] if len(row) > 1 else "单选"
+    options = "|".join(str(opt).strip() for opt in row[3].split('|')) if (len(row) > 3 and row[3]) else ""
+
+    # 处理判断题选项
+    if question_type == "判断" and not options:
+        options = "正确|错误"
+
+    return (
+        bank_id,
+        row[0],  # 试题题干
+        question_type,  # 试题类型
+        1 if (len(row) > 2 and str(row[2]).lower() in ["true", "1", "是"]) else 0,
+        options,
+        row[4] if len(row) > 4 else "中等",  # 难易度
+        row[5] if len(row) > 5 else "",  # 试题解析
+        row[6] if len(row) > 6 else "",  # 答案
+        float(row[7]) if (len(row) > 7 and row[7]) else 0  # 分数
+    )
+
+
+def read_excel_rows(file_path, progress=None):
+    """
+    逐行读取Excel第一个工作表（跳过表头）
+
+    Args:
+        file_path: Excel文件路径
+        progress: ImportProgress对象，不为空时记录总行数
+
+    Yields:
+        (行号, 行数据列表)，行号从2开始，与Excel中显示的行号一致
+    """
+    import xlrd
+
+    workbook = xlrd.open_workbook(file_path, on_demand=True)
+    try:
+        sheet = workbook.sheet_by_index(0)
+        if progress is not None:
+            progress.total = max(0, sheet.nrows - 1)
+        for i in range(1, sheet.nrows):  # 跳过表头
+            yield i + 1, sheet.row_values(i)
+    finally:
+        workbook.release_resources()
+
+
+def _write_batch(cursor, batch, progress):
+    """在保存点内写入一批题目，整批失败时回滚到保存点并逐行重试"""
+    cursor.execute("SAVEPOINT import_batch")
+    try:
+        cursor.executemany(INSERT_QUESTION_SQL, [params for _, params in batch])
+        progress.written += len(batch)
+    except sqlite3.Error:
+        cursor.execute("ROLLBACK TO import_batch")
+        for row_number, params in batch:
+            try:
+                cursor.execute(INSERT_QUESTION_SQL, params)
+                progress.written += 1
+            except sqlite3.Error as e:
+                progress.add_error(row_number, str(e))
+    cursor.execute("RELEASE import_batch")
+
+
+def import_rows(conn, bank_id, rows, batch_size=BATCH_SIZE, progress=None):
+    """
+    将题目行批量写入指定题库，调用方负责事务的提交或回滚
+
+    Args:
+        conn: 数据库连接
+        bank_id: 题库ID
+        rows: 可迭代的 (行号, 行数据列表)
+        batch_size: 每批写入的行数
+        progress: ImportProgress对象，为空时新建
+
+    Returns:
+        ImportProgress对象
+    """
+    if progress is None:
+        progress = ImportProgress()
+
+    cursor = conn.cursor()
+    batch = []
+    for row_number, row in rows:
+        if progress.cancel_requested:
+            raise ImportCancelled()
+
+        try:
+            params = parse_question_row(bank_id, row)
+        except Exception as e:
+            progress.add_error(row_number, str(e))
+            continue
+
+        if params is None:
+            continue
+
+        progress.parsed += 1
+        batch.append((row_number, params))
+        if len(batch) >= batch_size:
+            _write_batch(cursor, batch, progress)
+            batch = []
+
+    if batch:
+        _write_batch(cursor, batch, progress)
+
+    if progress.cancel_requested:
+        raise ImportCancelled()
+
+    progress.finish()
+    return progress
+
+
+def import_bank(conn, bank_name, rows, batch_size=BATCH_SIZE, progress=None):
+    """
+    新建题库并导入所有题目，整个过程在一个事务内完成，出错时全部回滚
+
+    Args:
+        conn: 数据库连接
+        bank_name: 题库名称
+        rows: 可迭代的 (行号, 行数据列表)，通常来自read_excel_rows
+        batch_size: 每批写入的行数
+        progress: ImportProgress对象，为空时新建
+
+    Returns:
+        (题库ID, ImportProgress对象)
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SAVEPOINT import_bank")
+        now = datetime.now()
+        cursor.execute(
+            "INSERT INTO question_banks (name, created_at, updated_at) VALUES (?, ?, ?)",
+            (bank_name, now, now)
+        )
+        bank_id = cursor.lastrowid
+
+        progress = import_rows(conn, bank_id, rows, batch_size, progress)
+
+        cursor.execute("RELEASE import_bank")
+        conn.commit()
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+
+    return bank_id, progress
+
+
+class ImportWorker(threading.Thread):
+    """
+    后台导入线程，使用独立的数据库连接
+
+    界面线程通过progress读取进度，调用cancel()取消；结束后done为True，
+    结果在bank_id、cancelled、error中
+    """
+
+    def __init__(self, db_path, bank_name, file_path, batch_size=BATCH_SIZE):
+        super().__init__(daemon=True)
+        self.db_path = db_path
+        self.bank_name = bank_name
+        self.file_path = file_path
+        self.batch_size = batch_size
+        self.progress = ImportProgress()
+        self.bank_id = None
+        self.cancelled = False
+        self.error = None
+        self.done = False
+
+    def cancel(self):
+        """请求取消导入，已写入的数据会被回滚"""
+        self.progress.cancel_requested = True
+
+    def run(self):
+        conn = None
+        try:
+            conn = sql_profiler.connect(self.db_path)
+            conn.execute("PRAGMA foreign_keys = ON")
+            rows = read_excel_rows(self.file_path, self.progress)
+            self.bank_id, _ = import_bank(conn, self.bank_name, rows, self.batch_size, self.progress)
+        except ImportCancelled:
+            self.cancelled = True
+        except Exception as e:
+            self.error = e
+        finally:
+            if conn is not None:
+                conn.close()
+            self.progress.finish()
+            self.done = True
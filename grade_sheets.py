@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量判分 - 按题库的标准答案为答题卡文件判分，规则与交卷时相同（exam_paper.score_sheet）
+
+边读取边判分边输出，答题卡分批交给多个进程并行判分，输出顺序与输入相同。
+每个进程启动时从数据库读取一次题库
+
+答题卡文件为JSONL或CSV（按扩展名判断，也可用--format指定，"-"表示标准输入）:
+    JSONL每行一张答题卡，questions为试卷的题目ID顺序，省略时为answers中的题目:
+        {"sheet_id": "s1", "answers": {"12": "A", "13": "BD"}, "questions": [12, 13, 14]}
+    CSV每行一道题，同一张答题卡的行相邻，答案为空表示未作答:
+        sheet_id,question_id,answer
+
+输出每张答题卡的成绩（JSONL，输出文件扩展名为.csv时为CSV），
+--question-stats指定时另外输出每道题的正确率（CSV）
+
+用法:
+    python grade_sheets.py 1 sheets.jsonl -o scores.jsonl --question-stats stats.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import pathlib
+import sqlite3
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import groupby, islice
+
+from bank_store import load_questions
+from exam_paper import score_sheet
+
+# 默认的数据库文件，与main.py相同
+DB_FILE = 'exam_software.db'
+
+# 每批交给一个进程判分的答题卡数量
+CHUNK_SIZE = 500
+
+# 成绩输出的字段
+SCORE_FIELDS = ["sheet_id", "total", "correct", "wrong", "score", "total_score", "unknown"]
+
+# 题目正确率输出的字段
+STATS_FIELDS = ["question_id", "type", "attempts", "correct", "accuracy"]
+
+# 工作进程中的题库 {题目ID: 题目}
+_questions = None
+
+
+def load_bank_questions(db_path, bank_id):
+    """以只读方式读取题库，返回{题目ID: 题目}"""
+    # 路径中的空格、#、?等需要按URI转义
+    conn = sqlite3.connect(pathlib.Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        return {question.id: question for question in load_questions(conn, bank_id)}
+    finally:
+        conn.close()
+
+
+def read_jsonl(lines):
+    """
+    逐行读取JSONL答题卡
+
+    Yields:
+        (答题卡ID, 试卷题目ID列表, {题目ID: 用户答案})
+    """
+    for line_no, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            answers = {int(question_id): str(answer)
+                       for question_id, answer in (record.get("answers") or {}).items() if answer}
+            question_ids = [int(question_id) for question_id in record.get("questions") or answers]
+        except (ValueError, TypeError, AttributeError) as e:
+            print(f"第{line_no}行格式错误，已跳过: {str(e)}", file=sys.stderr)
+            continue
+        yield record.get("sheet_id", line_no), question_ids, answers
+
+
+def read_csv(lines):
+    """
+    读取CSV答题卡，同一张答题卡的行相邻
+
+    Yields:
+        (答题卡ID, 试卷题目ID列表, {题目ID: 用户答案})
+    """
+    reader = csv.DictReader(lines)
+    missing = {"sheet_id", "question_id", "answer"} - set(reader.fieldnames or [])
+    if missing:
+        raise ValueError(f"CSV缺少列: {', '.join(sorted(missing))}")
+
+    for sheet_id, rows in groupby(reader, key=lambda row: row["sheet_id"]):
+        question_ids = []
+        answers = {}
+        for row in rows:
+            try:
+                question_id = int(row["question_id"])
+            except ValueError:
+                print(f"答题卡{sheet_id}的题目ID格式错误，已跳过: {row['question_id']}", file=sys.stderr)
+                continue
+            question_ids.append(question_id)
+            if row["answer"]:
+                answers[question_id] = row["answer"]
+        yield sheet_id, question_ids, answers
+
+
+def grade_sheet(questions_by_id, sheet, stats):
+    """
+    为一张答题卡判分，并把每道题的作答情况累加到stats
+
+    Args:
+        questions_by_id: {题目ID: 题目}
+        sheet: (答题卡ID, 试卷题目ID列表, {题目ID: 用户答案})
+        stats: {题目ID: [作答次数, 正确次数]}
+
+    Returns:
+        成绩，字段见SCORE_FIELDS；unknown为题库中不存在的题目数，不计入成绩
+    """
+    sheet_id, question_ids, answers = sheet
+    questions = [questions_by_id[qid] for qid in question_ids if qid in questions_by_id]
+    flags, score, full_score = score_sheet(questions, answers)
+
+    correct = 0
+    for question, is_correct in zip(questions, flags):
+        counts = stats.get(question.id)
+        if counts is None:
+            counts = stats[question.id] = [0, 0]
+        counts[0] += 1
+        if is_correct:
+            counts[1] += 1
+            correct += 1
+
+    return {
+        "sheet_id": sheet_id,
+        "total": len(questions),
+        "correct": correct,
+        "wrong": len(questions) - correct,
+        "score": score,
+        "total_score": full_score,
+        "unknown": len(question_ids) - len(questions)
+    }
+
+
+def _init_worker(db_path, bank_id):
+    global _questions
+    _questions = load_bank_questions(db_path, bank_id)
+
+
+def _grade_chunk(sheets):
+    """在工作进程中为一批答题卡判分，返回(成绩列表, 题目作答统计)"""
+    stats = {}
+    return [grade_sheet(_questions, sheet, stats) for sheet in sheets], stats
+
+
+def chunked(iterable, size):
+    """按size个一批切分，不预先读取整个输入"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def merge_stats(total, stats):
+    """合并题目作答统计"""
+    for question_id, (attempts, correct) in stats.items():
+        counts = total.setdefault(question_id, [0, 0])
+        counts[0] += attempts
+        counts[1] += correct
+
+
+def grade_sheets(db_path, bank_id, sheets, on_score, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    为答题卡判分，按输入顺序对每张答题卡调用on_score(成绩)
+
+    Args:
+        db_path: 数据库文件路径
+        bank_id: 题库ID
+        sheets: 答题卡的可迭代对象，按需读取
+        on_score: 每张答题卡判分后的回调
+        workers: 进程数，为空时使用CPU数量，为1时在当前进程中判分
+        chunk_size: 每批的答题卡数量
+
+    Returns:
+        题目作答统计 {题目ID: [作答次数, 正确次数]}
+    """
+    workers = workers or os.cpu_count() or 1
+    total_stats = {}
+
+    if workers == 1:
+        _init_worker(db_path, bank_id)
+        for chunk in chunked(sheets, chunk_size):
+            scores, stats = _grade_chunk(chunk)
+            for score in scores:
+                on_score(score)
+            merge_stats(total_stats, stats)
+        return total_stats
+
+    def collect(future):
+        scores, stats = future.result()
+        for score in scores:
+            on_score(score)
+        merge_stats(total_stats, stats)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(db_path, bank_id)) as executor:
+        # 限制同时在途的批数，输入只比输出多读取有限的几批
+        pending = deque()
+        for chunk in chunked(sheets, chunk_size):
+            pending.append(executor.submit(_grade_chunk, chunk))
+            if len(pending) >= workers * 2:
+                collect(pending.popleft())
+        while pending:
+            collect(pending.popleft())
+    return total_stats
+
+
+def write_question_stats(path, questions_by_id, stats):
+    """输出每道题的作答次数和正确率，按题目ID排序"""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=STATS_FIELDS)
+        writer.writeheader()
+        for question_id in sorted(stats):
+            attempts, correct = stats[question_id]
+            writer.writerow({
+                "question_id": question_id,
+                "type": questions_by_id[question_id].type,
+                "attempts": attempts,
+                "correct": correct,
+                "accuracy": round(correct / attempts, 4) if attempts else 0
+            })
+
+
+def open_text(path, mode):
+    """打开文本文件，"-"表示标准输入或标准输出"""
+    if path == "-":
+        return nullcontext(sys.stdin if "r" in mode else sys.stdout)
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="按题库的标准答案为答题卡文件批量判分")
+    parser.add_argument("bank_id", type=int, help="题库ID")
+    parser.add_argument("sheets", help="答题卡文件（JSONL或CSV），-表示标准输入")
+    parser.add_argument("-o", "--output", default="-", help="成绩输出文件（JSONL或CSV），默认为标准输出")
+    parser.add_argument("--question-stats", help="每道题正确率的输出文件（CSV）")
+    parser.add_argument("--db", default=DB_FILE, help=f"数据库文件，默认为{DB_FILE}")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="答题卡文件格式，默认按扩展名判断")
+    parser.add_argument("--workers", type=int, help="判分进程数，默认为CPU数量")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="每批判分的答题卡数量")
+    args = parser.parse_args()
+
+    try:
+        questions_by_id = load_bank_questions(args.db, args.bank_id)
+    except sqlite3.Error as e:
+        print(f"读取题库失败: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    if not questions_by_id:
+        print(f"题库{args.bank_id}中没有题目", file=sys.stderr)
+        sys.exit(1)
+
+    input_format = args.format or ("csv" if args.sheets.lower().endswith(".csv") else "jsonl")
+    reader = read_csv if input_format == "csv" else read_jsonl
+
+    start = time.perf_counter()
+    count = 0
+
+    def on_score(score):
+        nonlocal count
+        count += 1
+        write_score(score)
+
+    try:
+        with open_text(args.sheets, "r") as sheets_file, open_text(args.output, "w") as output:
+            if args.output.lower().endswith(".csv"):
+                writer = csv.DictWriter(output, fieldnames=SCORE_FIELDS)
+                writer.writeheader()
+                write_score = writer.writerow
+            else:
+                def write_score(score):
+                    output.write(json.dumps(score, ensure_ascii=False) + "\n")
+
+            stats = grade_sheets(args.db, args.bank_id, reader(sheets_file), on_score,
+                                 args.workers, args.chunk_size)
+    except (OSError, ValueError) as e:
+        print(f"判分失败: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.question_stats:
+        write_question_stats(args.question_stats, questions_by_id, stats)
+
+    elapsed = time.perf_counter() - start
+    print(f"已判分 {count} 张答题卡，用时 {elapsed:.2f} 秒", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
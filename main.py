@@ -1,20 +1,53 @@
+# 最先导入，以导入时间近似进程启动时间
+from startup_timing import StartupTimer, timing_enabled
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import sqlite3
-import random
 import os
+import time
 from datetime import datetime
 import sys
 
+from db_migrations import migrate
+from excel_importer import ImportWorker
+from answer_journal import AnswerJournal, FLUSH_INTERVAL, write_batch
+from question_order import save_order
+from db_worker import DatabaseWorker
+import bank_store
+from question_index import QuestionIndex
+from practice_session import EXAM, RANDOM, SEQUENCE, WRONG, PracticeSession, can_resume_order, practice_order
+from exam_paper import build_exam, grade_exam, is_correct
+from progress_grid import ProgressGrid
+from question_view import QuestionView
+from wrong_set import WrongSet, add_wrong_questions, load_all_wrong_questions, remove_wrong_question
+from wrong_browser import WrongQuestionBrowser
+from result_view import CHUNK_DELAY, ChunkedRenderer, LazyResultNotebook
+from ui_fonts import DEFAULT_FONT_SIZE, MAX_FONT_SIZE, MIN_FONT_SIZE, FontScheme
+from tracing import record, start_tracing, traced
+import sql_profiler
+
 # 确保Python 3.6兼容性
 if sys.version_info < (3, 6):
     raise Exception("本软件需要Python 3.6或更高版本运行")
 
+# 数据库文件
+DB_FILE = 'exam_software.db'
+
 
 class ExamSoftware:
-    def __init__(self, root):
-        """初始化刷题软件"""
+    def __init__(self, root, startup_timer=None):
+        """
+        初始化刷题软件
+
+        先绘制主界面，再在后台加载上次使用的题库，加载完成后启用练习按钮
+
+        Args:
+            root: Tk根窗口
+            startup_timer: 启动耗时统计，为空时不统计
+        """
         self.root = root
+        self.startup_timer = startup_timer or StartupTimer(False)
         self.root.title("题刷刷")
         self.root.geometry("1000x700")
         self.root.minsize(900, 600)
@@ -26,8 +59,8 @@ class ExamSoftware:
         self.font_family = "SimHei"
         self.style = ttk.Style()
 
-        # 初始化当前字体大小
-        self.current_font_size = 10
+        # 初始化当前字体大小，数据库初始化时读取设置
+        self.current_font_size = DEFAULT_FONT_SIZE
 
         # 颜色方案 - 美化界面
         self.colors = {
@@ -44,18 +77,16 @@ class ExamSoftware:
         }
 
         # 数据初始化
-        self.current_index = 0  # 当前题目索引
         self.last_practice_positions = {}  # 存储每种练习模式的最后位置
         self.question_bank = []  # 题库
-        self.current_questions = []  # 当前练习的题目
-        self.current_index = 0  # 当前题目索引
-        self.user_answers = {}  # 用户答案
-        self.wrong_questions = []  # 错题集
-        self.mode = ""  # 练习模式
+        self.question_index = QuestionIndex()  # 题库索引，随题库一起重建
+        self.session = PracticeSession()  # 当前练习：题目、编号表、用户答案和当前位置
+        self.wrong_questions = WrongSet()  # 错题集
         self.exam_results = {}  # 考试结果
         self.current_bank_id = None  # 当前题库ID
         self.current_bank_name = ""  # 当前题库名称
-        self.question_index_map = {}  # 用于映射进度框位置到题目索引
+        self.bank_loading = False  # 是否正在后台加载题库
+        self.bank_buttons = []  # 主界面上需要题库的按钮
         self.exam_config = {  # 存储上次考试配置
             "single": 10,
             "multiple": 5,
@@ -64,24 +95,49 @@ class ExamSoftware:
 
         # 初始化数据库
         self.init_database()
+        self.startup_timer.mark("数据库初始化")
+
+        # 后台数据库线程，界面线程中不执行耗时的查询和写入
+        self.db_worker = DatabaseWorker(DB_FILE, self.root)
+
+        # 答题日志：答案先缓存在内存中，定时合并写入数据库
+        self.answer_journal = AnswerJournal(self.conn)
+        self.root.after(FLUSH_INTERVAL * 1000, self.periodic_flush_answers)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # 界面组件缓存
-        self.progress_frames = {}  # 缓存进度框组件
+        self.progress_grid = None  # 答题进度网格
         self.content_frame = None  # 内容区域框架
         self.progress_canvas = None  # 进度区画布
-        self.progress_scrollable_frame = None  # 进度区可滚动框架
 
-        # 加载错题集
-        self.load_wrong_questions()
-
-        # 尝试加载上次使用的题库
-        self.load_last_used_bank()
-
-        # 设置界面样式（在数据库初始化后调用）
+        # 界面字体和样式（在读取字体大小设置后创建）
+        self.fonts = FontScheme(self.root, self.font_family, self.current_font_size)
         self.setup_styles()
 
-        # 创建主界面
+        # 创建主界面，题库加载完成前练习按钮不可用
+        self.bank_loading = True
         self.create_main_interface()
+        self.startup_timer.mark("主界面创建")
+
+        # 主界面绘制后再在后台加载上次使用的题库
+        self._expose_binding = self.root.bind("<Expose>", self.on_first_paint, add="+")
+        self.root.after_idle(lambda: self.load_last_used_bank(on_loaded=self.on_startup_bank_ready))
+
+        # 设置环境变量EXERCISER_TRACE=1或使用--trace参数时记录操作耗时，按F12显示调试浮窗
+        start_tracing(self.root)
+
+    def on_first_paint(self, event):
+        """主窗口第一次绘制"""
+        self.root.unbind("<Expose>", self._expose_binding)
+        self.startup_timer.mark("首次绘制")
+
+    def on_startup_bank_ready(self):
+        """启动时的题库加载结束（成功、失败或没有上次使用的题库）"""
+        if self.question_bank:
+            self.startup_timer.mark("题库就绪", f"{len(self.question_bank)} 道题")
+        else:
+            self.startup_timer.mark("题库就绪", "未加载题库")
+        self.startup_timer.report()
 
     def set_application_icon(self):
         """设置应用程序图标"""
@@ -134,121 +190,25 @@ class ExamSoftware:
         # 设置窗口位置和尺寸
         window.geometry(f"{width}x{height}+{x}+{y}")
 
-    def setup_styles(self):
-        """设置界面样式"""
-        # 配置ttk样式
-        self.style.configure("TButton", font=(self.font_family, 10))
-        self.style.configure("TLabel", font=(self.font_family, 10))
-
-        # 自定义样式
-        self.style.configure("Header.TLabel", font=(self.font_family, 16, "bold"))
-        self.style.configure("Title.TLabel", font=(self.font_family, 24, "bold"))
-        self.style.configure("Question.TLabel", font=(self.font_family, 12))
-        self.style.configure("Option.TRadiobutton", font=(self.font_family, 11))
-        self.style.configure("Option.TCheckbutton", font=(self.font_family, 11))
-        self.style.configure("Status.TLabel", font=(self.font_family, 10), foreground="gray")
-
-        # 按钮样式美化
-        self.style.configure("Primary.TButton",
-                             background=self.colors["primary"],
-                             foreground="white",
-                             font=(self.font_family, 10, "bold"))
-        self.style.map("Primary.TButton",
-                       background=[("active", "#3367d6")])
-
     def init_database(self):
         """初始化SQLite数据库"""
         try:
             # 连接数据库，不存在则创建
-            self.conn = sqlite3.connect('exam_software.db')
+            self.conn = sql_profiler.connect(DB_FILE)
             self.cursor = self.conn.cursor()
 
             # 启用外键约束
             self.cursor.execute("PRAGMA foreign_keys = ON")
 
-            # 创建题库表
-            self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS question_banks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                description TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                is_last_used INTEGER DEFAULT 0
-            )
-            ''')
-
-            # 创建题目表
-            self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS questions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                bank_id INTEGER NOT NULL,
-                content TEXT NOT NULL,
-                type TEXT NOT NULL,
-                is_subquestion INTEGER DEFAULT 0,
-                options TEXT,
-                difficulty TEXT,
-                analysis TEXT,
-                answer TEXT NOT NULL,
-                score REAL DEFAULT 0,
-                FOREIGN KEY (bank_id) REFERENCES question_banks (id) ON DELETE CASCADE
-            )
-            ''')
-
-            # 创建答题进度表
-            self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS progress (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                bank_id INTEGER NOT NULL,
-                mode TEXT NOT NULL,
-                question_id INTEGER NOT NULL,
-                user_answer TEXT,
-                answered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (bank_id) REFERENCES question_banks (id) ON DELETE CASCADE,
-                FOREIGN KEY (question_id) REFERENCES questions (id) ON DELETE CASCADE,
-                UNIQUE(bank_id, mode, question_id)
-            )
-            ''')
-
-            # 创建题目顺序表
-            self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS question_orders (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                bank_id INTEGER NOT NULL,
-                mode TEXT NOT NULL,
-                position INTEGER NOT NULL,
-                question_id INTEGER NOT NULL,
-                FOREIGN KEY (bank_id) REFERENCES question_banks (id) ON DELETE CASCADE,
-                FOREIGN KEY (question_id) REFERENCES questions (id) ON DELETE CASCADE,
-                UNIQUE(bank_id, mode, position)
-            )
-            ''')
-
-            # 创建错题集表
-            self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS wrong_questions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                bank_id INTEGER NOT NULL,
-                question_id INTEGER NOT NULL,
-                user_answer TEXT,
-                added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (bank_id) REFERENCES question_banks (id) ON DELETE CASCADE,
-                FOREIGN KEY (question_id) REFERENCES questions (id) ON DELETE CASCADE,
-                UNIQUE(bank_id, question_id)
-            )
-            ''')
-
-            # 创建配置表
-            self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS config (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                key TEXT NOT NULL UNIQUE,
-                value TEXT NOT NULL
-            )
-            ''')
-
-            # 加载考试配置
+            # 使用WAL日志模式，减少每次提交的磁盘同步开销，并允许后台线程同时读写
+            self.cursor.execute("PRAGMA journal_mode = WAL")
+
+            # 按版本升级表结构和索引
+            migrate(self.conn)
+
+            # 加载考试配置和字体大小
             self.load_exam_config()
+            self.load_font_size()
 
             self.conn.commit()
         except sqlite3.Error as e:
@@ -276,61 +236,70 @@ class ExamSoftware:
         except sqlite3.Error as e:
             print(f"加载考试配置失败: {str(e)}")
 
-    def save_exam_config(self):
-        """保存考试配置"""
+    def load_font_size(self):
+        """加载字体大小设置，默认为10"""
         try:
-            # 保存单选题数量
-            self.cursor.execute('''
-            INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)
-            ''', ('single_count', str(self.exam_config['single'])))
-
-            # 保存多选题数量
-            self.cursor.execute('''
-            INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)
-            ''', ('multiple_count', str(self.exam_config['multiple'])))
+            self.cursor.execute("SELECT value FROM config WHERE key = 'font_size'")
+            result = self.cursor.fetchone()
+            if result:
+                self.current_font_size = min(MAX_FONT_SIZE, max(MIN_FONT_SIZE, int(result[0])))
+        except (sqlite3.Error, ValueError) as e:
+            print(f"加载字体大小失败: {str(e)}")
 
-            # 保存判断题数量
-            self.cursor.execute('''
-            INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)
-            ''', ('judge_count', str(self.exam_config['judge'])))
+    def save_exam_config(self):
+        """保存考试配置"""
+        self.db_worker.submit(
+            bank_store.save_exam_config, dict(self.exam_config),
+            errback=lambda e: print(f"保存考试配置失败: {str(e)}")
+        )
 
-            self.conn.commit()
-        except sqlite3.Error as e:
-            self.conn.rollback()
-            print(f"保存考试配置失败: {str(e)}")
+    def load_last_used_bank(self, on_loaded=None):
+        """
+        在后台查找并加载上次使用的题库
 
-    def load_last_used_bank(self):
-        """加载上次使用的题库"""
-        try:
-            self.cursor.execute("SELECT id, name FROM question_banks WHERE is_last_used = 1 LIMIT 1")
-            result = self.cursor.fetchone()
+        Args:
+            on_loaded: 加载结束后（包括没有上次使用的题库和加载失败）在界面线程中调用
+        """
+        def found(result):
+            # 启动期间已导入并加载了新题库
+            if self.current_bank_id:
+                if on_loaded is not None:
+                    on_loaded()
+                return
 
             if result:
                 self.current_bank_id = result[0]
                 self.current_bank_name = result[1]
-                self.load_question_bank()
-        except sqlite3.Error as e:
-            messagebox.showerror("数据库错误", f"加载上次使用的题库失败: {str(e)}")
+                self.load_question_bank(on_loaded)
+                return
 
-    def set_last_used_bank(self, bank_id):
-        """设置指定题库为上次使用的题库"""
-        try:
-            # 先清除所有上次使用标记
-            self.cursor.execute("UPDATE question_banks SET is_last_used = 0")
+            self.bank_loading = False
+            self.update_bank_buttons()
+            if on_loaded is not None:
+                on_loaded()
 
-            # 设置当前题库为上次使用
-            self.cursor.execute(
-                "UPDATE question_banks SET is_last_used = 1 WHERE id = ?",
-                (bank_id,)
-            )
+        def failed(error):
+            self.bank_loading = False
+            self.update_bank_buttons()
+            if on_loaded is not None:
+                on_loaded()
+            messagebox.showerror("数据库错误", f"加载上次使用的题库失败: {str(error)}")
 
-            self.conn.commit()
-        except sqlite3.Error as e:
-            self.conn.rollback()
-            print(f"设置上次使用的题库失败: {str(e)}")
+        self.bank_loading = True
+        self.db_worker.submit(bank_store.find_last_used_bank, callback=found, errback=failed)
+
+    def set_last_used_bank(self, bank_id):
+        """设置指定题库为上次使用的题库"""
+        self.db_worker.submit(
+            bank_store.set_last_used_bank, bank_id,
+            errback=lambda e: print(f"设置上次使用的题库失败: {str(e)}")
+        )
 
     def create_main_interface(self):
         """创建主界面 - 美化版本"""
+        # 离开答题界面时写入缓存的答案
+        self.flush_answers()
+
         # 清空当前界面
         for widget in self.root.winfo_children():
             widget.destroy()
@@ -406,7 +375,7 @@ class ExamSoftware:
         seq_btn = tk.Button(
             button_frame,
             text="顺序练习",
-            command=lambda: self.start_practice("sequence"),
+            command=lambda: self.start_practice(SEQUENCE),
             state=tk.NORMAL if self.question_bank else tk.DISABLED,
             **seq_style
         )
@@ -419,7 +388,7 @@ class ExamSoftware:
         rand_btn = tk.Button(
             button_frame,
             text="随机练习",
-            command=lambda: self.start_practice("random"),
+            command=lambda: self.start_practice(RANDOM),
             state=tk.NORMAL if self.question_bank else tk.DISABLED, **seq_style
         )
         rand_btn.grid(row=1, column=1, padx=30, pady=15)
@@ -471,11 +440,13 @@ class ExamSoftware:
         )
         settings_btn.pack(side=tk.RIGHT, padx=10)
 
+        # 题库加载完成后由update_bank_buttons更新
+        self.bank_buttons = [seq_btn, rand_btn, exam_btn, wrong_btn]
+
         # 状态标签
         self.status_label = ttk.Label(
             self.root,
-            text="请先从Excel导入题库" if not self.question_bank else
-            f"已加载题库: {self.current_bank_name}，共 {len(self.question_bank)} 道题",
+            text=self.bank_status_text(),
             style="Status.TLabel",
             background=self.colors["bg"]
         )
@@ -527,8 +498,8 @@ class ExamSoftware:
         font_size_var = tk.IntVar(value=current_font_size)
         font_size_spinbox = tk.Spinbox(
             font_frame,
-            from_=8,
-            to=20,
+            from_=MIN_FONT_SIZE,
+            to=MAX_FONT_SIZE,
             textvariable=font_size_var,
             width=5,
             font=(self.font_family, 10)
@@ -657,7 +628,8 @@ class ExamSoftware:
         reset_btn = tk.Button(
             btn_frame,
             text="重置",
-            command=lambda: [font_size_var.set(10), self.update_preview_labels(preview_label, box_sample, 10)],
+            command=lambda: [font_size_var.set(DEFAULT_FONT_SIZE),
+                             self.update_preview_labels(preview_label, box_sample, DEFAULT_FONT_SIZE)],
             width=10,
             height=1,
             bg="#f1f3f4",
@@ -675,8 +647,8 @@ class ExamSoftware:
         # 更新文本预览标签
         preview_label.config(font=(self.font_family, font_size))
 
-        # 更新进度框示例大小
-        box_size = max(28, font_size * 2)
+        # 更新进度框示例大小，与进度网格的方框大小一致
+        box_size = max(28, font_size * 3)
         box_sample.config(width=box_size, height=box_size)
 
         # 更新进度框示例中的标签字体大小
@@ -688,70 +660,51 @@ class ExamSoftware:
         box_sample.grid_propagate(False)
 
     def apply_font_size(self, font_size, settings_window):
-        """应用字体大小设置"""
-        try:
-            # 保存字体大小到配置
-            if hasattr(self, 'conn') and self.conn:
-                self.cursor.execute(
-                    "INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)",
-                    ('font_size', str(font_size))
-                )
-                self.conn.commit()
-
-            # 更新当前字体大小
-            self.current_font_size = font_size
+        """
+        应用字体大小设置
 
-            # 重新配置样式
-            self.setup_styles()
+        只重新配置共享的命名字体，使用它们的控件和ttk样式由Tk自动刷新；
+        进度方框的大小随字体变化，进度网格重新布局一次
+        """
+        font_size = min(MAX_FONT_SIZE, max(MIN_FONT_SIZE, font_size))
 
-            # 如果在答题界面，需要刷新界面
-            if hasattr(self, 'content_frame') and self.content_frame and self.content_frame.winfo_exists():
-                # 重新显示当前题目
-                self.update_question_display()
-                self.update_progress_display()
-            else:
-                # 否则重新创建主界面
-                self.create_main_interface()
+        # 在后台保存字体大小到配置
+        self.db_worker.submit(
+            bank_store.save_font_size, font_size,
+            errback=lambda e: messagebox.showerror("错误", f"保存设置失败: {str(e)}")
+        )
 
-            settings_window.destroy()
-            messagebox.showinfo("成功", "字体大小已更新")
+        # 更新当前字体大小
+        self.current_font_size = font_size
+        if self.fonts.set_size(font_size):
+            # 如果在答题界面，重新布局进度网格
+            if self.progress_canvas is not None and self.progress_canvas.winfo_exists():
+                self.progress_grid.relayout()
 
-        except sqlite3.Error as e:
-            if hasattr(self, 'conn'):
-                self.conn.rollback()
-            messagebox.showerror("错误", f"保存设置失败: {str(e)}")
+        settings_window.destroy()
+        messagebox.showinfo("成功", "字体大小已更新")
 
     def setup_styles(self):
-        """设置界面样式"""
-        # 获取字体大小设置，默认为10
-        if hasattr(self, 'conn') and self.conn:
-            try:
-                self.cursor.execute("SELECT value FROM config WHERE key = 'font_size'")
-                result = self.cursor.fetchone()
-                self.current_font_size = int(result[0]) if result else 10
-            except sqlite3.Error:
-                self.current_font_size = 10
-        else:
-            self.current_font_size = 10
+        """设置界面样式，字体使用共享的命名字体，字体大小变化时不需要重新配置"""
+        fonts = self.fonts
 
         # 配置ttk样式
-        base_font = (self.font_family, self.current_font_size)
-        self.style.configure("TButton", font=base_font)
-        self.style.configure("TLabel", font=base_font)
+        self.style.configure("TButton", font=fonts.base)
+        self.style.configure("TLabel", font=fonts.base)
 
         # 自定义样式
-        self.style.configure("Header.TLabel", font=(self.font_family, self.current_font_size + 6, "bold"))
-        self.style.configure("Title.TLabel", font=(self.font_family, self.current_font_size + 14, "bold"))
-        self.style.configure("Question.TLabel", font=(self.font_family, self.current_font_size + 2))
-        self.style.configure("Option.TRadiobutton", font=(self.font_family, self.current_font_size + 1))
-        self.style.configure("Option.TCheckbutton", font=(self.font_family, self.current_font_size + 1))
-        self.style.configure("Status.TLabel", font=(self.font_family, self.current_font_size), foreground="gray")
+        self.style.configure("Header.TLabel", font=fonts.header)
+        self.style.configure("Title.TLabel", font=fonts.title)
+        self.style.configure("Question.TLabel", font=fonts.content)
+        self.style.configure("Option.TRadiobutton", font=fonts.option)
+        self.style.configure("Option.TCheckbutton", font=fonts.option)
+        self.style.configure("Status.TLabel", font=fonts.base, foreground="gray")
 
         # 按钮样式美化
         self.style.configure("Primary.TButton",
                              background=self.colors["primary"],
                              foreground="white",
-                             font=(self.font_family, self.current_font_size, "bold"))
+                             font=fonts.bold)
         self.style.map("Primary.TButton",
                        background=[("active", "#3367d6")])
 
@@ -835,86 +788,96 @@ class ExamSoftware:
         name_entry.select_range(0, tk.END)
         name_entry.focus()
 
+        # 导入进度区域（开始导入后显示）
+        progress_frame = tk.Frame(dialog, bg=self.colors["bg"])
+        progress_bar = ttk.Progressbar(progress_frame, orient=tk.HORIZONTAL, length=280, mode="determinate")
+        progress_bar.pack(pady=5)
+        progress_label = ttk.Label(
+            progress_frame,
+            text="正在读取Excel文件...",
+            font=(self.font_family, 9),
+            foreground=self.colors["text_light"],
+            background=self.colors["bg"]
+        )
+        progress_label.pack()
+
+        # 后台导入线程
+        worker = None
+
+        def poll_import():
+            """定时检查后台导入进度，在界面线程中更新进度条"""
+            progress = worker.progress
+            if progress.total:
+                progress_bar.config(maximum=progress.total, value=progress.parsed + progress.failed)
+                progress_label.config(
+                    text=f"已解析 {progress.parsed}/{progress.total}，已写入 {progress.written}，失败 {progress.failed}"
+                )
+
+            if not worker.done:
+                dialog.after(50, poll_import)
+                return
+
+            dialog.destroy()
+
+            if worker.cancelled:
+                messagebox.showinfo("提示", "已取消导入，题库未做任何修改")
+                return
+
+            if worker.error is not None:
+                if isinstance(worker.error, sqlite3.Error):
+                    messagebox.showerror("数据库错误", f"导入失败: {str(worker.error)}")
+                else:
+                    messagebox.showerror("错误", f"导入失败: {str(worker.error)}")
+                return
+
+            for row_number, error in progress.errors:
+                print(f"导入第{row_number}行失败: {error}")
+            print(f"导入耗时 {progress.elapsed:.2f} 秒，{progress.rows_per_sec:.0f} 行/秒")
+
+            # 设置为上次使用的题库
+            self.set_last_used_bank(worker.bank_id)
+
+            def bank_loaded():
+                self.create_main_interface()
+                messagebox.showinfo("成功", f"题库导入完成，共导入 {progress.written} 道题")
+
+            # 刷新题库
+            self.current_bank_id = worker.bank_id
+            self.current_bank_name = worker.bank_name
+            self.load_question_bank(on_loaded=bank_loaded)
+
         def confirm_import():
+            nonlocal worker
             bank_name = name_var.get().strip()
             if not bank_name:
                 messagebox.showwarning("警告", "请输入题库名称")
                 return
 
-            try:
-                # 读取Excel文件
-                workbook = xlrd.open_workbook(file_path)
-                sheet = workbook.sheet_by_index(0)
-
-                # 创建新题库
-                self.cursor.execute(
-                    "INSERT INTO question_banks (name, created_at, updated_at) VALUES (?, ?, ?)",
-                    (bank_name, datetime.now(), datetime.now())
-                )
-                bank_id = self.cursor.lastrowid
-
-                # 导入题目
-                success_count = 0
-                for i in range(1, sheet.nrows):  # 跳过表头
-                    try:
-                        row = sheet.row_values(i)
-                        if not row[0]:  # 跳过空行
-                            continue
-
-                        # 解析每一行数据
-                        question = {
-                            "bank_id": bank_id,
-                            "content": row[0],  # 试题题干
-                            "type": row[1] if len(row) > 1 else "单选",  # 试题类型
-                            "is_subquestion": 1 if (len(row) > 2 and str(row[2]).lower() in ["true", "1", "是"]) else 0,
-                            "options": "|".join(str(opt).strip() for opt in row[3].split('|')) if (
-                                    len(row) > 3 and row[3]) else "",
-                            "difficulty": row[4] if len(row) > 4 else "中等",
-                            "analysis": row[5] if len(row) > 5 else "",
-                            "answer": row[6] if len(row) > 6 else "",
-                            "score": float(row[7]) if (len(row) > 7 and row[7]) else 0
-                        }
-
-                        # 处理判断题选项
-                        if question["type"] == "判断" and not question["options"]:
-                            question["options"] = "正确|错误"
-
-                        # 插入数据库
-                        self.cursor.execute('''
-                        INSERT INTO questions 
-                        (bank_id, content, type, is_subquestion, options, difficulty, analysis, answer, score)
-                        VALUES (:bank_id, :content, :type, :is_subquestion, :options, :difficulty, :analysis, :answer, :score)
-                        ''', question)
-
-                        success_count += 1
-                    except Exception as e:
-                        print(f"导入第{i + 1}行失败: {str(e)}")
-                        continue
-
-                self.conn.commit()
-
-                # 设置为上次使用的题库
-                self.set_last_used_bank(bank_id)
-
-                # 刷新题库
-                self.current_bank_id = bank_id
-                self.current_bank_name = bank_name
-                self.load_question_bank()
-                self.create_main_interface()
-
-                messagebox.showinfo("成功", f"题库导入完成，共导入 {success_count} 道题")
+            # 在后台线程中读取Excel文件并批量导入题目
+            name_entry.config(state=tk.DISABLED)
+            confirm_btn.config(state=tk.DISABLED)
+            progress_frame.pack(pady=5, before=btn_frame)
+            dialog.geometry("350x240")
+
+            worker = ImportWorker(DB_FILE, bank_name, file_path)
+            worker.start()
+            dialog.after(50, poll_import)
+
+        def cancel_import():
+            if worker is not None and not worker.done:
+                # 取消后由poll_import关闭窗口
+                cancel_btn.config(state=tk.DISABLED)
+                progress_label.config(text="正在取消...")
+                worker.cancel()
+            else:
                 dialog.destroy()
 
-            except sqlite3.Error as e:
-                self.conn.rollback()
-                messagebox.showerror("数据库错误", f"导入失败: {str(e)}")
-            except Exception as e:
-                messagebox.showerror("错误", f"导入失败: {str(e)}")
+        dialog.protocol("WM_DELETE_WINDOW", cancel_import)
 
         btn_frame = tk.Frame(dialog, bg=self.colors["bg"])
         btn_frame.pack(pady=15)
 
-        tk.Button(
+        confirm_btn = tk.Button(
             btn_frame,
             text="确定",
             command=confirm_import,
@@ -923,18 +886,20 @@ class ExamSoftware:
             foreground="white",
             activebackground="#3367d6",
             relief=tk.FLAT
-        ).pack(side=tk.LEFT, padx=5)
+        )
+        confirm_btn.pack(side=tk.LEFT, padx=5)
 
-        tk.Button(
+        cancel_btn = tk.Button(
             btn_frame,
             text="取消",
-            command=dialog.destroy,
+            command=cancel_import,
             width=10,
             bg="#f1f3f4",
             foreground=self.colors["text"],
             activebackground=self.colors["hover"],
             relief=tk.FLAT
-        ).pack(side=tk.LEFT, padx=5)
+        )
+        cancel_btn.pack(side=tk.LEFT, padx=5)
 
     def set_window_icon(self, window):
         """为指定窗口设置图标"""
@@ -966,219 +931,190 @@ class ExamSoftware:
             # 捕获其他可能的异常
             pass
 
-    def load_question_bank(self):
-        """从数据库加载题库"""
+    def load_question_bank(self, on_loaded=None):
+        """
+        在后台从数据库加载题库和错题集
+
+        Args:
+            on_loaded: 加载成功后在界面线程中调用
+        """
         if not self.current_bank_id:
             return
 
+        bank_id = self.current_bank_id
+        self.bank_loading = True
+        # 加载期间内存中仍是旧题库，禁用练习按钮
+        self.update_bank_buttons()
+        start = time.perf_counter()
+
+        def loaded(result):
+            self.on_bank_loaded(bank_id, result, on_loaded)
+            # 从提交请求到重建索引完成，数据库部分另记为db.load_bank
+            record("load_question_bank", start)
+
+        self.db_worker.submit(
+            bank_store.load_bank, bank_id,
+            callback=loaded,
+            errback=lambda error: self.on_bank_load_failed(bank_id, error, on_loaded)
+        )
+
+    def on_bank_loaded(self, bank_id, result, on_loaded=None):
+        """题库加载完成，在界面线程中重建索引"""
+        # 加载期间已切换到其他题库
+        if bank_id != self.current_bank_id:
+            return
+
+        questions, wrong_questions = result
+        self.question_bank = questions
+
+        # 题库变化时重建索引，并与数据库同步错题集
+        self.question_index = QuestionIndex(self.question_bank)
+        self.wrong_questions = WrongSet(wrong_questions)
+
+        self.bank_loading = False
+        self.update_bank_buttons()
+        if on_loaded is not None:
+            on_loaded()
+
+    def on_bank_load_failed(self, bank_id, error, on_loaded=None):
+        """题库加载失败"""
+        if bank_id != self.current_bank_id:
+            return
+
         self.question_bank = []
-        try:
-            self.cursor.execute(
-                "SELECT id, content, type, is_subquestion, options, difficulty, analysis, answer, score "
-                "FROM questions WHERE bank_id = ? ORDER BY id",
-                (self.current_bank_id,)
-            )
-
-            for row in self.cursor.fetchall():
-                question = {
-                    "id": row[0],
-                    "content": row[1],
-                    "type": row[2],
-                    "is_subquestion": row[3],
-                    "options": row[4].split('|') if row[4] else [],
-                    "difficulty": row[5],
-                    "analysis": row[6],
-                    "answer": row[7],
-                    "score": row[8]
-                }
-
-                # 处理判断题选项
-                if question["type"] == "判断" and not question["options"]:
-                    question["options"] = ["正确", "错误"]
-
-                self.question_bank.append(question)
-        except sqlite3.Error as e:
-            messagebox.showerror("数据库错误", f"加载题库失败: {str(e)}")
-            self.question_bank = []
+        self.question_index = QuestionIndex()
+        self.wrong_questions = WrongSet()
+
+        self.bank_loading = False
+        self.update_bank_buttons()
+        if on_loaded is not None:
+            on_loaded()
+        messagebox.showerror("数据库错误", f"加载题库失败: {str(error)}")
+
+    def bank_status_text(self):
+        """主界面底部的题库状态"""
+        if self.bank_loading:
+            return "正在加载题库..."
+        if not self.question_bank:
+            return "请先从Excel导入题库"
+        return f"已加载题库: {self.current_bank_name}，共 {len(self.question_bank)} 道题"
+
+    def update_bank_buttons(self):
+        """题库加载状态变化后，更新主界面上的按钮和状态，不重建界面"""
+        if not self.bank_buttons or not self.bank_buttons[0].winfo_exists():
+            return
+
+        state = tk.NORMAL if self.question_bank and not self.bank_loading else tk.DISABLED
+        for button in self.bank_buttons:
+            button.config(state=state)
+        self.status_label.config(text=self.bank_status_text())
 
     def start_practice(self, mode):
-        """开始练习"""
+        """开始练习，在后台读取答题进度、上次位置和题目顺序"""
+        if self.bank_loading:
+            return
         if not self.question_bank:
             messagebox.showwarning("警告", "请先加载题库")
             return
 
-        self.mode = mode
-        self.current_index = 0
+        # 先写入缓存的答案和位置，后台线程按提交顺序执行，之后的读取能读到它们
+        self.flush_answers()
 
-        # 从数据库中加载用户答案
-        self.user_answers = {}
-        try:
-            self.cursor.execute(
-                "SELECT question_id, user_answer FROM progress "
-                "WHERE bank_id = ? AND mode = ?",
-                (self.current_bank_id, mode)
-            )
+        def load_failed(error):
+            messagebox.showerror("数据库错误", f"加载答题进度失败: {str(error)}")
+            self.show_practice(bank_id, mode, {}, None, None)
 
-            for row in self.cursor.fetchall():
-                self.user_answers[row[0]] = row[1]
-        except sqlite3.Error as e:
-            messagebox.showerror("数据库错误", f"加载答题进度失败: {str(e)}")
-            self.user_answers = {}
+        bank_id = self.current_bank_id
+        self.db_worker.submit(
+            bank_store.load_practice_state, bank_id, mode,
+            callback=lambda state: self.show_practice(bank_id, mode, *state),
+            errback=load_failed
+        )
 
-        # 根据模式选择题目顺序
-        if mode == "sequence":
-            # 按题型分组排序：单选题、多选题、判断题
-            single_questions = [q for q in self.question_bank if q["type"] == "单选"]
-            multiple_questions = [q for q in self.question_bank if q["type"] == "多选"]
-            judge_questions = [q for q in self.question_bank if q["type"] == "判断"]
+    def show_practice(self, bank_id, mode, user_answers, last_index, saved_order):
+        """读取完成后按模式确定题目顺序并显示题目"""
+        # 读取期间已切换到其他题库
+        if bank_id != self.current_bank_id:
+            return
 
-            # 按ID排序每种题型内的题目
-            single_questions.sort(key=lambda q: q["id"])
-            multiple_questions.sort(key=lambda q: q["id"])
-            judge_questions.sort(key=lambda q: q["id"])
+        # 随机练习有可用的保存顺序时，询问用户是否需要重新打乱顺序
+        reshuffle = True
+        if mode == RANDOM and can_resume_order(self.question_index, saved_order):
+            reshuffle = messagebox.askyesno("随机练习",
+                                            "是否需要重新打乱题目顺序？\n选择“是”将重新打乱题目顺序，选择“否”将保持上次的顺序。")
 
-            # 按顺序组合题目
-            self.current_questions = single_questions + multiple_questions + judge_questions
+        # 根据模式确定题目顺序，重新打乱顺序时从第一题开始，否则从上次练习位置开始
+        questions, reshuffled = practice_order(self.question_index, mode, saved_order, reshuffle)
+        self.session = PracticeSession(bank_id, mode, questions, user_answers, None if reshuffled else last_index)
 
-            # 保存题目顺序
+        # 保存题目顺序
+        if mode == SEQUENCE or reshuffled:
             self.save_question_order(mode)
 
-            # 加载上次练习位置
-            try:
-                self.cursor.execute(
-                    "SELECT value FROM config WHERE key = ?",
-                    (f"last_position_{mode}_{self.current_bank_id}",)
-                )
-                result = self.cursor.fetchone()
-                if result:
-                    last_index = int(result[0])
-                    if 0 <= last_index < len(self.current_questions):
-                        self.current_index = last_index
-            except sqlite3.Error as e:
-                print(f"加载上次练习位置失败: {str(e)}")
-
-        elif mode == "random":
-            # 检查是否已有保存的随机顺序
-            try:
-                self.cursor.execute(
-                    "SELECT question_id FROM question_orders "
-                    "WHERE bank_id = ? AND mode = ? ORDER BY position",
-                    (self.current_bank_id, mode)
-                )
-
-                saved_order = [row[0] for row in self.cursor.fetchall()]
-
-                # 检查是否是第一次使用随机练习
-                is_first_time = not (saved_order and len(saved_order) == len(self.question_bank))
-
-                need_shuffle = True
-                if not is_first_time:
-                    # 如果不是第一次，询问用户是否需要重新打乱顺序
-                    result = messagebox.askyesno("随机练习",
-                                                 "是否需要重新打乱题目顺序？\n选择“是”将重新打乱题目顺序，选择“否”将保持上次的顺序。")
-                    need_shuffle = result
-
-                if need_shuffle or is_first_time:
-                    # 按题型分组并分别随机排序
-                    single_questions = [q for q in self.question_bank if q["type"] == "单选"]
-                    multiple_questions = [q for q in self.question_bank if q["type"] == "多选"]
-                    judge_questions = [q for q in self.question_bank if q["type"] == "判断"]
-
-                    # 分别打乱各题型
-                    random.shuffle(single_questions)
-                    random.shuffle(multiple_questions)
-                    random.shuffle(judge_questions)
-
-                    # 按顺序组合
-                    self.current_questions = single_questions + multiple_questions + judge_questions
-                    self.save_question_order(mode)
-                    # 如果是重新打乱顺序，则从第一题开始
-                    self.current_index = 0
-                else:
-                    # 使用保存的顺序
-                    self.current_questions = []
-                    for qid in saved_order:
-                        for q in self.question_bank:
-                            if q["id"] == qid:
-                                self.current_questions.append(q)
-                                break
-            except sqlite3.Error as e:
-                messagebox.showerror("数据库错误", f"加载题目顺序失败: {str(e)}")
-                # 如果出错，使用默认随机排序
-                single_questions = [q for q in self.question_bank if q["type"] == "单选"]
-                multiple_questions = [q for q in self.question_bank if q["type"] == "多选"]
-                judge_questions = [q for q in self.question_bank if q["type"] == "判断"]
-
-                random.shuffle(single_questions)
-                random.shuffle(multiple_questions)
-                random.shuffle(judge_questions)
-
-                self.current_questions = single_questions + multiple_questions + judge_questions
-                self.save_question_order(mode)
-
-            # 加载上次练习位置（仅在使用保存的顺序时）
-            if not is_first_time and not need_shuffle:
-                try:
-                    self.cursor.execute(
-                        "SELECT value FROM config WHERE key = ?",
-                        (f"last_position_{mode}_{self.current_bank_id}",)
-                    )
-                    result = self.cursor.fetchone()
-                    if result:
-                        last_index = int(result[0])
-                        if 0 <= last_index < len(self.current_questions):
-                            self.current_index = last_index
-                except sqlite3.Error as e:
-                    print(f"加载上次练习位置失败: {str(e)}")
-
         # 显示题目
         self.init_question_interface()
         self.update_question_display()
         self.update_progress_display()
 
+    @traced()
     def save_question_order(self, mode):
-        """保存题目的顺序到数据库"""
-        if not self.current_bank_id or not self.current_questions:
+        """在后台保存题目的顺序到数据库，顺序没有变化时不写入"""
+        if not self.current_bank_id or not self.session.questions:
             return
 
-        try:
-            # 先删除该模式下已有的顺序
-            self.cursor.execute(
-                "DELETE FROM question_orders WHERE bank_id = ? AND mode = ?",
-                (self.current_bank_id, mode)
-            )
-
-            # 插入新的顺序
-            for position, question in enumerate(self.current_questions):
-                self.cursor.execute(
-                    "INSERT INTO question_orders (bank_id, mode, position, question_id) "
-                    "VALUES (?, ?, ?, ?)",
-                    (self.current_bank_id, mode, position, question["id"])
-                )
-
-            self.conn.commit()
-        except sqlite3.Error as e:
-            self.conn.rollback()
-            messagebox.showerror("数据库错误", f"保存题目顺序失败: {str(e)}")
+        question_ids = self.session.question_ids()
+        self.db_worker.submit(
+            save_order, self.current_bank_id, mode, question_ids,
+            errback=lambda e: messagebox.showerror("数据库错误", f"保存题目顺序失败: {str(e)}")
+        )
 
     def save_current_position(self):
         """保存当前练习位置"""
-        if not self.current_bank_id or not self.mode:
+        if not self.current_bank_id or not self.session.mode:
             return
 
+        # 写入答题日志，随答案一起刷新到数据库
+        self.answer_journal.record_config(self.session.position_key, str(self.session.current_index))
+
+    def flush_answers(self):
+        """将答题日志中缓存的答案和练习位置交给后台线程写入数据库"""
+        batch = self.answer_journal.take()
+        if batch is None:
+            return
+
+        def write_failed(error):
+            # 放回答题日志，下次刷新时重试
+            self.answer_journal.restore(batch)
+            print(f"保存答题记录失败: {str(error)}")
+
+        self.db_worker.submit(write_batch, batch, errback=write_failed)
+
+    def periodic_flush_answers(self):
+        """定时刷新答题日志，保证异常退出时最多丢失FLUSH_INTERVAL秒内的答案"""
+        self.flush_answers()
+        self.root.after(FLUSH_INTERVAL * 1000, self.periodic_flush_answers)
+
+    def on_close(self):
+        """关闭窗口前写入未保存的答案"""
+        # 等待后台线程执行完已提交的请求，写入失败的答案会放回答题日志
+        self.flush_answers()
+        self.db_worker.close()
+
         try:
-            key = f"last_position_{self.mode}_{self.current_bank_id}"
-            self.cursor.execute(
-                "INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)",
-                (key, str(self.current_index))
-            )
-            self.conn.commit()
+            self.answer_journal.flush()
         except sqlite3.Error as e:
-            self.conn.rollback()
-            print(f"保存当前位置失败: {str(e)}")
+            print(f"保存答题记录失败: {str(e)}")
+            if not messagebox.askyesno("数据库错误", "部分答题记录保存失败，仍然要退出吗？"):
+                # 不退出时重新启动后台数据库线程
+                self.db_worker = DatabaseWorker(DB_FILE, self.root)
+                return
+        self.conn.close()
+        self.root.destroy()
 
     def create_exam(self):
         """创建组合试卷 - 美化版"""
+        if self.bank_loading:
+            return
         if not self.question_bank:
             messagebox.showwarning("警告", "请先加载题库")
             return
@@ -1212,9 +1148,9 @@ class ExamSoftware:
         ).pack(pady=8)
 
         # 统计各题型数量
-        total_single = sum(1 for q in self.question_bank if q["type"] == "单选")
-        total_multiple = sum(1 for q in self.question_bank if q["type"] == "多选")
-        total_judge = sum(1 for q in self.question_bank if q["type"] == "判断")
+        total_single = self.question_index.count("单选")
+        total_multiple = self.question_index.count("多选")
+        total_judge = self.question_index.count("判断")
 
         # 配置选项
         ttk.Label(
@@ -1304,34 +1240,15 @@ class ExamSoftware:
             self.exam_config['judge'] = judge_count
             self.save_exam_config()
 
-            # 生成试卷 - 按题型顺序添加题目
-            self.current_questions = []
-
-            # 添加单选题
-            single_questions = [q for q in self.question_bank if q["type"] == "单选"]
-            self.current_questions.extend(random.sample(single_questions, single_count) if single_count > 0 else [])
-
-            # 添加多选题
-            multiple_questions = [q for q in self.question_bank if q["type"] == "多选"]
-            self.current_questions.extend(
-                random.sample(multiple_questions, multiple_count) if multiple_count > 0 else [])
-
-            # 添加判断题
-            judge_questions = [q for q in self.question_bank if q["type"] == "判断"]
-            self.current_questions.extend(random.sample(judge_questions, judge_count) if judge_count > 0 else [])
-
-            self.mode = "exam"
-            self.current_index = 0
-            self.user_answers = {}
+            # 生成试卷 - 按题型顺序随机抽题
+            try:
+                exam_questions = build_exam(self.question_index, self.exam_config)
+            except ValueError:
+                messagebox.showwarning("警告", "题目数量超过题库中的题目数")
+                return
 
-            # 初始化考试结果
-            self.exam_results = {
-                "total": len(self.current_questions),
-                "correct": 0,
-                "wrong": 0,
-                "scores": 0,
-                "total_scores": sum(float(q["score"]) for q in self.current_questions)
-            }
+            self.session = PracticeSession(self.current_bank_id, EXAM, exam_questions)
+            self.exam_results = {}
 
             config_window.destroy()
             self.init_question_interface()
@@ -1368,9 +1285,6 @@ class ExamSoftware:
         for widget in self.root.winfo_children():
             widget.destroy()
 
-        # 获取字体大小设置
-        font_size = self.current_font_size  # 使用类属性而不是查询数据库
-
         # 顶部标题栏
         header_frame = tk.Frame(self.root, bg=self.colors["primary"], height=50)
         header_frame.pack(fill=tk.X)
@@ -1379,7 +1293,7 @@ class ExamSoftware:
         title_label = ttk.Label(
             header_frame,
             text="题刷刷",
-            font=(self.font_family, font_size + 4, "bold"),
+            font=self.fonts.heading,
             background=self.colors["primary"],
             foreground="white"
         )
@@ -1405,25 +1319,21 @@ class ExamSoftware:
         ttk.Label(
             progress_frame,
             text="答题进度",
-            font=(self.font_family, font_size + 2, "bold"),
+            font=self.fonts.section,
             background=self.colors["card"]
         ).pack(pady=10)
 
-        # 创建滚动区域
+        # 创建滚动区域，进度方框直接绘制在画布上
         self.progress_canvas = tk.Canvas(progress_frame, bg=self.colors["card"], highlightthickness=0)
-        scrollbar = ttk.Scrollbar(progress_frame, orient="vertical", command=self.progress_canvas.yview)
-        self.progress_scrollable_frame = tk.Frame(self.progress_canvas, bg=self.colors["card"])
-
-        # 绑定滚动事件
-        self.progress_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.progress_canvas.configure(scrollregion=self.progress_canvas.bbox("all"))
+        scrollbar = ttk.Scrollbar(progress_frame, orient="vertical")
+        self.progress_grid = ProgressGrid(
+            self.progress_canvas,
+            scrollbar,
+            self.fonts,
+            self.colors,
+            on_select=self.jump_to_question
         )
 
-        # 创建窗口并关联滚动条
-        self.progress_canvas.create_window((0, 0), window=self.progress_scrollable_frame, anchor="nw")
-        self.progress_canvas.configure(yscrollcommand=scrollbar.set)
-
         # 添加鼠标滚轮支持
         self.progress_canvas.bind_all("<MouseWheel>", lambda e: self._on_mouse_wheel(e, self.progress_canvas))
 
@@ -1431,16 +1341,6 @@ class ExamSoftware:
         self.progress_canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
-        # 存储进度区域的框架，用于后续更新
-        self.progress_frames = {
-            "container": progress_frame,
-            "single": None,
-            "multiple": None,
-            "judge": None,
-            "canvas": self.progress_canvas,
-            "scrollable": self.progress_scrollable_frame
-        }
-
         # 右侧：题目内容容器
         content_container = tk.Frame(main_container, bg=self.colors["bg"])
         content_container.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -1458,7 +1358,7 @@ class ExamSoftware:
             padx=5,
             relief=tk.FLAT,
             cursor="hand2",
-            font=(self.font_family, font_size)
+            font=self.fonts.base
         ).pack(side=tk.LEFT, padx=10, pady=8)
 
         # 题目信息区域（用于后续更新）
@@ -1487,12 +1387,21 @@ class ExamSoftware:
         self.content_canvas.pack(side="left", fill="both", expand=True)
         content_scrollbar.pack(side="right", fill="y")
 
+        # 题目视图，控件在切换题目时复用
+        self.question_view = QuestionView(
+            self.content_frame,
+            self.info_frame,
+            self.fonts,
+            self.colors,
+            on_answer=self.auto_save_answer
+        )
+
         # 解析区域（用于后续更新）
         self.analysis_frame = tk.Frame(content_container, bg=self.colors["bg"])
         self.analysis_label = ttk.Label(
             self.analysis_frame,
             text="",
-            font=(self.font_family, font_size + 1),
+            font=self.fonts.option,
             wraplength=700,
             justify=tk.LEFT,
             foreground=self.colors["primary"],
@@ -1514,7 +1423,7 @@ class ExamSoftware:
             activebackground=self.colors["hover"],
             relief=tk.FLAT,
             cursor="hand2",
-            font=(self.font_family, font_size)
+            font=self.fonts.base
         )
         self.prev_btn.pack(side=tk.LEFT, padx=10)
 
@@ -1528,7 +1437,7 @@ class ExamSoftware:
             activebackground="#3367d6",
             relief=tk.FLAT,
             cursor="hand2",
-            font=(self.font_family, font_size)
+            font=self.fonts.base
         )
         self.submit_btn.pack(side=tk.LEFT, padx=10)
 
@@ -1541,7 +1450,7 @@ class ExamSoftware:
             activebackground=self.colors["hover"],
             relief=tk.FLAT,
             cursor="hand2",
-            font=(self.font_family, font_size)
+            font=self.fonts.base
         )
         self.next_btn.pack(side=tk.LEFT, padx=10)
 
@@ -1555,7 +1464,7 @@ class ExamSoftware:
             activebackground="#f9a825",
             relief=tk.FLAT,
             cursor="hand2",
-            font=(self.font_family, font_size)
+            font=self.fonts.base
         )
         self.mark_btn.pack(side=tk.RIGHT, padx=10)
 
@@ -1565,260 +1474,39 @@ class ExamSoftware:
         if canvas.winfo_containing(event.x_root, event.y_root) == canvas:
             canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
 
+    @traced()
     def update_progress_display(self):
         """更新进度区域显示，实现连续编号逻辑，并且题型下第一个方框顶格显示"""
-        # 清除现有进度框
-        for widget in self.progress_frames["scrollable"].winfo_children():
-            widget.destroy()
-
-        # 重置索引映射
-        self.question_index_map = {}
-
-        # 按题型分组
-        single_questions = [q for q in self.current_questions if q["type"] == "单选"]
-        multiple_questions = [q for q in self.current_questions if q["type"] == "多选"]
-        judge_questions = [q for q in self.current_questions if q["type"] == "判断"]
-
-        # 计算起始编号
-        single_start = 1
-        multiple_start = single_start + len(single_questions)
-        judge_start = multiple_start + len(multiple_questions)
-
-        # 1. 单选题进度
-        if single_questions:
-            ttk.Label(
-                self.progress_frames["scrollable"],
-                text="单选题",
-                font=(self.font_family, 10, "bold"),
-                background=self.colors["card"]
-            ).pack(anchor=tk.W, padx=10, pady=5)
-
-            single_frame = tk.Frame(self.progress_frames["scrollable"], bg=self.colors["card"])
-            single_frame.pack(fill=tk.X, padx=10, pady=5)
-            self.progress_frames["single"] = single_frame
-
-            # 为单选题创建进度框 - 从第一列开始，不留空位
-            for i, q in enumerate(single_questions):
-                # 找到在当前题目列表中的实际索引
-                actual_index = self.current_questions.index(q)
-                # 计算显示的编号
-                display_number = single_start + i
-                # 创建进度框并记录映射关系
-                box_id = f"single_{i}"
-                self.question_index_map[box_id] = actual_index
-                self.create_progress_box(single_frame, display_number, q["id"], box_id, i)
-
-        # 2. 多选题进度
-        if multiple_questions:
-            ttk.Label(
-                self.progress_frames["scrollable"],
-                text="多选题",
-                font=(self.font_family, 10, "bold"),
-                background=self.colors["card"]
-            ).pack(anchor=tk.W, padx=10, pady=5)
-
-            multiple_frame = tk.Frame(self.progress_frames["scrollable"], bg=self.colors["card"])
-            multiple_frame.pack(fill=tk.X, padx=10, pady=5)
-            self.progress_frames["multiple"] = multiple_frame
-
-            # 为多选题创建进度框 - 从第一列开始，不留空位
-            for i, q in enumerate(multiple_questions):
-                # 找到在当前题目列表中的实际索引
-                actual_index = self.current_questions.index(q)
-                # 计算显示的编号
-                display_number = multiple_start + i
-                # 创建进度框并记录映射关系
-                box_id = f"multiple_{i}"
-                self.question_index_map[box_id] = actual_index
-                self.create_progress_box(multiple_frame, display_number, q["id"], box_id, i)
-
-        # 3. 判断题进度
-        if judge_questions:
-            ttk.Label(
-                self.progress_frames["scrollable"],
-                text="判断题",
-                font=(self.font_family, 10, "bold"),
-                background=self.colors["card"]
-            ).pack(anchor=tk.W, padx=10, pady=5)
-
-            judge_frame = tk.Frame(self.progress_frames["scrollable"], bg=self.colors["card"])
-            judge_frame.pack(fill=tk.X, padx=10, pady=5)
-            self.progress_frames["judge"] = judge_frame
-
-            # 为判断题创建进度框 - 从第一列开始，不留空位
-            for i, q in enumerate(judge_questions):
-                # 找到在当前题目列表中的实际索引
-                actual_index = self.current_questions.index(q)
-                # 计算显示的编号
-                display_number = judge_start + i
-                # 创建进度框并记录映射关系
-                box_id = f"judge_{i}"
-                self.question_index_map[box_id] = actual_index
-                self.create_progress_box(judge_frame, display_number, q["id"], box_id, i)
-
-        # 更新滚动区域
-        self.progress_frames["canvas"].update_idletasks()
-        self.progress_frames["canvas"].configure(scrollregion=self.progress_frames["canvas"].bbox("all"))
+        self.progress_grid.set_questions(
+            self.session.numbering,
+            self.session.is_answered,
+            self.session.current_index
+        )
 
+    @traced()
     def update_question_display(self):
         """更新题目内容显示，实现连续编号显示，并添加答题状态"""
         # 保存当前位置
         self.save_current_position()
 
-        # 使用类属性而不是查询数据库
-        font_size = self.current_font_size
-
-        # 清除内容区域现有控件
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
-
-        # 清除信息区域现有控件
-        for widget in self.info_frame.winfo_children():
-            widget.destroy()
-
         # 隐藏解析区域
         self.analysis_frame.pack_forget()
 
         # 获取当前题目
-        question = self.current_questions[self.current_index]
-
-        # 计算当前题目的全局编号
-        single_count = sum(1 for q in self.current_questions[:self.current_index + 1] if q["type"] == "单选")
-        multiple_count = sum(1 for q in self.current_questions[:self.current_index + 1] if q["type"] == "多选")
-        judge_count = sum(1 for q in self.current_questions[:self.current_index + 1] if q["type"] == "判断")
-
-        # 计算当前题目的显示编号
-        if question["type"] == "单选":
-            display_number = single_count
-        elif question["type"] == "多选":
-            display_number = sum(1 for q in self.current_questions if q["type"] == "单选") + multiple_count
-        else:  # 判断
-            display_number = sum(1 for q in self.current_questions if q["type"] in ["单选", "多选"]) + judge_count
-
-        # 添加答题状态 - 未答/已答
-        is_answered = question["id"] in self.user_answers and self.user_answers[question["id"]]
-        status_text = "已答" if is_answered else "未答"
-        status_color = self.colors["success"] if is_answered else self.colors["danger"]
-
-        # 更新题目信息 - 包含答题状态
-        status_label = ttk.Label(
-            self.info_frame,
-            text=status_text,
-            font=(self.font_family, font_size, "bold"),
-            foreground=status_color,
-            background=self.colors["card"]
+        session = self.session
+        question = session.current_question
+
+        # 复用题目视图，只更新文字、选项和答题状态
+        self.question_view.show(
+            question,
+            session.user_answers.get(question.id),
+            session.numbering.number(session.current_index),
+            len(session)
         )
-        status_label.pack(side=tk.LEFT, padx=10)
-
-        ttk.Label(
-            self.info_frame,
-            text=f"题型: {question['type']}",
-            font=(self.font_family, font_size),
-            background=self.colors["card"]
-        ).pack(side=tk.LEFT, padx=10)
-
-        ttk.Label(
-            self.info_frame,
-            text=f"难度: {question['difficulty']}",
-            font=(self.font_family, font_size),
-            background=self.colors["card"]
-        ).pack(side=tk.LEFT, padx=10)
-
-        ttk.Label(
-            self.info_frame,
-            text=f"分数: {question['score']}",
-            font=(self.font_family, font_size),
-            background=self.colors["card"]
-        ).pack(side=tk.LEFT, padx=10)
-
-        ttk.Label(
-            self.info_frame,
-            text=f"第 {display_number}/{len(self.current_questions)} 题",
-            font=(self.font_family, font_size),
-            background=self.colors["card"]
-        ).pack(side=tk.LEFT, padx=10)
-
-        # 题目内容
-        content_frame = tk.Frame(self.content_frame, bg=self.colors["card"], bd=1, relief=tk.SOLID, padx=15, pady=15)
-        content_frame.pack(fill=tk.X, pady=10)
-
-        ttk.Label(
-            content_frame,
-            text=f"题目: {question['content']}",
-            font=(self.font_family, font_size + 2),
-            wraplength=700,
-            justify=tk.LEFT,
-            background=self.colors["card"]
-        ).pack(anchor=tk.W, pady=10)
-
-        # 选项框架
-        options_frame = tk.Frame(content_frame, bg=self.colors["card"])
-        options_frame.pack(fill=tk.BOTH, expand=True, anchor=tk.W, pady=10)
-
-        # 存储用户选择的变量
-        self.var = tk.StringVar(value="")  # 初始化为空，确保不选中任何选项
-        self.check_vars = []
-
-        # 根据题型显示不同的选项
-        if question["type"] in ["单选", "判断"]:
-            # 单选题或判断题，使用Radiobutton
-            for i, option in enumerate(question["options"]):
-                # 对于判断题，选项显示为"正确"和"错误"
-                if question["type"] == "判断":
-                    display_text = option
-                    value = option
-                else:
-                    display_text = f"{chr(65 + i)}. {option}"
-                    value = chr(65 + i)
-
-                # 创建单选按钮，并绑定选择事件
-                rb = tk.Radiobutton(
-                    options_frame,
-                    text=display_text,
-                    variable=self.var,
-                    value=value,
-                    font=(self.font_family, font_size + 1),
-                    anchor=tk.W,
-                    bg=self.colors["card"],
-                    command=lambda q=question: self.auto_save_answer(q),
-                    cursor="hand2"
-                )
-                rb.pack(fill=tk.X, pady=5, padx=5)
-
-                # 如果用户之前回答过这道题，恢复选择
-                if question["id"] in self.user_answers:
-                    self.var.set(self.user_answers[question["id"]])
-                else:
-                    # 确保新题目没有默认选中
-                    self.var.set("")
-        elif question["type"] == "多选":
-            # 多选题，使用Checkbutton
-            self.check_vars = []
-            for i, option in enumerate(question["options"]):
-                var = tk.BooleanVar()
-                self.check_vars.append((chr(65 + i), var))
-                # 创建复选按钮，并绑定选择事件
-                cb = tk.Checkbutton(
-                    options_frame,
-                    text=f"{chr(65 + i)}. {option}",
-                    variable=var,
-                    font=(self.font_family, font_size + 1),
-                    anchor=tk.W,
-                    bg=self.colors["card"],
-                    command=lambda q=question: self.auto_save_answer(q),
-                    cursor="hand2"
-                )
-                cb.pack(fill=tk.X, pady=5, padx=5)
-
-            # 如果用户之前回答过这道题，恢复选择
-            if question["id"] in self.user_answers:
-                user_answer = self.user_answers[question["id"]]
-                for char, var in self.check_vars:
-                    var.set(char in user_answer)
 
         # 更新按钮状态
-        self.prev_btn.config(state=tk.NORMAL if self.current_index > 0 else tk.DISABLED)
-        if self.current_index == len(self.current_questions) - 1 and self.mode == "exam":
+        self.prev_btn.config(state=tk.DISABLED if session.is_first() else tk.NORMAL)
+        if session.is_last() and session.mode == EXAM:
             self.next_btn.config(text="交卷", command=self.submit_exam)
         else:
             self.next_btn.config(text="下一题", command=self.next_question)
@@ -1827,245 +1515,83 @@ class ExamSoftware:
         self.submit_btn.config(command=lambda: self.submit_answer_and_view_analysis(question))
         self.mark_btn.config(command=lambda: self.mark_as_wrong(question))
 
-        # 更新按钮字体
-        self.prev_btn.config(font=(self.font_family, font_size))
-        self.submit_btn.config(font=(self.font_family, font_size))
-        self.next_btn.config(font=(self.font_family, font_size))
-        self.mark_btn.config(font=(self.font_family, font_size))
-
         # 更新进度框高亮状态
-        self.highlight_current_progress_box()
-
-    def create_progress_box(self, parent, display_number, question_id, box_id, index):
-        """创建答题进度方框，按题型分组显示并支持点击跳转，从第一列开始"""
-        # 确定方框颜色
-        bg_color = self.colors["success"] if question_id in self.user_answers else self.colors["card"]
-        fg_color = "white" if question_id in self.user_answers else self.colors["text"]
-
-        # 使用类属性而不是查询数据库
-        font_size = self.current_font_size
-
-        # 根据字体大小动态计算方框大小，确保数字能完整显示
-        box_size = max(28, font_size * 3)  # 最小28像素，随着字体增大而增大
-
-        box_frame = tk.Frame(
-            parent,
-            width=box_size,
-            height=box_size,
-            bd=2,
-            relief=tk.SOLID,
-            bg=bg_color,
-            highlightthickness=0,
-            cursor="hand2"
-        )
-
-        # 添加点击事件，允许通过点击进度框跳转到对应题目
-        # 使用lambda函数确保每次绑定都使用当前的box_id值
-        def on_click(event, bid=box_id):
-            self.jump_to_question_by_box_id(bid)
-
-        box_frame.bind("<Button-1>", on_click)
-
-        # 添加悬停效果
-        box_frame.bind("<Enter>",
-                       lambda e: e.widget.configure(relief=tk.RAISED) if e.widget["relief"] != tk.RAISED else None)
-        box_frame.bind("<Leave>", lambda e: e.widget.configure(relief=tk.SOLID) if self.question_index_map.get(
-            getattr(e.widget, 'box_id', ''), -1) != self.current_index else None)
-
-        # 存储box_id以便后续引用
-        box_frame.box_id = box_id
-        # 显示全局编号
-        box_label = ttk.Label(
-            box_frame,
-            text=str(display_number),
-            font=(self.font_family, max(8, font_size - 2)),  # 标签字体大小也根据设置调整，但不小于8
-            background=bg_color,
-            foreground=fg_color
-        )
-        box_label.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
-
-        # 为标签绑定相同的点击事件
-        box_label.bind("<Button-1>", lambda e, bid=box_id: self.jump_to_question_by_box_id(bid))
-
-        # 存储方框引用，便于后续更新高亮状态
-        self.progress_frames[box_id] = box_frame
-
-        # 按题型内顺序排列，每行显示5个，从第一列开始（index % 5确保从0开始）
-        box_frame.grid(row=index // 5, column=index % 5, padx=3, pady=3)
-        box_frame.grid_propagate(False)
-
-        return box_frame
-
-    def highlight_current_progress_box(self):
-        """高亮显示当前题目的进度框"""
-        # 重置所有进度框的边框
-        for box_id, frame in self.progress_frames.items():
-            if box_id in ["container", "single", "multiple", "judge", "canvas", "scrollable"]:
-                continue
-            if self.question_index_map.get(box_id, -1) == self.current_index:
-                frame.configure(bd=3, relief=tk.RAISED)
-            else:
-                frame.configure(bd=2, relief=tk.SOLID)
-
-    def jump_to_question_by_box_id(self, box_id):
-        """通过进度框ID跳转到对应的题目"""
-        # 验证box_id是否有效
-        if box_id not in self.question_index_map:
-            print(f"无效的box_id: {box_id}")
-            return
-
-        target_index = self.question_index_map[box_id]
-
-        # 验证目标索引是否有效
-        if target_index < 0 or target_index >= len(self.current_questions):
-            print(f"无效的目标索引: {target_index}")
-            return
-
-        # 跳转到目标题目
-        self.current_index = target_index
-        self.update_question_display()
+        self.progress_grid.set_current(self.session.current_index)
 
     def jump_to_question(self, index):
         """跳转到指定索引的题目"""
-        self.current_index = index
+        self.session.current_index = index
         self.update_question_display()
+        self.flush_answers()
 
     def get_user_answer(self, question_type):
         """获取用户答案"""
-        if question_type in ["单选", "判断"]:
-            return self.var.get()
-        elif question_type == "多选":
-            return "".join([char for char, var in self.check_vars if var.get()])
-        return ""
+        return self.question_view.get_answer(question_type)
 
+    @traced()
     def auto_save_answer(self, question):
-        """自动保存用户答案到数据库"""
-        user_answer = self.get_user_answer(question["type"])
+        """自动保存用户答案，先写入答题日志，稍后统一写入数据库"""
+        user_answer = self.get_user_answer(question.type)
         if user_answer:  # 只有当有答案时才保存
-            self.user_answers[question["id"]] = user_answer
+            self.session.record_answer(question.id, user_answer)
 
-            try:
-                # 插入或更新答题记录
-                self.cursor.execute('''
-                INSERT OR REPLACE INTO progress 
-                (bank_id, mode, question_id, user_answer, answered_at)
-                VALUES (?, ?, ?, ?, ?)
-                ''', (self.current_bank_id, self.mode, question["id"], user_answer, datetime.now()))
-                self.conn.commit()
-
-                # 只更新对应进度框的颜色，不刷新整个进度区
-                for box_id, idx in self.question_index_map.items():
-                    if idx == self.current_index and box_id in self.progress_frames:
-                        frame = self.progress_frames[box_id]
-                        frame.configure(bg=self.colors["success"])
-                        # 更新标签背景色和前景色
-                        for widget in frame.winfo_children():
-                            if isinstance(widget, ttk.Label):
-                                widget.configure(background=self.colors["success"], foreground="white")
-
-                # 更新答题状态
-                for widget in self.info_frame.winfo_children():
-                    if isinstance(widget, ttk.Label) and widget["text"] in ["未答", "已答"]:
-                        widget["text"] = "已答"
-                        widget["foreground"] = self.colors["success"]
-
-            except sqlite3.Error as e:
-                self.conn.rollback()
-                messagebox.showerror("数据库错误", f"保存答案失败: {str(e)}")
+            # 记录到答题日志，由定时器或翻题时统一写入数据库
+            self.answer_journal.record_answer(self.current_bank_id, self.session.mode, question.id, user_answer)
+
+            # 只更新对应进度框的颜色，不刷新整个进度区
+            self.progress_grid.mark_answered(self.session.current_index)
+
+            # 更新答题状态
+            self.question_view.set_answered(True)
 
     def submit_answer_and_view_analysis(self, question):
         """查看解析"""
-        user_answer = self.get_user_answer(question["type"])
+        user_answer = self.get_user_answer(question.type)
 
         if not user_answer:
             messagebox.showwarning("警告", "请选择答案后再提交")
             return
 
         # 保存用户答案
-        self.user_answers[question["id"]] = user_answer
-
-        try:
-            # 插入或更新答题记录
-            self.cursor.execute('''
-            INSERT OR REPLACE INTO progress 
-            (bank_id, mode, question_id, user_answer, answered_at)
-            VALUES (?, ?, ?, ?, ?)
-            ''', (self.current_bank_id, self.mode, question["id"], user_answer, datetime.now()))
-            self.conn.commit()
-        except sqlite3.Error as e:
-            self.conn.rollback()
-            messagebox.showerror("数据库错误", f"查看解析失败: {str(e)}")
+        self.session.record_answer(question.id, user_answer)
+        self.answer_journal.record_answer(self.current_bank_id, self.session.mode, question.id, user_answer)
 
         # 显示解析区域
         self.analysis_frame.pack(fill=tk.BOTH, expand=True, anchor=tk.W, pady=10)
 
         # 显示正确答案和解析
-        self.analysis_label.config(text=f"正确答案: {question['answer']}\n\n解析: {question['analysis']}")
-
-        # 判断答案是否正确
-        is_correct = user_answer == question["answer"]
+        self.analysis_label.config(text=f"正确答案: {question.answer}\n\n解析: {question.analysis}")
 
         # 如果答案错误，自动添加到错题集
-        if not is_correct:
+        if not is_correct(question, user_answer):
             self.add_to_wrong_questions(question, user_answer)
 
         # 高亮显示正确和错误的选项
-        for widget in self.content_frame.winfo_children():
-            if isinstance(widget, tk.Frame):  # 选项框架
-                for child in widget.winfo_children():
-                    if isinstance(child, tk.Frame):  # 内容框架
-                        for option_widget in child.winfo_children():
-                            if isinstance(option_widget, (tk.Radiobutton, tk.Checkbutton)):
-                                # 禁用选项，防止再次修改
-                                option_widget.config(state=tk.DISABLED)
-
-                                # 获取选项值
-                                if question["type"] in ["单选", "判断"]:
-                                    value = option_widget.cget("value")
-                                else:  # 多选
-                                    text = option_widget.cget("text")
-                                    value = text[0]  # 取选项字母A/B/C/D
-
-                                # 正确答案高亮显示为绿色
-                                if value in question["answer"]:
-                                    option_widget.config(foreground=self.colors["success"],
-                                                         font=(self.font_family, self.current_font_size, "bold"))
-                                # 用户选择的错误答案显示为红色
-                                elif value in user_answer and value not in question["answer"]:
-                                    option_widget.config(foreground=self.colors["danger"],
-                                                         font=(self.font_family, self.current_font_size, "bold"))
+        self.question_view.show_analysis(question, user_answer)
 
         # 更新进度框颜色
-        for box_id, idx in self.question_index_map.items():
-            if idx == self.current_index and box_id in self.progress_frames:
-                frame = self.progress_frames[box_id]
-                frame.configure(bg=self.colors["success"])
-                # 更新标签背景色和前景色
-                for widget in frame.winfo_children():
-                    if isinstance(widget, ttk.Label):
-                        widget.configure(background=self.colors["success"], foreground="white")
+        self.progress_grid.mark_answered(self.session.current_index)
 
         # 更新答题状态
-        for widget in self.info_frame.winfo_children():
-            if isinstance(widget, ttk.Label) and widget["text"] in ["未答", "已答"]:
-                widget["text"] = "已答"
-                widget["foreground"] = self.colors["success"]
+        self.question_view.set_answered(True)
 
     def prev_question(self):
         """上一题 - 按照进度框显示顺序"""
-        if self.current_index > 0:
-            self.current_index -= 1
+        if not self.session.is_first():
+            self.session.current_index -= 1
             self.update_question_display()
+            self.flush_answers()
         else:
             messagebox.showinfo("提示", "已经是第一题了")
 
     def next_question(self):
         """下一题 - 按照进度框显示顺序"""
-        if self.current_index < len(self.current_questions) - 1:
-            self.current_index += 1
+        if not self.session.is_last():
+            self.session.current_index += 1
             self.update_question_display()
+            self.flush_answers()
         else:
-            if self.mode == "exam":
+            if self.session.mode == EXAM:
                 self.submit_exam()
             else:
                 messagebox.showinfo("完成", "恭喜您完成所有题目练习！")
@@ -2073,24 +1599,11 @@ class ExamSoftware:
 
     def submit_exam(self):
         """提交试卷"""
+        # 先写入缓存的答案
+        self.flush_answers()
+
         # 检查是否有未回答的题目
-        unanswerd = []
-        for i, question in enumerate(self.current_questions):
-            if question["id"] not in self.user_answers:
-                # 计算未答题目编号
-                single_count = sum(1 for q in self.current_questions[:i + 1] if q["type"] == "单选")
-                multiple_count = sum(1 for q in self.current_questions[:i + 1] if q["type"] == "多选")
-                judge_count = sum(1 for q in self.current_questions[:i + 1] if q["type"] == "判断")
-
-                if question["type"] == "单选":
-                    display_number = single_count
-                elif question["type"] == "多选":
-                    display_number = sum(1 for q in self.current_questions if q["type"] == "单选") + multiple_count
-                else:  # 判断
-                    display_number = sum(
-                        1 for q in self.current_questions if q["type"] in ["单选", "多选"]) + judge_count
-
-                unanswerd.append(display_number)
+        unanswerd = self.session.unanswered_numbers()
 
         if unanswerd:
             if not messagebox.askyesno("提示",
@@ -2101,59 +1614,12 @@ class ExamSoftware:
         self.calculate_exam_result()
         self.show_exam_result()
 
+    @traced()
     def calculate_exam_result(self):
-        """计算考试结果"""
-        correct_count = 0
-        total_score = 0
-
-        for question in self.current_questions:
-            if question["id"] in self.user_answers:
-                user_answer = self.user_answers[question["id"]]
-                is_correct = user_answer == question["answer"]
-
-                if is_correct:
-                    correct_count += 1
-                    total_score += float(question["score"])
-                else:
-                    # 添加到错题集
-                    self.add_to_wrong_questions(question, user_answer)
-            else:
-                # 未答题也视为错误
-                self.add_to_wrong_questions(question, "")
-                is_correct = False
-
-            # 计算题目编号
-            single_count = sum(
-                1 for q in self.current_questions[:self.current_questions.index(question) + 1] if q["type"] == "单选")
-            multiple_count = sum(
-                1 for q in self.current_questions[:self.current_questions.index(question) + 1] if q["type"] == "多选")
-            judge_count = sum(
-                1 for q in self.current_questions[:self.current_questions.index(question) + 1] if q["type"] == "判断")
-
-            if question["type"] == "单选":
-                display_number = single_count
-            elif question["type"] == "多选":
-                display_number = sum(1 for q in self.current_questions if q["type"] == "单选") + multiple_count
-            else:  # 判断
-                display_number = sum(1 for q in self.current_questions if q["type"] in ["单选", "多选"]) + judge_count
-
-            # 记录每道题的答题情况
-            self.exam_results[question["id"]] = {
-                "content": question["content"],
-                "type": question["type"],
-                "user_answer": self.user_answers.get(question["id"], "未回答"),
-                "correct_answer": question["answer"],
-                "is_correct": is_correct,
-                "score": float(question["score"]) if is_correct else 0,
-                "total_score": float(question["score"]),
-                "number": display_number
-            }
-
-        self.exam_results["correct"] = correct_count
-        self.exam_results["wrong"] = len(self.current_questions) - correct_count
-        self.exam_results["scores"] = total_score
-        self.exam_results["total"] = len(self.current_questions)
-        self.exam_results["total_scores"] = sum(float(q["score"]) for q in self.current_questions)
+        """计算考试结果，答错和未答的题目一次性加入错题集"""
+        session = self.session
+        self.exam_results, wrong_entries = grade_exam(session.questions, session.user_answers, session.numbering)
+        self.add_many_to_wrong_questions(wrong_entries)
 
     def show_exam_result(self):
         """显示考试结果，包括答题卡 - 美化版"""
@@ -2218,101 +1684,27 @@ class ExamSoftware:
             background=self.colors["card"]
         ).grid(row=0, column=3, padx=30, pady=10)
 
-        # 创建一个笔记本组件来按题型显示结果
-        notebook = ttk.Notebook(self.root)
-        notebook.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
-
-        # 按题型分类
-        single_frame = tk.Frame(notebook, bg=self.colors["bg"])
-        multiple_frame = tk.Frame(notebook, bg=self.colors["bg"])
-        judge_frame = tk.Frame(notebook, bg=self.colors["bg"])
-
-        notebook.add(single_frame, text="单选题")
-        notebook.add(multiple_frame, text="多选题")
-        notebook.add(judge_frame, text="判断题")
-
-        # 为每个题型创建滚动区域
-        single_canvas = tk.Canvas(single_frame, bg=self.colors["bg"])
-        single_scrollbar = ttk.Scrollbar(single_frame, orient="vertical", command=single_canvas.yview)
-        single_scrollable_frame = tk.Frame(single_canvas, bg=self.colors["bg"])
-
-        single_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: single_canvas.configure(scrollregion=single_canvas.bbox("all"))
-        )
-
-        single_canvas.create_window((0, 0), window=single_scrollable_frame, anchor="nw")
-        single_canvas.configure(yscrollcommand=single_scrollbar.set)
-
-        # 添加鼠标滚轮支持
-        single_canvas.bind_all("<MouseWheel>", lambda e: self._on_mouse_wheel(e, single_canvas))
-
-        single_canvas.pack(side="left", fill="both", expand=True)
-        single_scrollbar.pack(side="right", fill="y")
-
-        # 多选题滚动区域
-        multiple_canvas = tk.Canvas(multiple_frame, bg=self.colors["bg"])
-        multiple_scrollbar = ttk.Scrollbar(multiple_frame, orient="vertical", command=multiple_canvas.yview)
-        multiple_scrollable_frame = tk.Frame(multiple_canvas, bg=self.colors["bg"])
-
-        multiple_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: multiple_canvas.configure(scrollregion=multiple_canvas.bbox("all"))
-        )
-
-        multiple_canvas.create_window((0, 0), window=multiple_scrollable_frame, anchor="nw")
-        multiple_canvas.configure(yscrollcommand=multiple_scrollbar.set)
-
-        # 添加鼠标滚轮支持
-        multiple_canvas.bind_all("<MouseWheel>", lambda e: self._on_mouse_wheel(e, multiple_canvas))
-
-        multiple_canvas.pack(side="left", fill="both", expand=True)
-        multiple_scrollbar.pack(side="right", fill="y")
-
-        # 判断题滚动区域
-        judge_canvas = tk.Canvas(judge_frame, bg=self.colors["bg"])
-        judge_scrollbar = ttk.Scrollbar(judge_frame, orient="vertical", command=judge_canvas.yview)
-        judge_scrollable_frame = tk.Frame(judge_canvas, bg=self.colors["bg"])
+        # 按题型分组，题目结果在标签页第一次被选中时才分批创建
+        type_items = {"单选": [], "多选": [], "判断": []}
+        for question in self.session.questions:
+            items = type_items.get(question.type)
+            if items is None:
+                continue
+            result = self.exam_results.get(question.id, {})
+            frame_bg = "#e8f5e9" if result.get("is_correct", False) else "#ffebee"
+            items.append((question, result, len(items) + 1, frame_bg))
 
-        judge_scrollable_frame.bind(
-            "<Configure>",
-            lambda e: judge_canvas.configure(scrollregion=judge_canvas.bbox("all"))
+        # 创建一个笔记本组件来按题型显示结果
+        result_notebook = LazyResultNotebook(
+            self.root,
+            self.colors,
+            render_item=lambda parent, item: self.create_question_result_frame(parent, *item),
+            on_mouse_wheel=self._on_mouse_wheel
         )
+        result_notebook.notebook.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
 
-        judge_canvas.create_window((0, 0), window=judge_scrollable_frame, anchor="nw")
-        judge_canvas.configure(yscrollcommand=judge_scrollbar.set)
-
-        # 添加鼠标滚轮支持
-        judge_canvas.bind_all("<MouseWheel>", lambda e: self._on_mouse_wheel(e, judge_canvas))
-
-        judge_canvas.pack(side="left", fill="both", expand=True)
-        judge_scrollbar.pack(side="right", fill="y")
-
-        # 填充各题型结果
-        single_count = 0
-        multiple_count = 0
-        judge_count = 0
-
-        for question in self.current_questions:
-            q_id = question["id"]
-            result = self.exam_results.get(q_id, {})
-            frame_bg = "#e8f5e9" if result.get("is_correct", False) else "#ffebee"
-
-            if question["type"] == "单选":
-                single_count += 1
-                self.create_question_result_frame(
-                    single_scrollable_frame, question, result, single_count, frame_bg
-                )
-            elif question["type"] == "多选":
-                multiple_count += 1
-                self.create_question_result_frame(
-                    multiple_scrollable_frame, question, result, multiple_count, frame_bg
-                )
-            elif question["type"] == "判断":
-                judge_count += 1
-                self.create_question_result_frame(
-                    judge_scrollable_frame, question, result, judge_count, frame_bg
-                )
+        for question_type, title in [("单选", "单选题"), ("多选", "多选题"), ("判断", "判断题")]:
+            result_notebook.add_tab(title, type_items[question_type])
 
         # 显示答题卡标题
         ttk.Label(
@@ -2333,113 +1725,31 @@ class ExamSoftware:
         )
         answer_sheet_card.pack(fill=tk.X, padx=50, pady=10)
 
-        # 单选题答题卡
-        single_sheet_frame = tk.Frame(answer_sheet_card, bg=self.colors["card"])
-        single_sheet_frame.pack(fill=tk.X, pady=10)
-
-        ttk.Label(
-            single_sheet_frame,
-            text="单选题:",
-            font=(self.font_family, 10, "bold"),
-            background=self.colors["card"]
-        ).pack(side=tk.LEFT, padx=10)
-
-        single_questions = [q for q in self.current_questions if q["type"] == "单选"]
-        for q in single_questions:
-            result = self.exam_results.get(q["id"], {})
-            color = self.colors["success"] if result.get("is_correct", False) else self.colors["danger"]
-
-            box_frame = tk.Frame(
-                single_sheet_frame,
-                width=25,
-                height=25,
-                bd=1,
-                relief=tk.SOLID,
-                bg=color,
-                cursor="hand2"
-            )
-            box_frame.pack(side=tk.LEFT, padx=2, pady=2)
-            box_frame.grid_propagate(False)
-
-            ttk.Label(
-                box_frame,
-                text=str(result.get("number", "")),
-                font=(self.font_family, 9),
-                background=color,
-                foreground="white"
-            ).place(relx=0.5, rely=0.5, anchor=tk.CENTER)
-
-        # 多选题答题卡
-        multiple_sheet_frame = tk.Frame(answer_sheet_card, bg=self.colors["card"])
-        multiple_sheet_frame.pack(fill=tk.X, pady=10)
-
-        ttk.Label(
-            multiple_sheet_frame,
-            text="多选题:",
-            font=(self.font_family, 10, "bold"),
-            background=self.colors["card"]
-        ).pack(side=tk.LEFT, padx=10)
-
-        multiple_questions = [q for q in self.current_questions if q["type"] == "多选"]
-        for q in multiple_questions:
-            result = self.exam_results.get(q["id"], {})
-            color = self.colors["success"] if result.get("is_correct", False) else self.colors["danger"]
-
-            box_frame = tk.Frame(
-                multiple_sheet_frame,
-                width=25,
-                height=25,
-                bd=1,
-                relief=tk.SOLID,
-                bg=color,
-                cursor="hand2"
-            )
-            box_frame.pack(side=tk.LEFT, padx=2, pady=2)
-            box_frame.grid_propagate(False)
+        # 各题型答题卡，方框画在Canvas上并分批绘制
+        for question_type, title in [("单选", "单选题:"), ("多选", "多选题:"), ("判断", "判断题:")]:
+            sheet_frame = tk.Frame(answer_sheet_card, bg=self.colors["card"])
+            sheet_frame.pack(fill=tk.X, pady=10)
 
             ttk.Label(
-                box_frame,
-                text=str(result.get("number", "")),
-                font=(self.font_family, 9),
-                background=color,
-                foreground="white"
-            ).place(relx=0.5, rely=0.5, anchor=tk.CENTER)
-
-        # 判断题答题卡
-        judge_sheet_frame = tk.Frame(answer_sheet_card, bg=self.colors["card"])
-        judge_sheet_frame.pack(fill=tk.X, pady=10)
+                sheet_frame,
+                text=title,
+                font=(self.font_family, 10, "bold"),
+                background=self.colors["card"]
+            ).pack(side=tk.LEFT, padx=10)
 
-        ttk.Label(
-            judge_sheet_frame,
-            text="判断题:",
-            font=(self.font_family, 10, "bold"),
-            background=self.colors["card"]
-        ).pack(side=tk.LEFT, padx=10)
+            sheet_canvas = tk.Canvas(sheet_frame, height=29, bg=self.colors["card"], highlightthickness=0)
+            sheet_canvas.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
-        judge_questions = [q for q in self.current_questions if q["type"] == "判断"]
-        for q in judge_questions:
-            result = self.exam_results.get(q["id"], {})
-            color = self.colors["success"] if result.get("is_correct", False) else self.colors["danger"]
-
-            box_frame = tk.Frame(
-                judge_sheet_frame,
-                width=25,
-                height=25,
-                bd=1,
-                relief=tk.SOLID,
-                bg=color,
-                cursor="hand2"
-            )
-            box_frame.pack(side=tk.LEFT, padx=2, pady=2)
-            box_frame.grid_propagate(False)
+            boxes = [(i, item[1]) for i, item in enumerate(type_items[question_type])]
+            ChunkedRenderer(
+                sheet_canvas,
+                boxes,
+                lambda box, canvas=sheet_canvas: self.draw_answer_sheet_box(canvas, *box),
+                chunk_size=200
+            ).start()
 
-            ttk.Label(
-                box_frame,
-                text=str(result.get("number", "")),
-                font=(self.font_family, 9),
-                background=color,
-                foreground="white"
-            ).place(relx=0.5, rely=0.5, anchor=tk.CENTER)
+        # 成绩统计先显示，再开始创建当前标签页的内容
+        self.root.after(CHUNK_DELAY, result_notebook.show_current)
 
         # 底部按钮
         btn_frame = tk.Frame(self.root, bg=self.colors["bg"])
@@ -2468,6 +1778,18 @@ class ExamSoftware:
             cursor="hand2"
         ).pack(side=tk.RIGHT, padx=10)
 
+    def draw_answer_sheet_box(self, canvas, position, result):
+        """在答题卡上绘制一道题的方框，答对为绿色，答错为红色"""
+        color = self.colors["success"] if result.get("is_correct", False) else self.colors["danger"]
+        x = position * 29 + 2
+        canvas.create_rectangle(x, 2, x + 25, 27, fill=color, outline="black")
+        canvas.create_text(
+            x + 12.5, 14.5,
+            text=str(result.get("number", "")),
+            font=(self.font_family, 9),
+            fill="white"
+        )
+
     def create_question_result_frame(self, parent, question, result, index, bg_color):
         """创建题目结果展示框架 - 美化版"""
         frame = tk.Frame(
@@ -2495,14 +1817,14 @@ class ExamSoftware:
 
         ttk.Label(
             info_frame,
-            text=f"题型: {question['type']}",
+            text=f"题型: {question.type}",
             font=(self.font_family, 10),
             background=bg_color
         ).pack(side=tk.LEFT, padx=10)
 
         ttk.Label(
             info_frame,
-            text=f"难度: {question['difficulty']}",
+            text=f"难度: {question.difficulty}",
             font=(self.font_family, 10),
             background=bg_color
         ).pack(side=tk.LEFT, padx=10)
@@ -2510,7 +1832,7 @@ class ExamSoftware:
         # 题目内容
         ttk.Label(
             frame,
-            text=f"题目: {question['content']}",
+            text=f"题目: {question.content}",
             font=(self.font_family, 11),
             wraplength=700,
             justify=tk.LEFT,
@@ -2521,8 +1843,8 @@ class ExamSoftware:
         options_frame = tk.Frame(frame, bg=bg_color)
         options_frame.pack(fill=tk.X, anchor=tk.W, pady=5)
 
-        for j, option in enumerate(question["options"]):
-            if question["type"] == "判断":
+        for j, option in enumerate(question.options):
+            if question.type == "判断":
                 display_text = option
                 value = option
             else:
@@ -2533,10 +1855,10 @@ class ExamSoftware:
             fg_color = "black"
             font_weight = "normal"
 
-            if value in question["answer"]:
+            if value in question.answer:
                 fg_color = self.colors["success"]
                 font_weight = "bold"
-            elif "user_answer" in result and value in result["user_answer"] and value not in question["answer"]:
+            elif "user_answer" in result and value in result["user_answer"] and value not in question.answer:
                 fg_color = self.colors["danger"]
                 font_weight = "bold"
 
@@ -2561,7 +1883,7 @@ class ExamSoftware:
 
         ttk.Label(
             frame,
-            text=f"正确答案: {question['answer']}",
+            text=f"正确答案: {question.answer}",
             font=(self.font_family, 10, "bold"),
             foreground=self.colors["success"],
             justify=tk.LEFT,
@@ -2570,7 +1892,7 @@ class ExamSoftware:
 
         ttk.Label(
             frame,
-            text=f"解析: {question['analysis']}",
+            text=f"解析: {question.analysis}",
             font=(self.font_family, 10),
             wraplength=700,
             justify=tk.LEFT,
@@ -2587,95 +1909,71 @@ class ExamSoftware:
 
     def mark_as_wrong(self, question):
         """标记为错题"""
-        try:
-            self.cursor.execute(
-                "SELECT id FROM wrong_questions WHERE bank_id = ? AND question_id = ?",
-                (self.current_bank_id, question["id"])
-            )
-
-            if self.cursor.fetchone():
-                messagebox.showinfo("提示", "这道题已经在错题集中了")
-                return
-
-            # 添加到错题集
-            self.cursor.execute('''
-            INSERT INTO wrong_questions (bank_id, question_id, user_answer, added_at)
-            VALUES (?, ?, ?, ?)
-            ''', (self.current_bank_id, question["id"],
-                  self.user_answers.get(question["id"], ""), datetime.now()))
-            self.conn.commit()
-
-            # 更新内存中的错题集
-            self.load_wrong_questions()
+        if question.id in self.wrong_questions:
+            messagebox.showinfo("提示", "这道题已经在错题集中了")
+            return
 
-            messagebox.showinfo("成功", "已添加到错题集")
-        except sqlite3.Error as e:
-            self.conn.rollback()
-            messagebox.showerror("数据库错误", f"标记错题失败: {str(e)}")
+        self.add_many_to_wrong_questions(
+            [(question.id, self.session.user_answers.get(question.id, ""))],
+            on_done=lambda: messagebox.showinfo("成功", "已添加到错题集"),
+            on_error=lambda e: messagebox.showerror("数据库错误", f"标记错题失败: {str(e)}")
+        )
 
     def add_to_wrong_questions(self, question, user_answer):
         """将错题添加到错题集"""
-        try:
-            # 检查是否已经在错题集中
-            self.cursor.execute(
-                "SELECT id FROM wrong_questions WHERE bank_id = ? AND question_id = ?",
-                (self.current_bank_id, question["id"])
-            )
+        self.add_many_to_wrong_questions([(question.id, user_answer)])
 
-            if self.cursor.fetchone():
-                return
+    def add_many_to_wrong_questions(self, entries, on_done=None, on_error=None):
+        """
+        在后台用一个事务将多道错题添加到错题集，写入成功后同步更新内存中的错题集
 
-            # 添加到错题集
-            self.cursor.execute('''
-            INSERT INTO wrong_questions (bank_id, question_id, user_answer, added_at)
-            VALUES (?, ?, ?, ?)
-            ''', (self.current_bank_id, question["id"], user_answer, datetime.now()))
-            self.conn.commit()
+        Args:
+            entries: [(题目ID, 用户答案), ...]
+            on_done: 写入成功后的回调
+            on_error: 写入失败时的回调，参数为异常；为空时打印错误，内存中的错题集保持不变
+        """
+        # 内存中的错题集与数据库一致，已在错题集中的题目不再写入
+        entries = self.wrong_questions.new_entries(entries)
+        if not entries:
+            if on_done is not None:
+                on_done()
+            return
 
-            # 更新内存中的错题集
-            self.load_wrong_questions()
-        except sqlite3.Error as e:
-            self.conn.rollback()
-            print(f"添加错题失败: {str(e)}")
+        bank_id = self.current_bank_id
+        added_at = datetime.now()
+
+        def written(_):
+            # 写入期间已切换到其他题库，切换时已从数据库重新加载
+            if bank_id == self.current_bank_id:
+                if not self.wrong_questions.add_entries(self.question_index, entries, added_at):
+                    # 题目不在当前题库索引中，直接与数据库同步
+                    self.load_wrong_questions()
+            if on_done is not None:
+                on_done()
+
+        self.db_worker.submit(
+            add_wrong_questions, bank_id, entries, added_at,
+            callback=written,
+            errback=on_error or (lambda e: print(f"添加错题失败: {str(e)}"))
+        )
 
     def load_wrong_questions(self):
-        """从数据库加载错题集"""
-        self.wrong_questions = []
+        """在后台从数据库重新加载错题集"""
         if not self.current_bank_id:
+            self.wrong_questions = WrongSet()
             return
 
-        try:
-            self.cursor.execute('''
-            SELECT q.id, q.content, q.type, q.is_subquestion, q.options, q.difficulty, 
-                   q.analysis, q.answer, q.score, w.user_answer
-            FROM wrong_questions w
-            JOIN questions q ON w.question_id = q.id
-            WHERE w.bank_id = ?
-            ORDER BY w.added_at DESC
-            ''', (self.current_bank_id,))
-
-            for row in self.cursor.fetchall():
-                question = {
-                    "id": row[0],
-                    "content": row[1],
-                    "type": row[2],
-                    "is_subquestion": row[3],
-                    "options": row[4].split('|') if row[4] else [],
-                    "difficulty": row[5],
-                    "analysis": row[6],
-                    "answer": row[7],
-                    "score": row[8],
-                    "user_answer": row[9]
-                }
-
-                # 处理判断题选项
-                if question["type"] == "判断" and not question["options"]:
-                    question["options"] = ["正确", "错误"]
-
-                self.wrong_questions.append(question)
-        except sqlite3.Error as e:
-            messagebox.showerror("数据库错误", f"加载错题集失败: {str(e)}")
-            self.wrong_questions = []
+        bank_id = self.current_bank_id
+
+        def loaded(wrong_questions):
+            if bank_id == self.current_bank_id:
+                self.wrong_questions = WrongSet(wrong_questions)
+
+        self.db_worker.submit(
+            load_all_wrong_questions, bank_id,
+            callback=loaded,
+            errback=lambda e: messagebox.showerror("数据库错误", f"加载错题集失败: {str(e)}")
+        )
 
     def view_wrong_questions(self):
         """查看错题集 - 美化版"""
@@ -2683,10 +1981,9 @@ class ExamSoftware:
             messagebox.showwarning("警告", "请先加载一个题库")
             return
 
-        # 加载最新的错题集
-        self.load_wrong_questions()
-
-        if not self.wrong_questions:
+        # 内存中的错题集与数据库一致，错题在浏览时按页从数据库读取
+        total = len(self.wrong_questions)
+        if not total:
             messagebox.showinfo("提示", "错题集为空")
             return
 
@@ -2747,197 +2044,81 @@ class ExamSoftware:
         )
         stats_card.pack(fill=tk.X, padx=50, pady=10)
 
-        ttk.Label(
+        count_label = ttk.Label(
             stats_card,
-            text=f"共有 {len(self.wrong_questions)} 道错题",
+            text=f"共有 {total} 道错题",
             font=(self.font_family, 12),
             background=self.colors["card"]
-        ).pack()
-
-        # 创建滚动区域
-        canvas = tk.Canvas(self.root, bg=self.colors["bg"])
-        scrollbar = ttk.Scrollbar(self.root, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg=self.colors["bg"])
-
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
         )
+        count_label.pack()
 
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        # 分页显示错题
+        browser = WrongQuestionBrowser(
+            self.root,
+            self.db_worker,
+            self.current_bank_id,
+            total,
+            self.font_family,
+            self.colors,
+            on_remove=self.remove_from_wrong,
+            on_empty=self.on_wrong_questions_empty,
+            count_label=count_label
+        )
 
         # 添加鼠标滚轮支持
-        canvas.bind_all("<MouseWheel>", lambda e: self._on_mouse_wheel(e, canvas))
-
-        canvas.pack(side="left", fill="both", expand=True, padx=20, pady=10)
-        scrollbar.pack(side="right", fill="y")
-
-        # 显示错题
-        for i, question in enumerate(self.wrong_questions):
-            frame = tk.Frame(
-                scrollable_frame,
-                bd=1,
-                relief=tk.SOLID,
-                padx=15,
-                pady=15,
-                bg="#fff3e0",
-                highlightbackground="#bdbdbd",
-                highlightthickness=1
-            )
-            frame.pack(fill=tk.X, pady=10, padx=10)
-
-            # 题目信息
-            info_frame = tk.Frame(frame, bg="#fff3e0")
-            info_frame.pack(fill=tk.X, anchor=tk.W)
-
-            ttk.Label(
-                info_frame,
-                text=f"第 {i + 1} 题",
-                font=(self.font_family, 10, "bold"),
-                background="#fff3e0"
-            ).pack(side=tk.LEFT, padx=10)
-
-            ttk.Label(
-                info_frame,
-                text=f"题型: {question['type']}",
-                font=(self.font_family, 10),
-                background="#fff3e0"
-            ).pack(side=tk.LEFT, padx=10)
+        browser.canvas.bind_all("<MouseWheel>", lambda e: self._on_mouse_wheel(e, browser.canvas))
 
-            ttk.Label(
-                info_frame,
-                text=f"难度: {question['difficulty']}",
-                font=(self.font_family, 10),
-                background="#fff3e0"
-            ).pack(side=tk.LEFT, padx=10)
-
-            # 题目内容
-            ttk.Label(
-                frame,
-                text=f"题目: {question['content']}",
-                font=(self.font_family, 11),
-                wraplength=700,
-                justify=tk.LEFT,
-                background="#fff3e0"
-            ).pack(anchor=tk.W, pady=5)
-
-            # 选项
-            options_frame = tk.Frame(frame, bg="#fff3e0")
-            options_frame.pack(fill=tk.X, anchor=tk.W, pady=5)
-
-            for j, option in enumerate(question["options"]):
-                if question["type"] == "判断":
-                    display_text = option
-                    value = option
-                else:
-                    display_text = f"{chr(65 + j)}. {option}"
-                    value = chr(65 + j)
-
-                # 标记正确答案和用户选择
-                fg_color = "black"
-                font_weight = "normal"
-
-                if value in question["answer"]:
-                    fg_color = self.colors["success"]
-                    font_weight = "bold"
-                elif "user_answer" in question and value in question["user_answer"] and value not in question["answer"]:
-                    fg_color = self.colors["danger"]
-                    font_weight = "bold"
-
-                ttk.Label(
-                    options_frame,
-                    text=display_text,
-                    font=(self.font_family, 10, font_weight),
-                    foreground=fg_color,
-                    wraplength=700,
-                    justify=tk.LEFT,
-                    background="#fff3e0"
-                ).pack(anchor=tk.W, pady=2)
-
-            # 答案和解析
-            if "user_answer" in question:
-                ttk.Label(
-                    frame,
-                    text=f"你的答案: {question['user_answer']}",
-                    font=(self.font_family, 10),
-                    justify=tk.LEFT,
-                    background="#fff3e0"
-                ).pack(anchor=tk.W, pady=2)
-
-            ttk.Label(
-                frame,
-                text=f"正确答案: {question['answer']}",
-                font=(self.font_family, 10, "bold"),
-                foreground=self.colors["success"],
-                justify=tk.LEFT,
-                background="#fff3e0"
-            ).pack(anchor=tk.W, pady=2)
-
-            ttk.Label(
-                frame,
-                text=f"解析: {question['analysis']}",
-                font=(self.font_family, 10),
-                wraplength=700,
-                justify=tk.LEFT,
-                background="#fff3e0"
-            ).pack(anchor=tk.W, pady=2)
-
-            # 移除按钮
-            tk.Button(
-                frame,
-                text="从错题集移除",
-                command=lambda q=question: self.remove_from_wrong(q),
-                bg=self.colors["danger"],
-                foreground="white",
-                width=15,
-                activebackground="#d32f2f",
-                relief=tk.FLAT,
-                cursor="hand2"
-            ).pack(anchor=tk.E, pady=5)
-
-    def remove_from_wrong(self, question):
-        """从错题集移除"""
-        try:
-            self.cursor.execute(
-                "DELETE FROM wrong_questions WHERE bank_id = ? AND question_id = ?",
-                (self.current_bank_id, question["id"])
-            )
-            self.conn.commit()
+    def remove_from_wrong(self, question, on_removed):
+        """
+        在后台从错题集移除，界面由错题浏览区域自行更新
 
+        Args:
+            on_removed: 移除成功后的回调
+        """
+        def removed(_):
             # 更新内存中的错题集
-            self.load_wrong_questions()
+            self.wrong_questions.remove(question.id)
+            on_removed()
 
-            # 刷新界面
-            self.view_wrong_questions()
-        except sqlite3.Error as e:
-            self.conn.rollback()
-            messagebox.showerror("数据库错误", f"移除错题失败: {str(e)}")
+        self.db_worker.submit(
+            remove_wrong_question, self.current_bank_id, question.id,
+            callback=removed,
+            errback=lambda e: messagebox.showerror("数据库错误", f"移除错题失败: {str(e)}")
+        )
+
+    def on_wrong_questions_empty(self):
+        """错题全部移除后返回主界面"""
+        messagebox.showinfo("提示", "错题集为空")
+        self.create_main_interface()
 
     def practice_wrong_questions(self):
         """练习错题"""
+        if self.bank_loading:
+            return
         if not self.wrong_questions:
             messagebox.showinfo("提示", "错题集为空")
             return
 
-        self.mode = "wrong"
-        self.current_questions = self.wrong_questions.copy()
-        self.current_index = 0
-        self.user_answers = {}
+        # 先写入缓存的答案，再从数据库读取
+        self.flush_answers()
 
-        # 从数据库中加载用户答案
-        try:
-            self.cursor.execute(
-                "SELECT question_id, user_answer FROM progress "
-                "WHERE bank_id = ? AND mode = ?",
-                (self.current_bank_id, "wrong")
-            )
+        def load_failed(error):
+            messagebox.showerror("数据库错误", f"加载答题进度失败: {str(error)}")
+            self.show_wrong_practice(bank_id, {})
 
-            for row in self.cursor.fetchall():
-                self.user_answers[row[0]] = row[1]
-        except sqlite3.Error as e:
-            messagebox.showerror("数据库错误", f"加载答题进度失败: {str(e)}")
-            self.user_answers = {}
+        bank_id = self.current_bank_id
+        self.db_worker.submit(
+            bank_store.load_progress, bank_id, "wrong",
+            callback=lambda user_answers: self.show_wrong_practice(bank_id, user_answers),
+            errback=load_failed
+        )
+
+    def show_wrong_practice(self, bank_id, user_answers):
+        """读取答题进度后显示错题练习"""
+        if bank_id != self.current_bank_id:
+            return
+
+        self.session = PracticeSession(bank_id, WRONG, self.wrong_questions.questions(), user_answers)
 
         # 显示第一题
         self.init_question_interface()
@@ -2946,6 +2127,9 @@ class ExamSoftware:
 
 
 if __name__ == "__main__":
+    # 设置环境变量EXERCISER_STARTUP_TIMING=1或使用--startup-timing参数时输出启动耗时
+    startup_timer = StartupTimer(timing_enabled())
     root = tk.Tk()
-    app = ExamSoftware(root)
+    startup_timer.mark("创建窗口")
+    app = ExamSoftware(root, startup_timer)
     root.mainloop()
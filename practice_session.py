@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+练习会话 - 当前练习的题目列表、编号表、用户答案和当前位置，以及按练习模式确定题目顺序
+
+不依赖界面和数据库，答题界面、无界面的刷题引擎共用同样的规则
+"""
+
+import random
+
+from question_index import QuestionNumbering
+
+# 练习模式
+SEQUENCE = "sequence"  # 顺序练习
+RANDOM = "random"  # 随机练习
+EXAM = "exam"  # 组合试卷
+WRONG = "wrong"  # 错题练习
+
+
+def can_resume_order(index, saved_order):
+    """保存的随机练习顺序是否还能使用（题目数量与题库一致）"""
+    return bool(saved_order) and len(saved_order) == len(index)
+
+
+def practice_order(index, mode, saved_order=None, reshuffle=True, shuffle=random.shuffle):
+    """
+    按练习模式确定题目顺序
+
+    Args:
+        index: 题库的QuestionIndex
+        mode: SEQUENCE或RANDOM
+        saved_order: 上次保存的题目ID顺序
+        reshuffle: 随机练习时是否重新打乱；保存的顺序不能使用时总是重新打乱
+        shuffle: 打乱函数
+
+    Returns:
+        (题目列表, 是否重新打乱了顺序)，重新打乱时应从第一题开始
+    """
+    if mode == SEQUENCE:
+        # 按题型分组排序：单选题、多选题、判断题，题型内按ID排序
+        return index.grouped_by_type(), False
+    if mode == RANDOM:
+        if reshuffle or not can_resume_order(index, saved_order):
+            # 按题型分组并分别随机排序
+            return index.grouped_by_type(shuffle=shuffle), True
+        return index.resolve(saved_order), False
+    raise ValueError(f"不支持的练习模式: {mode}")
+
+
+class PracticeSession:
+    """一次练习或考试的状态"""
+
+    def __init__(self, bank_id=None, mode="", questions=(), user_answers=None, current_index=None):
+        """
+        Args:
+            bank_id: 题库ID
+            mode: 练习模式
+            questions: 题目列表
+            user_answers: 已有的答案 {题目ID: 用户答案}
+            current_index: 开始的题目索引，为空或超出范围时从第一题开始
+        """
+        self.bank_id = bank_id
+        self.mode = mode
+        self.questions = list(questions)
+        self.numbering = QuestionNumbering(self.questions)
+        self.user_answers = dict(user_answers or {})
+        self.current_index = current_index if current_index is not None and \
+            0 <= current_index < len(self.questions) else 0
+
+    def __len__(self):
+        return len(self.questions)
+
+    @property
+    def current_question(self):
+        """当前题目"""
+        return self.questions[self.current_index]
+
+    @property
+    def position_key(self):
+        """保存练习位置的配置项名称"""
+        return f"last_position_{self.mode}_{self.bank_id}"
+
+    def is_first(self):
+        """当前是否是第一题"""
+        return self.current_index == 0
+
+    def is_last(self):
+        """当前是否是最后一题"""
+        return self.current_index == len(self.questions) - 1
+
+    def is_answered(self, index):
+        """第index道题是否已作答"""
+        return self.questions[index].id in self.user_answers
+
+    def record_answer(self, question_id, user_answer):
+        """记录答案"""
+        self.user_answers[question_id] = user_answer
+
+    def question_ids(self):
+        """按当前顺序的题目ID列表"""
+        return [question.id for question in self.questions]
+
+    def unanswered_numbers(self):
+        """未作答题目的显示编号，按题目顺序"""
+        return [self.numbering.number(i) for i, question in enumerate(self.questions)
+                if question.id not in self.user_answers]
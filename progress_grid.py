@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+答题进度网格 - 在一个Canvas上绘制进度方框，只绘制可见区域内的行，点击位置通过坐标计算得到题目
+
+按题型分区显示，每行5个方框，题型下第一个方框顶格显示。
+切换题目、作答时只把受影响的方框记入待刷新集合，空闲时只修改这几个方框的样式
+"""
+
+import tkinter as tk
+
+from question_index import QUESTION_TYPES
+
+# 每行显示的方框数量
+COLUMNS = 5
+
+# 题型分区标题
+SECTION_TITLES = {"单选": "单选题", "多选": "多选题", "判断": "判断题"}
+
+
+class ProgressGrid:
+    """虚拟化的答题进度网格"""
+
+    MARGIN_X = 10  # 左右边距
+    HEADER_HEIGHT = 30  # 题型标题高度
+    SECTION_GAP = 5  # 分区之间的间距
+    BOX_PAD = 3  # 方框四周的间距
+
+    def __init__(self, canvas, scrollbar, fonts, colors, on_select):
+        """
+        Args:
+            canvas: 用于绘制的Canvas
+            scrollbar: 纵向滚动条
+            fonts: 界面字体FontScheme，方框大小随其字体大小变化
+            colors: 颜色方案
+            on_select: 点击方框时的回调，参数为题目在当前题目列表中的索引
+        """
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.fonts = fonts
+        self.colors = colors
+        self.on_select = on_select
+
+        self.numbering = None
+        self.is_answered = lambda index: False
+        self.current_index = -1
+        self.hover_index = -1
+
+        self.sections = []  # [(题型, 起始y, 题目索引列表), ...]
+        self.total_height = 0
+        self.box_items = {}  # 已绘制的方框 {题目索引: (方框ID, 文字ID)}
+        self.dirty = set()  # 需要刷新样式的题目索引
+        self._full_render = False  # 是否需要重绘整个可见区域
+        self._render_pending = False
+
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+        self.scrollbar.configure(command=self.canvas.yview)
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Motion>", self._on_motion)
+        self.canvas.bind("<Leave>", self._on_leave)
+        self.canvas.bind("<Configure>", lambda e: self.schedule_render(full=True))
+
+    @property
+    def box_size(self):
+        """方框边长，随字体大小变化，确保数字能完整显示"""
+        return max(28, self.fonts.size * 3)
+
+    @property
+    def cell_size(self):
+        """方框加四周间距占用的大小"""
+        return self.box_size + self.BOX_PAD * 2
+
+    @property
+    def width(self):
+        """网格需要的宽度"""
+        return self.MARGIN_X * 2 + self.cell_size * COLUMNS
+
+    def set_questions(self, numbering, is_answered, current_index=-1):
+        """
+        设置要显示的题目并重新布局
+
+        Args:
+            numbering: 当前题目列表的QuestionNumbering
+            is_answered: 判断第index道题是否已作答的函数
+            current_index: 当前题目索引
+        """
+        self.numbering = numbering
+        self.is_answered = is_answered
+        self.current_index = current_index
+        self.hover_index = -1
+        self.relayout()
+
+    def relayout(self):
+        """重新计算各分区的位置和滚动区域，字体大小变化后调用"""
+        self.sections = []
+        y = 0
+        if self.numbering is not None:
+            for question_type in QUESTION_TYPES:
+                indexes = self.numbering.positions.get(question_type, [])
+                if not indexes:
+                    continue
+                self.sections.append((question_type, y, indexes))
+                rows = (len(indexes) + COLUMNS - 1) // COLUMNS
+                y += self.HEADER_HEIGHT + rows * self.cell_size + self.SECTION_GAP
+
+        self.total_height = y
+        self.canvas.configure(width=self.width, scrollregion=(0, 0, self.width, self.total_height))
+        self.render()
+
+    def set_current(self, index):
+        """设置当前题目，只刷新原来和新的当前方框"""
+        if index == self.current_index:
+            return
+        self.dirty.add(self.current_index)
+        self.dirty.add(index)
+        self.current_index = index
+        self.schedule_render()
+
+    def mark_answered(self, index):
+        """题目作答后只刷新对应方框颜色"""
+        self.dirty.add(index)
+        self.schedule_render()
+
+    def schedule_render(self, full=False):
+        """
+        在空闲时刷新，合并同一轮事件中的多次刷新
+
+        Args:
+            full: 是否重绘整个可见区域（滚动、尺寸变化时），否则只刷新待刷新集合中的方框
+        """
+        self._full_render = self._full_render or full
+        if not self._render_pending:
+            self._render_pending = True
+            self.canvas.after_idle(self._flush)
+
+    def _flush(self):
+        self._render_pending = False
+        if self._full_render:
+            self.render()
+            return
+
+        if not self.canvas.winfo_exists():
+            return
+        for index in self.dirty:
+            if index in self.box_items:
+                self._style_box(index)
+        self.dirty.clear()
+
+    def render(self):
+        """只绘制可见区域内的分区标题和方框"""
+        self._render_pending = False
+        self._full_render = False
+        self.dirty.clear()
+        if not self.canvas.winfo_exists():
+            return
+
+        self.canvas.delete("all")
+        self.box_items = {}
+        top = self.canvas.canvasy(0)
+        bottom = top + max(self.canvas.winfo_height(), 1)
+        cell = self.cell_size
+        label_font = self.fonts.small
+
+        for question_type, section_y, indexes in self.sections:
+            rows = (len(indexes) + COLUMNS - 1) // COLUMNS
+            grid_top = section_y + self.HEADER_HEIGHT
+            if grid_top + rows * cell < top or section_y > bottom:
+                continue
+
+            self.canvas.create_text(
+                self.MARGIN_X, section_y + self.HEADER_HEIGHT // 2,
+                text=SECTION_TITLES.get(question_type, question_type),
+                anchor=tk.W,
+                font=(self.fonts.family, 10, "bold"),
+                fill=self.colors["text"]
+            )
+
+            # 可见的行范围
+            first_row = max(0, int((top - grid_top) // cell))
+            last_row = min(rows - 1, int((bottom - grid_top) // cell))
+            for row in range(first_row, last_row + 1):
+                for col in range(COLUMNS):
+                    rank = row * COLUMNS + col
+                    if rank >= len(indexes):
+                        break
+                    self._draw_box(indexes[rank], grid_top, row, col, label_font)
+
+    def _box_style(self, index):
+        """
+        方框的样式
+
+        Returns:
+            (填充色, 文字颜色, 边框颜色, 边框宽度)
+        """
+        answered = self.is_answered(index)
+        fill = self.colors["success"] if answered else self.colors["card"]
+        text_color = "white" if answered else self.colors["text"]
+        if index == self.current_index:
+            return fill, text_color, self.colors["primary"], 3
+        if index == self.hover_index:
+            return fill, text_color, self.colors["text_light"], 3
+        return fill, text_color, self.colors["text"], 2
+
+    def _draw_box(self, index, grid_top, row, col, label_font):
+        """绘制一个方框"""
+        x = self.MARGIN_X + col * self.cell_size + self.BOX_PAD
+        y = grid_top + row * self.cell_size + self.BOX_PAD
+        size = self.box_size
+        fill, text_color, outline, width = self._box_style(index)
+
+        rect_id = self.canvas.create_rectangle(x, y, x + size, y + size, fill=fill, outline=outline, width=width)
+        text_id = self.canvas.create_text(
+            x + size / 2, y + size / 2,
+            text=str(self.numbering.number(index)),
+            font=label_font,
+            fill=text_color
+        )
+        self.box_items[index] = (rect_id, text_id)
+
+    def _style_box(self, index):
+        """只修改已绘制方框的样式"""
+        rect_id, text_id = self.box_items[index]
+        fill, text_color, outline, width = self._box_style(index)
+        self.canvas.itemconfigure(rect_id, fill=fill, outline=outline, width=width)
+        self.canvas.itemconfigure(text_id, fill=text_color)
+
+    def index_at(self, x, y):
+        """
+        根据窗口坐标计算对应的题目索引
+
+        Returns:
+            题目在当前题目列表中的索引，不在任何方框上时返回-1
+        """
+        x = self.canvas.canvasx(x) - self.MARGIN_X
+        y = self.canvas.canvasy(y)
+        cell = self.cell_size
+
+        for _, section_y, indexes in self.sections:
+            grid_top = section_y + self.HEADER_HEIGHT
+            rows = (len(indexes) + COLUMNS - 1) // COLUMNS
+            if not grid_top <= y < grid_top + rows * cell:
+                continue
+
+            row, col = int((y - grid_top) // cell), int(x // cell)
+            if x < 0 or col >= COLUMNS:
+                return -1
+
+            # 排除方框之间的间距
+            offset_x = x - col * cell
+            offset_y = y - grid_top - row * cell
+            if not (self.BOX_PAD <= offset_x <= cell - self.BOX_PAD and
+                    self.BOX_PAD <= offset_y <= cell - self.BOX_PAD):
+                return -1
+
+            rank = row * COLUMNS + col
+            return indexes[rank] if rank < len(indexes) else -1
+
+        return -1
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.schedule_render(full=True)
+
+    def _on_click(self, event):
+        index = self.index_at(event.x, event.y)
+        if index >= 0:
+            self.on_select(index)
+
+    def _on_motion(self, event):
+        index = self.index_at(event.x, event.y)
+        if index != self.hover_index:
+            self.dirty.add(self.hover_index)
+            self.dirty.add(index)
+            self.hover_index = index
+            self.canvas.configure(cursor="hand2" if index >= 0 else "")
+            self.schedule_render()
+
+    def _on_leave(self, event):
+        if self.hover_index >= 0:
+            self.dirty.add(self.hover_index)
+            self.hover_index = -1
+            self.schedule_render()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+题库内存索引 - 题目ID映射、按题型和难度分组的列表，题库变化时重建一次
+"""
+
+# 练习和试卷中题型的排列顺序
+QUESTION_TYPES = ["单选", "多选", "判断"]
+
+
+class QuestionIndex:
+    """题库索引，分组列表中的题目保持加载时的顺序（按ID升序）"""
+
+    def __init__(self, questions=()):
+        self.questions = list(questions)
+        self.by_id = {}
+        self.by_type = {question_type: [] for question_type in QUESTION_TYPES}
+        self.by_difficulty = {}
+
+        for question in self.questions:
+            self.by_id[question.id] = question
+            self.by_type.setdefault(question.type, []).append(question)
+            self.by_difficulty.setdefault(question.difficulty, []).append(question)
+
+    def __len__(self):
+        return len(self.questions)
+
+    def get(self, question_id):
+        """按ID查找题目，不存在时返回None"""
+        return self.by_id.get(question_id)
+
+    def of_type(self, question_type):
+        """获取某题型的全部题目（返回的是索引内部的列表，不要修改）"""
+        return self.by_type.get(question_type, [])
+
+    def of_difficulty(self, difficulty):
+        """获取某难度的全部题目（返回的是索引内部的列表，不要修改）"""
+        return self.by_difficulty.get(difficulty, [])
+
+    def count(self, question_type):
+        """某题型的题目数量"""
+        return len(self.by_type.get(question_type, []))
+
+    def grouped_by_type(self, shuffle=None):
+        """
+        按单选、多选、判断的顺序组合题目
+
+        Args:
+            shuffle: 打乱函数（如random.shuffle），为空时保持ID顺序
+
+        Returns:
+            新的题目列表
+        """
+        result = []
+        for question_type in QUESTION_TYPES:
+            questions = list(self.of_type(question_type))
+            if shuffle is not None:
+                shuffle(questions)
+            result.extend(questions)
+        return result
+
+    def resolve(self, question_ids):
+        """将题目ID列表还原为题目列表，跳过已不存在的题目"""
+        by_id = self.by_id
+        return [by_id[qid] for qid in question_ids if qid in by_id]
+
+
+def group_positions_by_type(questions):
+    """
+    按题型对题目列表做一次遍历分组
+
+    Returns:
+        {题型: [题目在列表中的索引, ...]}，QUESTION_TYPES中的题型总是存在
+    """
+    positions = {question_type: [] for question_type in QUESTION_TYPES}
+    for i, question in enumerate(questions):
+        positions.setdefault(question.type, []).append(i)
+    return positions
+
+
+class QuestionNumbering:
+    """
+    当前题目列表的编号表：题目按单选、多选、判断连续编号，
+    例如3道单选、2道多选时，多选题从4开始编号
+
+    在设置当前题目列表时构建一次，之后按索引查编号为O(1)
+    """
+
+    def __init__(self, questions=()):
+        self.positions = group_positions_by_type(questions)
+
+        # 各题型的起始偏移，题型顺序外的其他题型排在最后
+        self.type_offsets = {}
+        offset = 0
+        for question_type, indexes in self.positions.items():
+            self.type_offsets[question_type] = offset
+            offset += len(indexes)
+
+        # 索引 -> 显示编号
+        self.numbers = [0] * len(questions)
+        for question_type, indexes in self.positions.items():
+            start = self.type_offsets[question_type] + 1
+            for rank, index in enumerate(indexes):
+                self.numbers[index] = start + rank
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def number(self, index):
+        """题目列表中第index道题的显示编号（从1开始）"""
+        return self.numbers[index]
+
+    def count(self, question_type):
+        """某题型的题目数量"""
+        return len(self.positions.get(question_type, []))
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+题目顺序存储 - 每个题库的每种练习模式只保存一行：题目ID压缩成int32数组的BLOB，附带CRC32校验
+
+顺序未变化时跳过写入
+"""
+
+import sys
+import zlib
+from array import array
+from datetime import datetime
+
+# 题目ID按int32小端序存储
+_ID_TYPECODE = "i"
+assert array(_ID_TYPECODE).itemsize == 4
+
+
+def pack_order(question_ids):
+    """
+    将题目ID列表打包为字节串
+
+    Returns:
+        (字节串, CRC32校验值)
+    """
+    ids = array(_ID_TYPECODE, question_ids)
+    if sys.byteorder == "big":
+        ids.byteswap()
+    data = ids.tobytes()
+    return data, zlib.crc32(data)
+
+
+def unpack_order(data, checksum=None):
+    """
+    将字节串还原为题目ID列表
+
+    Returns:
+        题目ID列表，数据损坏（长度不对或校验不通过）时返回None
+    """
+    if data is None or len(data) % 4:
+        return None
+    if checksum is not None and zlib.crc32(data) != checksum:
+        return None
+
+    ids = array(_ID_TYPECODE)
+    ids.frombytes(data)
+    if sys.byteorder == "big":
+        ids.byteswap()
+    return ids.tolist()
+
+
+def save_order(conn, bank_id, mode, question_ids):
+    """
+    保存题目顺序，与已保存的顺序相同时不写入，调用方负责提交事务
+
+    Returns:
+        是否写入了数据库
+    """
+    data, checksum = pack_order(question_ids)
+
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT checksum, order_data FROM question_order_blobs WHERE bank_id = ? AND mode = ?",
+        (bank_id, mode)
+    )
+    saved = cursor.fetchone()
+    if saved and saved[0] == checksum and saved[1] == data:
+        return False
+
+    cursor.execute('''
+    INSERT OR REPLACE INTO question_order_blobs
+    (bank_id, mode, question_count, checksum, order_data, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ''', (bank_id, mode, len(question_ids), checksum, data, datetime.now()))
+    return True
+
+
+def load_order(conn, bank_id, mode):
+    """
+    读取保存的题目顺序
+
+    Returns:
+        题目ID列表，没有保存过或数据损坏时返回None
+    """
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT question_count, checksum, order_data FROM question_order_blobs WHERE bank_id = ? AND mode = ?",
+        (bank_id, mode)
+    )
+    saved = cursor.fetchone()
+    if not saved:
+        return None
+
+    question_ids = unpack_order(saved[2], saved[1])
+    if question_ids is None or len(question_ids) != saved[0]:
+        return None
+    return question_ids
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+题目记录 - 使用__slots__的紧凑题目对象，代替每道题一个九个键的字典
+
+题型、难度和答案的取值很少，驻留后所有题目共用同一个字符串对象；
+选项保存数据库中以|分隔的原始字符串，访问options时才拆分，不为每道题保存一个列表
+"""
+
+import sys
+
+# 没有选项的判断题显示的选项
+JUDGE_OPTIONS = ("正确", "错误")
+
+
+def _intern(value):
+    """驻留字符串，其他值原样返回"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Question:
+    """一道题目，字段与questions表的列相同"""
+
+    __slots__ = ("id", "content", "type", "is_subquestion", "option_text", "difficulty", "analysis", "answer",
+                 "score")
+
+    def __init__(self, question_id, content, question_type, is_subquestion, option_text, difficulty, analysis,
+                 answer, score):
+        self.id = question_id
+        self.content = content
+        self.type = _intern(question_type)
+        self.is_subquestion = is_subquestion
+        self.option_text = option_text
+        self.difficulty = _intern(difficulty)
+        self.analysis = analysis
+        self.answer = _intern(answer)
+        self.score = score
+
+    @classmethod
+    def from_row(cls, row):
+        """由查询结果的一行创建，列顺序为id, content, type, is_subquestion, options, difficulty, analysis, answer, score"""
+        return cls(*row[:9])
+
+    @property
+    def options(self):
+        """选项列表（每次返回新列表），没有选项的判断题为“正确”和“错误”"""
+        if self.option_text:
+            return self.option_text.split("|")
+        if self.type == "判断":
+            return list(JUDGE_OPTIONS)
+        return []
+
+    def __repr__(self):
+        return f"{type(self).__name__}(id={self.id!r}, type={self.type!r})"
+
+
+class WrongQuestion(Question):
+    """错题集中的题目，多了用户答案和加入时间"""
+
+    __slots__ = ("user_answer", "added_at")
+
+    def __init__(self, question_id, content, question_type, is_subquestion, option_text, difficulty, analysis,
+                 answer, score, user_answer, added_at):
+        super().__init__(question_id, content, question_type, is_subquestion, option_text, difficulty, analysis,
+                         answer, score)
+        self.user_answer = user_answer
+        self.added_at = added_at
+
+    @classmethod
+    def from_row(cls, row):
+        """由错题查询结果的一行创建，比题目多user_answer和added_at两列"""
+        return cls(*row[:11])
+
+    @classmethod
+    def from_question(cls, question, user_answer, added_at):
+        """由题目创建错题，共用题目的字段值"""
+        return cls(question.id, question.content, question.type, question.is_subquestion, question.option_text,
+                   question.difficulty, question.analysis, question.answer, question.score, user_answer, added_at)
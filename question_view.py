@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+答题界面的题目视图 - 控件只创建一次，切换题目时只更新文字、变量值和选项的显示/隐藏
+
+选项控件按需扩充，池中保留出现过的最多选项数。控件使用共享的命名字体，修改字体大小时不需要逐个重新配置
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+
+class QuestionView:
+    """可复用的题目显示区域"""
+
+    def __init__(self, content_parent, info_parent, fonts, colors, on_answer):
+        """
+        Args:
+            content_parent: 题目内容区域的父容器
+            info_parent: 题目信息（答题状态、题型、难度等）的父容器
+            fonts: 界面字体FontScheme，字体大小变化时控件自动刷新
+            colors: 颜色方案
+            on_answer: 选项变化时的回调，参数为当前题目
+        """
+        self.fonts = fonts
+        self.colors = colors
+        self.on_answer = on_answer
+        self.question = None
+
+        # 题目信息
+        self.status_label = ttk.Label(info_parent, background=colors["card"], font=fonts.bold)
+        self.type_label = ttk.Label(info_parent, background=colors["card"], font=fonts.base)
+        self.difficulty_label = ttk.Label(info_parent, background=colors["card"], font=fonts.base)
+        self.score_label = ttk.Label(info_parent, background=colors["card"], font=fonts.base)
+        self.number_label = ttk.Label(info_parent, background=colors["card"], font=fonts.base)
+        self.info_labels = [self.type_label, self.difficulty_label, self.score_label, self.number_label]
+        for label in [self.status_label] + self.info_labels:
+            label.pack(side=tk.LEFT, padx=10)
+
+        # 题目内容
+        self.card = tk.Frame(content_parent, bg=colors["card"], bd=1, relief=tk.SOLID, padx=15, pady=15)
+        self.card.pack(fill=tk.X, pady=10)
+
+        self.content_label = ttk.Label(
+            self.card,
+            wraplength=700,
+            justify=tk.LEFT,
+            background=colors["card"],
+            font=fonts.content
+        )
+        self.content_label.pack(anchor=tk.W, pady=10)
+
+        # 选项框架
+        self.options_frame = tk.Frame(self.card, bg=colors["card"])
+        self.options_frame.pack(fill=tk.BOTH, expand=True, anchor=tk.W, pady=10)
+
+        # 存储用户选择的变量
+        self.var = tk.StringVar(master=self.options_frame, value="")
+        self.check_vars = []  # [(选项字母, BooleanVar), ...]，长度与多选按钮池相同
+
+        # 选项控件池
+        self.radio_buttons = []  # [(按钮, 选项值), ...]
+        self.check_buttons = []  # [(按钮, 选项字母), ...]
+        self.visible_buttons = []  # 当前显示的按钮，按显示顺序
+        self.default_foreground = None
+
+    def _new_radio(self):
+        rb = tk.Radiobutton(
+            self.options_frame,
+            variable=self.var,
+            font=self.fonts.option,
+            anchor=tk.W,
+            bg=self.colors["card"],
+            command=self._on_change,
+            cursor="hand2"
+        )
+        if self.default_foreground is None:
+            self.default_foreground = rb.cget("foreground")
+        return rb
+
+    def _new_check(self, char):
+        var = tk.BooleanVar(master=self.options_frame)
+        self.check_vars.append((char, var))
+        cb = tk.Checkbutton(
+            self.options_frame,
+            variable=var,
+            font=self.fonts.option,
+            anchor=tk.W,
+            bg=self.colors["card"],
+            command=self._on_change,
+            cursor="hand2"
+        )
+        if self.default_foreground is None:
+            self.default_foreground = cb.cget("foreground")
+        return cb
+
+    def _on_change(self):
+        if self.question is not None:
+            self.on_answer(self.question)
+
+    def show(self, question, user_answer, display_number, total):
+        """
+        显示一道题目
+
+        Args:
+            question: 题目
+            user_answer: 用户之前的答案，未作答时为None
+            display_number: 题目显示编号
+            total: 题目总数
+        """
+        self.question = question
+
+        # 更新题目信息 - 包含答题状态
+        self.set_answered(bool(user_answer))
+        self.type_label.config(text=f"题型: {question.type}")
+        self.difficulty_label.config(text=f"难度: {question.difficulty}")
+        self.score_label.config(text=f"分数: {question.score}")
+        self.number_label.config(text=f"第 {display_number}/{total} 题")
+        self.content_label.config(text=f"题目: {question.content}")
+
+        # 根据题型显示不同的选项
+        wanted = []
+        if question.type in ["单选", "判断"]:
+            # 单选题或判断题，使用Radiobutton
+            while len(self.radio_buttons) < len(question.options):
+                self.radio_buttons.append((self._new_radio(), None))
+
+            for i, option in enumerate(question.options):
+                # 对于判断题，选项显示为"正确"和"错误"
+                if question.type == "判断":
+                    display_text = option
+                    value = option
+                else:
+                    display_text = f"{chr(65 + i)}. {option}"
+                    value = chr(65 + i)
+
+                rb = self.radio_buttons[i][0]
+                rb.config(text=display_text, value=value, state=tk.NORMAL,
+                          foreground=self.default_foreground, font=self.fonts.option)
+                self.radio_buttons[i] = (rb, value)
+                wanted.append(rb)
+
+            # 恢复之前的选择，新题目不选中任何选项
+            self.var.set(user_answer or "")
+        elif question.type == "多选":
+            # 多选题，使用Checkbutton
+            while len(self.check_buttons) < len(question.options):
+                char = chr(65 + len(self.check_buttons))
+                self.check_buttons.append((self._new_check(char), char))
+
+            for i, option in enumerate(question.options):
+                cb, char = self.check_buttons[i]
+                cb.config(text=f"{char}. {option}", state=tk.NORMAL,
+                          foreground=self.default_foreground, font=self.fonts.option)
+                self.check_vars[i][1].set(bool(user_answer) and char in user_answer)
+                wanted.append(cb)
+
+        # 只调整需要显示/隐藏的按钮
+        for button in self.visible_buttons:
+            if button not in wanted:
+                button.pack_forget()
+        for button in wanted:
+            if button not in self.visible_buttons:
+                button.pack(fill=tk.X, pady=5, padx=5)
+        self.visible_buttons = wanted
+
+    def get_answer(self, question_type):
+        """获取用户答案"""
+        if question_type in ["单选", "判断"]:
+            return self.var.get()
+        elif question_type == "多选":
+            count = len(self.question.options) if self.question else 0
+            return "".join([char for char, var in self.check_vars[:count] if var.get()])
+        return ""
+
+    def set_answered(self, answered):
+        """更新答题状态 - 未答/已答"""
+        self.status_label.config(
+            text="已答" if answered else "未答",
+            foreground=self.colors["success"] if answered else self.colors["danger"]
+        )
+
+    def show_analysis(self, question, user_answer):
+        """禁用选项，正确答案显示为绿色，用户选择的错误答案显示为红色"""
+        buttons = self.radio_buttons if question.type in ["单选", "判断"] else self.check_buttons
+        for button, value in buttons[:len(self.visible_buttons)]:
+            # 禁用选项，防止再次修改
+            button.config(state=tk.DISABLED)
+
+            # 正确答案高亮显示为绿色
+            if value in question.answer:
+                button.config(foreground=self.colors["success"],
+                              font=self.fonts.bold)
+            # 用户选择的错误答案显示为红色
+            elif value in user_answer and value not in question.answer:
+                button.config(foreground=self.colors["danger"],
+                              font=self.fonts.bold)
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+考试结果界面的延迟渲染 - 成绩统计先显示，题目结果在标签页第一次被选中时才分批创建
+
+每批之间通过after()让出事件循环，大试卷也不会阻塞成绩的显示和界面响应
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+# 每批创建的题目结果数量
+CHUNK_SIZE = 20
+
+# 两批之间的间隔（毫秒），让界面有机会重绘和处理输入
+CHUNK_DELAY = 1
+
+
+class ChunkedRenderer:
+    """通过after()分批调用render_item"""
+
+    def __init__(self, widget, items, render_item, chunk_size=CHUNK_SIZE):
+        """
+        Args:
+            widget: 用于调度after()的控件，控件销毁后停止渲染
+            items: 要渲染的项目列表
+            render_item: 渲染一个项目的函数，参数为项目
+            chunk_size: 每批渲染的数量
+        """
+        self.widget = widget
+        self.items = items
+        self.render_item = render_item
+        self.chunk_size = chunk_size
+        self.position = 0
+        self.after_id = None
+
+    @property
+    def done(self):
+        """是否已全部渲染"""
+        return self.position >= len(self.items)
+
+    def start(self, delay=CHUNK_DELAY):
+        """开始分批渲染"""
+        if self.after_id is None and not self.done:
+            self.after_id = self.widget.after(delay, self._step)
+
+    def cancel(self):
+        """停止渲染"""
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+    def _step(self):
+        self.after_id = None
+        if not self.widget.winfo_exists():
+            return
+
+        end = min(self.position + self.chunk_size, len(self.items))
+        for item in self.items[self.position:end]:
+            self.render_item(item)
+        self.position = end
+
+        if not self.done:
+            self.after_id = self.widget.after(CHUNK_DELAY, self._step)
+
+
+class LazyResultNotebook:
+    """按题型分标签页的结果列表，标签页第一次被选中时才开始创建内容"""
+
+    def __init__(self, parent, colors, render_item, on_mouse_wheel):
+        """
+        Args:
+            parent: 父容器
+            colors: 颜色方案
+            render_item: 创建一个结果的函数，参数为(滚动区域, 项目)
+            on_mouse_wheel: 鼠标滚轮处理函数，参数为(事件, Canvas)
+        """
+        self.colors = colors
+        self.render_item = render_item
+        self.on_mouse_wheel = on_mouse_wheel
+        self.tabs = []  # [{"canvas": ..., "frame": ..., "items": ..., "renderer": ...}, ...]
+
+        self.notebook = ttk.Notebook(parent)
+        self.notebook.bind("<<NotebookTabChanged>>", lambda e: self.show_current())
+
+    def add_tab(self, title, items):
+        """添加一个标签页，只创建滚动区域，不创建内容"""
+        tab_frame = tk.Frame(self.notebook, bg=self.colors["bg"])
+        self.notebook.add(tab_frame, text=title)
+
+        canvas = tk.Canvas(tab_frame, bg=self.colors["bg"])
+        scrollbar = ttk.Scrollbar(tab_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = tk.Frame(canvas, bg=self.colors["bg"])
+
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+        )
+
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        self.tabs.append({"canvas": canvas, "frame": scrollable_frame, "items": items, "renderer": None})
+
+    def show_current(self):
+        """当前标签页第一次显示时开始分批创建内容，并把鼠标滚轮绑定到它"""
+        if not self.tabs or not self.notebook.winfo_exists():
+            return
+
+        tab = self.tabs[self.notebook.index("current")]
+        canvas = tab["canvas"]
+        canvas.bind_all("<MouseWheel>", lambda e: self.on_mouse_wheel(e, canvas))
+
+        if tab["renderer"] is None:
+            frame = tab["frame"]
+            tab["renderer"] = ChunkedRenderer(frame, tab["items"], lambda item: self.render_item(frame, item))
+            tab["renderer"].start()
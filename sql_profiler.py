@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+SQL语句统计 - 按语句模板汇总执行次数、耗时和行数，退出时输出按耗时排序的报告
+
+设置环境变量EXERCISER_SQL_PROFILE=1或使用--sql-profile参数启动时启用。
+连接的trace回调记录SQLite实际执行的每条语句（包括隐式的BEGIN/COMMIT和executemany的每一行），
+游标记录execute和读取结果的耗时，以及读取或修改的行数。
+语句中的字面值替换为?，同一模板的语句合并统计；未启用时connect()与sqlite3.connect()相同
+"""
+
+import atexit
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+# 启用统计的环境变量和命令行参数
+ENV_VAR = "EXERCISER_SQL_PROFILE"
+FLAG = "--sql-profile"
+
+# 报告追加写入的文件和报告中的模板数量
+REPORT_FILE = "exerciser_sql_profile.log"
+REPORT_TOP = 30
+
+_STRING = re.compile(r"\b[xX]'[0-9a-fA-F]*'|'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+
+
+def profile_enabled(argv=None):
+    """是否启用SQL语句统计"""
+    argv = sys.argv if argv is None else argv
+    return FLAG in argv or os.environ.get(ENV_VAR, "") not in ("", "0")
+
+
+# 在导入时确定
+ENABLED = profile_enabled()
+
+
+def statement_template(sql):
+    """语句模板：字面值替换为?，连续的?列表合并，空白合并为一个空格"""
+    template = _STRING.sub("?", sql)
+    template = _NUMBER.sub("?", template)
+    template = _SPACE.sub(" ", template).strip()
+    return _PLACEHOLDER_LIST.sub("?, ...", template)
+
+
+class StatementStats:
+    """一个语句模板的统计"""
+
+    __slots__ = ("executions", "calls", "seconds", "rows")
+
+    def __init__(self):
+        self.executions = 0  # SQLite执行次数（trace回调）
+        self.calls = 0  # execute/executemany调用次数
+        self.seconds = 0.0  # execute和读取结果的耗时
+        self.rows = 0  # 读取或修改的行数
+
+
+class SqlProfiler:
+    """多个连接、多个线程共用的语句统计"""
+
+    def __init__(self):
+        self.stats = {}  # {模板: StatementStats}
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+
+    def add(self, template, executions=0, calls=0, seconds=0.0, rows=0):
+        with self.lock:
+            stats = self.stats.get(template)
+            if stats is None:
+                stats = self.stats[template] = StatementStats()
+            stats.executions += executions
+            stats.calls += calls
+            stats.seconds += seconds
+            stats.rows += rows
+
+    def on_trace(self, sql):
+        """连接的trace回调，参数为展开了参数的语句"""
+        self.add(statement_template(sql), executions=1)
+
+    def report(self, top=REPORT_TOP):
+        """按总耗时排序的报告文本"""
+        with self.lock:
+            items = sorted(self.stats.items(), key=lambda item: (item[1].seconds, item[1].executions), reverse=True)
+        total_executions = sum(stats.executions for _, stats in items)
+        total_seconds = sum(stats.seconds for _, stats in items)
+
+        lines = [
+            f"SQL语句统计 {datetime.now().isoformat(timespec='seconds')}，"
+            f"运行 {time.perf_counter() - self.started:.1f} 秒，{len(items)} 个模板，"
+            f"执行 {total_executions} 次，耗时 {total_seconds * 1000:.1f} ms",
+            f"{'耗时ms':>10} {'执行':>8} {'调用':>8} {'行数':>10}  语句",
+        ]
+        for template, stats in items[:top]:
+            lines.append(f"{stats.seconds * 1000:10.1f} {stats.executions:8d} {stats.calls:8d} "
+                         f"{stats.rows:10d}  {template[:200]}")
+        return "\n".join(lines)
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """记录execute和读取结果耗时、行数的游标"""
+
+    template = None
+
+    def execute(self, sql, parameters=()):
+        return self._run(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._run(super().executemany, sql, seq_of_parameters)
+
+    def _run(self, method, sql, parameters):
+        self.template = statement_template(sql)
+        start = time.perf_counter()
+        try:
+            return method(sql, parameters)
+        finally:
+            # 查询的rowcount为-1，查询的行数在读取结果时统计
+            _profiler.add(self.template, calls=1, seconds=time.perf_counter() - start,
+                          rows=max(self.rowcount, 0))
+
+    def _fetched(self, start, rows):
+        if self.template is not None:
+            _profiler.add(self.template, seconds=time.perf_counter() - start, rows=rows)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(start, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(start, len(rows))
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(start, 0)
+            raise
+        self._fetched(start, 1)
+        return row
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """默认创建ProfiledCursor的连接，conn.execute()也使用它"""
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+
+_profiler = SqlProfiler()
+_report_registered = False
+_report_lock = threading.Lock()
+
+
+def write_report():
+    """输出报告并追加写入REPORT_FILE"""
+    text = _profiler.report()
+    print(text)
+    try:
+        with open(REPORT_FILE, "a", encoding="utf-8") as f:
+            f.write(text + "\n\n")
+    except OSError as e:
+        print(f"写入SQL语句统计失败: {str(e)}")
+
+
+def connect(database, **kwargs):
+    """
+    打开数据库连接，启用统计时返回记录语句的连接
+
+    Args:
+        database: 数据库文件路径
+        kwargs: sqlite3.connect()的其他参数
+    """
+    global _report_registered
+    if not ENABLED:
+        return sqlite3.connect(database, **kwargs)
+
+    conn = sqlite3.connect(database, factory=ProfiledConnection, **kwargs)
+    conn.set_trace_callback(_profiler.on_trace)
+    with _report_lock:
+        if not _report_registered:
+            _report_registered = True
+            atexit.register(write_report)
+    return conn
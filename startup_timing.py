@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+启动耗时统计 - 记录进程启动、首次绘制、题库就绪等阶段的时间
+
+设置环境变量EXERCISER_STARTUP_TIMING=1或使用--startup-timing参数启动时，在题库就绪后输出报告
+"""
+
+import os
+import sys
+import time
+
+# 启用统计的环境变量和命令行参数
+ENV_VAR = "EXERCISER_STARTUP_TIMING"
+FLAG = "--startup-timing"
+
+# 本模块由main.py最先导入，以导入时间近似进程启动时间
+PROCESS_START = time.perf_counter()
+
+
+def timing_enabled(argv=None):
+    """是否启用启动耗时统计"""
+    argv = sys.argv if argv is None else argv
+    return FLAG in argv or os.environ.get(ENV_VAR, "") not in ("", "0")
+
+
+class StartupTimer:
+    """启动各阶段的时间点"""
+
+    def __init__(self, enabled, start=PROCESS_START):
+        self.enabled = enabled
+        self.start = start
+        self.marks = []  # [(阶段, 时间, 说明), ...]
+        self.reported = False
+
+    def mark(self, stage, note=""):
+        """记录一个阶段完成的时间，同一阶段只记录第一次"""
+        if not self.enabled or any(name == stage for name, _, _ in self.marks):
+            return
+        self.marks.append((stage, time.perf_counter(), note))
+
+    def report(self):
+        """输出启动耗时报告，只输出一次"""
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+
+        print("启动耗时（从进程启动开始）:")
+        for stage, moment, note in self.marks:
+            line = f"  {stage}: {(moment - self.start) * 1000:.1f} ms"
+            print(f"{line} ({note})" if note else line)
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""测试公共设置：模块都在仓库根目录下，测试使用临时目录中的数据库"""
+
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_migrations import migrate  # noqa: E402
+
+# 合成题库：(题型, 选项, 答案, 分数)
+QUESTIONS = [
+    ("单选", "A|B|C|D", "A", 2),
+    ("判断", "", "正确", 1),
+    ("多选", "A|B|C|D", "AC", 3),
+    ("单选", "A|B|C|D", "B", 2),
+    ("判断", "", "错误", 1),
+    ("多选", "A|B|C|D", "BD", 3),
+    ("单选", "A|B|C|D", "C", 2),
+]
+
+
+@pytest.fixture
+def conn(tmp_path):
+    """已升级到最新结构、包含一个题库的临时数据库，题库ID为1"""
+    conn = sqlite3.connect(str(tmp_path / "test.db"))
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    migrate(conn)
+    conn.execute("INSERT INTO question_banks (name, is_last_used) VALUES ('测试题库', 1)")
+    conn.executemany(
+        "INSERT INTO questions (bank_id, content, type, options, difficulty, analysis, answer, score) "
+        "VALUES (1, ?, ?, ?, '中', '', ?, ?)",
+        [(f"题目{i}", question_type, options, answer, score)
+         for i, (question_type, options, answer, score) in enumerate(QUESTIONS)]
+    )
+    conn.commit()
+    yield conn
+    conn.close()
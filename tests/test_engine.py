@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""无界面刷题引擎：练习顺序、判分、错题集顺序和完整的考试流程"""
+
+from datetime import datetime
+
+import pytest
+
+from bank_store import load_questions
+from exam_engine import ExamEngine
+from exam_paper import UNANSWERED, grade_exam
+from practice_session import RANDOM, SEQUENCE, PracticeSession, practice_order
+from question_index import QuestionIndex
+from wrong_set import WrongSet, add_wrong_questions, fetch_wrong_page, load_all_wrong_questions
+
+
+def reverse(questions):
+    """确定性的打乱函数"""
+    questions.reverse()
+
+
+def first(population, count):
+    """确定性的抽样函数"""
+    return list(population[:count])
+
+
+def types_of(questions):
+    return [question.type for question in questions]
+
+
+def test_sequence_order_groups_by_type(conn):
+    index = QuestionIndex(load_questions(conn, 1))
+    questions, reshuffled = practice_order(index, SEQUENCE)
+
+    assert not reshuffled
+    assert types_of(questions) == ["单选"] * 3 + ["多选"] * 2 + ["判断"] * 2
+    assert [question.id for question in questions] == [1, 4, 7, 3, 6, 2, 5]
+
+
+def test_random_order_reshuffles_within_types(conn):
+    index = QuestionIndex(load_questions(conn, 1))
+    questions, reshuffled = practice_order(index, RANDOM, shuffle=reverse)
+
+    assert reshuffled
+    assert [question.id for question in questions] == [7, 4, 1, 6, 3, 5, 2]
+
+
+def test_random_order_resumes_saved_order(conn):
+    index = QuestionIndex(load_questions(conn, 1))
+    saved = [5, 2, 7, 1, 4, 3, 6]
+    questions, reshuffled = practice_order(index, RANDOM, saved, reshuffle=False)
+
+    assert not reshuffled
+    assert [question.id for question in questions] == saved
+
+
+def test_random_order_reshuffles_when_saved_order_is_stale(conn):
+    index = QuestionIndex(load_questions(conn, 1))
+    questions, reshuffled = practice_order(index, RANDOM, [1, 2, 3], reshuffle=False, shuffle=reverse)
+
+    assert reshuffled
+    assert len(questions) == len(index)
+
+
+def test_practice_order_rejects_unknown_mode(conn):
+    with pytest.raises(ValueError):
+        practice_order(QuestionIndex(load_questions(conn, 1)), "exam")
+
+
+def test_engine_resumes_practice_position_and_answers(conn):
+    engine = ExamEngine(conn)
+    session = engine.start_practice(RANDOM, shuffle=reverse)
+    session.current_index = 3
+    session.record_answer(session.questions[0].id, "A")
+    engine.save_answers(session)
+
+    resumed = ExamEngine(conn).start_practice(RANDOM, reshuffle=False)
+    assert resumed.question_ids() == session.question_ids()
+    assert resumed.current_index == 3
+    assert resumed.user_answers == {session.questions[0].id: "A"}
+
+    reshuffled = ExamEngine(conn).start_practice(RANDOM, reshuffle=True, shuffle=reverse)
+    assert reshuffled.current_index == 0
+
+
+def test_grade_exam_totals_and_wrong_entries(conn):
+    questions = load_questions(conn, 1)
+    session = PracticeSession(1, "exam", questions)
+    # 题目1答对(2分)，题目2答错，题目3答对(3分)，其余未答
+    answers = {1: "A", 2: "错误", 3: "AC"}
+
+    results, wrong_entries = grade_exam(session.questions, answers, session.numbering)
+
+    assert results["total"] == 7
+    assert results["correct"] == 2
+    assert results["wrong"] == 5
+    assert results["scores"] == 5.0
+    assert results["total_scores"] == 14.0
+    assert results[2]["user_answer"] == "错误"
+    assert results[4]["user_answer"] == UNANSWERED
+    assert results[3]["number"] == session.numbering.number(2)
+    assert wrong_entries == [(2, "错误"), (4, ""), (5, ""), (6, ""), (7, "")]
+
+
+def test_wrong_set_order_matches_database_pages(conn):
+    index = QuestionIndex(load_questions(conn, 1))
+    wrong_set = WrongSet()
+
+    for added_at, entries in [(datetime(2024, 1, 1, 8), [(3, "A"), (1, "B")]),
+                              (datetime(2024, 1, 2, 8), [(6, "A"), (2, "错误")])]:
+        entries = wrong_set.new_entries(entries)
+        add_wrong_questions(conn, 1, entries, added_at)
+        assert wrong_set.add_entries(index, entries, added_at)
+
+    expected = [6, 2, 3, 1]
+    assert [question.id for question in wrong_set] == expected
+    assert [question.id for question in fetch_wrong_page(conn, 1, limit=10)] == expected
+    assert [question.id for question in WrongSet(load_all_wrong_questions(conn, 1))] == expected
+
+    # 键集分页从上一页最后一道错题之后继续
+    first_page = fetch_wrong_page(conn, 1, limit=2)
+    last = first_page[-1]
+    second_page = fetch_wrong_page(conn, 1, (last.added_at, last.id), limit=2)
+    assert [question.id for question in first_page + second_page] == expected
+
+
+def test_engine_exam_flow(conn):
+    engine = ExamEngine(conn)
+    assert engine.bank_id == 1
+    assert len(engine.index) == 7
+
+    session = engine.create_exam({"single": 2, "multiple": 1, "judge": 1}, sample=first)
+    assert [question.id for question in session.questions] == [1, 4, 3, 2]
+
+    session.record_answer(1, "A")
+    session.record_answer(4, "C")
+    session.record_answer(3, "AC")
+    results = engine.calculate_exam_result(session, added_at=datetime(2024, 1, 1, 8))
+
+    assert (results["correct"], results["wrong"]) == (2, 2)
+    assert (results["scores"], results["total_scores"]) == (5.0, 8.0)
+
+    # 答错和未答的题目加入错题集，内存与数据库一致
+    assert sorted(question.id for question in engine.wrong_set) == [2, 4]
+    assert [question.id for question in engine.wrong_set] == \
+        [question.id for question in load_all_wrong_questions(conn, 1)]
+    assert engine.wrong_set.get(4).user_answer == "C"
+
+    # 已在错题集中的题目不再写入
+    assert engine.add_wrong_questions([(2, "正确"), (4, "A")]) == 0
+    assert engine.add_wrong_questions([(5, "正确")]) == 1
+    assert ExamEngine(conn).wrong_set.questions()[0].id == 5
+
+    # 组卷配置已保存
+    config = dict(conn.execute("SELECT key, value FROM config WHERE key LIKE '%_count'").fetchall())
+    assert config == {"single_count": "2", "multiple_count": "1", "judge_count": "1"}
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+操作耗时跟踪 - 记录关键操作和后台数据库请求的耗时，以及事件循环的延迟
+
+设置环境变量EXERCISER_TRACE=1或使用--trace参数启动时启用：耗时写入滚动日志文件，
+按F12显示/隐藏调试浮窗，浮窗显示最近的操作耗时和事件循环延迟。
+未启用时traced()直接返回原函数，record()只检查一次开关，几乎没有开销
+"""
+
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+import tkinter as tk
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+# 启用跟踪的环境变量和命令行参数
+ENV_VAR = "EXERCISER_TRACE"
+FLAG = "--trace"
+
+# 日志文件，超过LOG_MAX_BYTES时滚动，保留LOG_BACKUPS个旧文件
+LOG_FILE = "exerciser_trace.log"
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+
+# 浮窗显示的最近操作数量
+RECENT_COUNT = 15
+
+# 事件循环延迟的检测间隔和浮窗的刷新间隔（毫秒）
+LAG_INTERVAL = 100
+OVERLAY_INTERVAL = 500
+
+# 超过该值的事件循环延迟写入日志（毫秒）
+LAG_LOG_THRESHOLD = 50
+
+
+def trace_enabled(argv=None):
+    """是否启用跟踪"""
+    argv = sys.argv if argv is None else argv
+    return FLAG in argv or os.environ.get(ENV_VAR, "") not in ("", "0")
+
+
+# 在导入时确定，traced()据此决定是否包装函数
+ENABLED = trace_enabled()
+
+_recent = deque(maxlen=RECENT_COUNT)  # [(操作, 耗时毫秒, 线程名), ...]
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def _get_logger():
+    """第一次记录时创建日志文件"""
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            logger = logging.getLogger("exerciser.trace")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            try:
+                handler = RotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS,
+                                              encoding="utf-8")
+            except OSError as e:
+                print(f"无法创建跟踪日志: {str(e)}")
+                handler = logging.NullHandler()
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            logger.addHandler(handler)
+            _logger = logger
+    return _logger
+
+
+def record(name, start):
+    """
+    记录一个操作的耗时，可在任意线程中调用
+
+    Args:
+        name: 操作名称
+        start: 开始时的time.perf_counter()
+    """
+    if not ENABLED:
+        return
+    elapsed = (time.perf_counter() - start) * 1000
+    thread = threading.current_thread().name
+    _recent.append((name, elapsed, thread))
+    _get_logger().info("%s %.2f ms [%s]", name, elapsed, thread)
+
+
+def traced(name=None):
+    """
+    记录函数耗时的装饰器，未启用跟踪时返回原函数
+
+    Args:
+        name: 操作名称，默认为函数名
+    """
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(label, start)
+        return wrapper
+    return decorate
+
+
+def recent():
+    """最近的操作耗时 [(操作, 耗时毫秒, 线程名), ...]，最新的在最后"""
+    return list(_recent)
+
+
+class LoopLagMonitor:
+    """定时检测事件循环的延迟：实际执行时间比预定时间晚多少"""
+
+    def __init__(self, root, interval=LAG_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.last_lag = 0.0  # 最近一次的延迟（毫秒）
+        self.max_lag = 0.0  # 浮窗上次刷新以来的最大延迟（毫秒）
+        self._expected = time.perf_counter() + interval / 1000
+        self.root.after(interval, self._tick)
+
+    def _tick(self):
+        now = time.perf_counter()
+        self.last_lag = max(0.0, (now - self._expected) * 1000)
+        self.max_lag = max(self.max_lag, self.last_lag)
+        if self.last_lag > LAG_LOG_THRESHOLD:
+            _get_logger().info("事件循环延迟 %.1f ms", self.last_lag)
+
+        self._expected = now + self.interval / 1000
+        self.root.after(self.interval, self._tick)
+
+    def take_max(self):
+        """返回并清零最大延迟"""
+        value, self.max_lag = self.max_lag, 0.0
+        return value
+
+
+class TraceOverlay:
+    """显示最近操作耗时和事件循环延迟的调试浮窗，按F12显示/隐藏"""
+
+    def __init__(self, root, monitor):
+        self.root = root
+        self.monitor = monitor
+        self.visible = False
+        self.window = None
+        self.label = None
+        self.root.bind_all("<F12>", lambda event: self.toggle(), add="+")
+        self.root.after(OVERLAY_INTERVAL, self._refresh)
+
+    def toggle(self):
+        """显示或隐藏浮窗"""
+        self.visible = not self.visible
+        if self.visible:
+            self._refresh_text()
+        elif self.window is not None and self.window.winfo_exists():
+            self.window.destroy()
+
+    def _create(self):
+        self.window = tk.Toplevel(self.root)
+        self.window.title("耗时跟踪")
+        self.window.attributes("-topmost", True)
+        self.window.geometry(f"+{self.root.winfo_rootx() + 20}+{self.root.winfo_rooty() + 20}")
+        self.label = tk.Label(self.window, justify=tk.LEFT, anchor=tk.NW, font=("Courier", 9),
+                              bg="#202124", fg="#e8eaed", padx=8, pady=6)
+        self.label.pack(fill=tk.BOTH, expand=True)
+
+    def _refresh(self):
+        if self.visible:
+            self._refresh_text()
+        self.root.after(OVERLAY_INTERVAL, self._refresh)
+
+    def _refresh_text(self):
+        # 切换界面时根窗口的子窗口会被全部销毁，需要时重新创建
+        if self.window is None or not self.window.winfo_exists():
+            self._create()
+
+        lines = [f"事件循环延迟: 当前 {self.monitor.last_lag:.0f} ms, 最大 {self.monitor.take_max():.0f} ms", ""]
+        for name, elapsed, thread in reversed(recent()):
+            where = "" if thread == "MainThread" else f" [{thread}]"
+            lines.append(f"{elapsed:8.1f} ms  {name}{where}")
+        self.label.config(text="\n".join(lines))
+
+
+def start_tracing(root):
+    """启用跟踪时开始检测事件循环延迟并绑定调试浮窗，返回浮窗，未启用时返回None"""
+    if not ENABLED:
+        return None
+    _get_logger().info("开始跟踪")
+    return TraceOverlay(root, LoopLagMonitor(root))
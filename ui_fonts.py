@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+界面字体 - 随字体大小设置变化的命名字体
+
+控件和ttk样式都引用这里的命名字体，修改字体大小时只重新配置这几个字体对象，
+Tk会自动刷新所有使用它们的控件，不需要逐个修改或重建控件
+"""
+
+import tkinter.font as tkfont
+
+# 默认字体大小
+DEFAULT_FONT_SIZE = 10
+
+# 可设置的字体大小范围
+MIN_FONT_SIZE = 8
+MAX_FONT_SIZE = 20
+
+
+class FontScheme:
+    """一组命名字体，大小都相对于基础字体大小"""
+
+    # 名称: (相对基础大小的增量, 粗细)
+    SPECS = {
+        "base": (0, "normal"),  # 普通文字、按钮
+        "bold": (0, "bold"),  # 答题状态、解析中高亮的选项
+        "option": (1, "normal"),  # 选项、解析
+        "content": (2, "normal"),  # 题目内容
+        "section": (2, "bold"),  # 区域标题
+        "heading": (4, "bold"),  # 答题界面标题栏
+        "header": (6, "bold"),  # Header.TLabel
+        "title": (14, "bold"),  # Title.TLabel
+    }
+
+    def __init__(self, root, family, size=DEFAULT_FONT_SIZE):
+        """
+        Args:
+            root: Tk根窗口
+            family: 字体
+            size: 基础字体大小
+        """
+        self.family = family
+        self.size = size
+        self.fonts = {}
+        for name, (delta, weight) in self.SPECS.items():
+            self.fonts[name] = tkfont.Font(root, family=family, size=size + delta, weight=weight)
+        # 进度方框中的题号，不小于8
+        self.fonts["small"] = tkfont.Font(root, family=family, size=self.small_size(size))
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["fonts"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    @staticmethod
+    def small_size(size):
+        """进度方框中题号的字体大小"""
+        return max(8, size - 2)
+
+    def set_size(self, size):
+        """修改基础字体大小，返回是否有变化"""
+        if size == self.size:
+            return False
+        self.size = size
+        for name, (delta, _) in self.SPECS.items():
+            self.fonts[name].configure(size=size + delta)
+        self.fonts["small"].configure(size=self.small_size(size))
+        return True
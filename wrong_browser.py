@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""
+错题浏览 - 每次只创建一页错题卡片，按需通过后台数据库线程读取下一页
+
+移除错题时只销毁对应的卡片并重新编号本页后面的卡片，滚动位置保持不变
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from wrong_set import PAGE_SIZE, fetch_wrong_page, page_key
+
+# 错题卡片背景色
+CARD_BG = "#fff3e0"
+
+
+class WrongQuestionBrowser:
+    """分页的错题浏览区域"""
+
+    def __init__(self, parent, db_worker, bank_id, total, font_family, colors, on_remove, on_empty,
+                 count_label=None):
+        """
+        Args:
+            parent: 父容器
+            db_worker: 后台数据库线程
+            bank_id: 题库ID
+            total: 错题总数
+            font_family: 字体
+            colors: 颜色方案
+            on_remove: 移除错题的函数，参数为(题目, 移除成功后的回调)
+            on_empty: 错题全部移除后的回调
+            count_label: 显示错题总数的标签，移除错题后更新
+        """
+        self.db_worker = db_worker
+        self.bank_id = bank_id
+        self.total = total
+        self.font_family = font_family
+        self.colors = colors
+        self.on_remove = on_remove
+        self.on_empty = on_empty
+        self.count_label = count_label
+
+        # 每页的起点和起始编号，page_keys[i]为第i页的起点（第0页为None）
+        self.page_keys = [None]
+        self.page_starts = [1]
+        self.page = 0
+        self.has_next = False
+        self.cards = []  # 当前页的卡片 [(题目, 卡片, 编号标签), ...]
+        self.removing = set()  # 正在移除的题目ID，避免重复点击
+
+        # 翻页栏
+        nav_frame = tk.Frame(parent, bg=colors["bg"])
+        nav_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=20, pady=5)
+
+        self.prev_btn = tk.Button(
+            nav_frame,
+            text="上一页",
+            command=self.prev_page,
+            width=10,
+            bg="#f1f3f4",
+            activebackground=colors["hover"],
+            relief=tk.FLAT,
+            cursor="hand2"
+        )
+        self.prev_btn.pack(side=tk.LEFT, padx=10)
+
+        self.page_label = ttk.Label(nav_frame, font=(font_family, 10), background=colors["bg"])
+        self.page_label.pack(side=tk.LEFT, expand=True)
+
+        self.next_btn = tk.Button(
+            nav_frame,
+            text="下一页",
+            command=self.next_page,
+            width=10,
+            bg="#f1f3f4",
+            activebackground=colors["hover"],
+            relief=tk.FLAT,
+            cursor="hand2"
+        )
+        self.next_btn.pack(side=tk.RIGHT, padx=10)
+
+        # 滚动区域
+        self.canvas = tk.Canvas(parent, bg=colors["bg"])
+        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.canvas.yview)
+        self.scrollable_frame = tk.Frame(self.canvas, bg=colors["bg"])
+
+        self.scrollable_frame.bind(
+            "<Configure>",
+            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        )
+
+        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+
+        self.canvas.pack(side="left", fill="both", expand=True, padx=20, pady=10)
+        scrollbar.pack(side="right", fill="y")
+
+        self.load_page(0)
+
+    def load_page(self, page):
+        """在后台读取第page页，读取完成后显示"""
+        # 多读一条，用于判断是否还有下一页
+        self.db_worker.submit(
+            fetch_wrong_page, self.bank_id, self.page_keys[page], PAGE_SIZE + 1,
+            callback=lambda questions: self.show_page(page, questions),
+            errback=lambda e: print(f"加载错题失败: {str(e)}")
+        )
+
+    def show_page(self, page, questions):
+        """显示读取到的一页错题"""
+        if not self.canvas.winfo_exists():
+            return
+
+        # 本页的错题都已被移除时，显示前一页
+        if not questions and page > 0:
+            del self.page_keys[page:]
+            del self.page_starts[page:]
+            self.load_page(page - 1)
+            return
+
+        self.page = page
+        self.has_next = len(questions) > PAGE_SIZE
+        questions = questions[:PAGE_SIZE]
+
+        for _, card, _ in self.cards:
+            card.destroy()
+        self.cards = []
+
+        start = self.page_starts[page]
+        for i, question in enumerate(questions):
+            self.cards.append(self._create_card(question, start + i))
+
+        self.canvas.yview_moveto(0)
+        self._update_nav()
+
+    def next_page(self):
+        """下一页"""
+        if not self.has_next:
+            return
+
+        page = self.page + 1
+        del self.page_keys[page:]
+        del self.page_starts[page:]
+        self.page_keys.append(page_key(self.cards[-1][0]))
+        self.page_starts.append(self.page_starts[self.page] + len(self.cards))
+        self.load_page(page)
+
+    def prev_page(self):
+        """上一页"""
+        if self.page > 0:
+            self.load_page(self.page - 1)
+
+    def _update_nav(self):
+        """更新翻页栏"""
+        pages = max(1, (self.total + PAGE_SIZE - 1) // PAGE_SIZE)
+        self.page_label.config(text=f"第 {self.page + 1}/{pages} 页")
+        if self.count_label is not None:
+            self.count_label.config(text=f"共有 {self.total} 道错题")
+        self.prev_btn.config(state=tk.NORMAL if self.page > 0 else tk.DISABLED)
+        self.next_btn.config(state=tk.NORMAL if self.has_next else tk.DISABLED)
+
+    def remove(self, question):
+        """从错题集移除一道题"""
+        if question.id in self.removing:
+            return
+        self.removing.add(question.id)
+        self.on_remove(question, lambda: self.drop_card(question))
+
+    def drop_card(self, question):
+        """错题移除后只销毁对应卡片"""
+        self.removing.discard(question.id)
+        if not self.canvas.winfo_exists():
+            return
+
+        self.total -= 1
+        if self.total <= 0:
+            self.on_empty()
+            return
+
+        position = next((i for i, (q, _, _) in enumerate(self.cards) if q is question), None)
+        if position is None:
+            # 移除期间已翻到其他页
+            self._update_nav()
+            return
+
+        # 记住滚动位置（像素），卡片移除后恢复
+        top = self.canvas.canvasy(0)
+
+        _, card, _ = self.cards.pop(position)
+        card.destroy()
+
+        if not self.cards:
+            # 本页已空，重新读取本页（起点之后的错题）
+            self.load_page(self.page)
+            return
+
+        # 重新编号后面的卡片
+        start = self.page_starts[self.page]
+        for i in range(position, len(self.cards)):
+            self.cards[i][2].config(text=f"第 {start + i} 题")
+
+        self.scrollable_frame.update_idletasks()
+        bbox = self.canvas.bbox("all")
+        self.canvas.configure(scrollregion=bbox)
+        if bbox and bbox[3] > 0:
+            self.canvas.yview_moveto(top / bbox[3])
+        self._update_nav()
+
+    def _create_card(self, question, number):
+        """
+        创建一张错题卡片
+
+        Returns:
+            (题目, 卡片, 编号标签)
+        """
+        frame = tk.Frame(
+            self.scrollable_frame,
+            bd=1,
+            relief=tk.SOLID,
+            padx=15,
+            pady=15,
+            bg=CARD_BG,
+            highlightbackground="#bdbdbd",
+            highlightthickness=1
+        )
+        frame.pack(fill=tk.X, pady=10, padx=10)
+
+        # 题目信息
+        info_frame = tk.Frame(frame, bg=CARD_BG)
+        info_frame.pack(fill=tk.X, anchor=tk.W)
+
+        number_label = ttk.Label(
+            info_frame,
+            text=f"第 {number} 题",
+            font=(self.font_family, 10, "bold"),
+            background=CARD_BG
+        )
+        number_label.pack(side=tk.LEFT, padx=10)
+
+        ttk.Label(
+            info_frame,
+            text=f"题型: {question.type}",
+            font=(self.font_family, 10),
+            background=CARD_BG
+        ).pack(side=tk.LEFT, padx=10)
+
+        ttk.Label(
+            info_frame,
+            text=f"难度: {question.difficulty}",
+            font=(self.font_family, 10),
+            background=CARD_BG
+        ).pack(side=tk.LEFT, padx=10)
+
+        # 题目内容
+        ttk.Label(
+            frame,
+            text=f"题目: {question.content}",
+            font=(self.font_family, 11),
+            wraplength=700,
+            justify=tk.LEFT,
+            background=CARD_BG
+        ).pack(anchor=tk.W, pady=5)
+
+        # 选项
+        options_frame = tk.Frame(frame, bg=CARD_BG)
+        options_frame.pack(fill=tk.X, anchor=tk.W, pady=5)
+
+        user_answer = question.user_answer or ""
+        for j, option in enumerate(question.options):
+            if question.type == "判断":
+                display_text = option
+                value = option
+            else:
+                display_text = f"{chr(65 + j)}. {option}"
+                value = chr(65 + j)
+
+            # 标记正确答案和用户选择
+            fg_color = "black"
+            font_weight = "normal"
+
+            if value in question.answer:
+                fg_color = self.colors["success"]
+                font_weight = "bold"
+            elif value in user_answer:
+                fg_color = self.colors["danger"]
+                font_weight = "bold"
+
+            ttk.Label(
+                options_frame,
+                text=display_text,
+                font=(self.font_family, 10, font_weight),
+                foreground=fg_color,
+                wraplength=700,
+                justify=tk.LEFT,
+                background=CARD_BG
+            ).pack(anchor=tk.W, pady=2)
+
+        # 答案和解析
+        ttk.Label(
+            frame,
+            text=f"你的答案: {question.user_answer}",
+            font=(self.font_family, 10),
+            justify=tk.LEFT,
+            background=CARD_BG
+        ).pack(anchor=tk.W, pady=2)
+
+        ttk.Label(
+            frame,
+            text=f"正确答案: {question.answer}",
+            font=(self.font_family, 10, "bold"),
+            foreground=self.colors["success"],
+            justify=tk.LEFT,
+            background=CARD_BG
+        ).pack(anchor=tk.W, pady=2)
+
+        ttk.Label(
+            frame,
+            text=f"解析: {question.analysis}",
+            font=(self.font_family, 10),
+            wraplength=700,
+            justify=tk.LEFT,
+            background=CARD_BG
+        ).pack(anchor=tk.W, pady=2)
+
+        # 移除按钮
+        tk.Button(
+            frame,
+            text="从错题集移除",
+            command=lambda q=question: self.remove(q),
+            bg=self.colors["danger"],
+            foreground="white",
+            width=15,
+            activebackground="#d32f2f",
+            relief=tk.FLAT,
+            cursor="hand2"
+        ).pack(anchor=tk.E, pady=5)
+
+        return question, frame, number_label
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+错题集 - 数据库访问（按加入时间倒序分页读取、在一个事务中批量加入）和内存中的错题集
+
+分页使用键集分页：以上一页最后一道错题的(加入时间, 题目ID)作为下一页的起点，
+由idx_wrong_questions_bank_added索引直接定位，翻到后面的页也不需要跳过前面的行，
+翻页期间移除错题也不会使后续页错位
+"""
+
+import sqlite3
+from collections import OrderedDict
+from datetime import datetime
+
+from question_record import WrongQuestion
+
+# 错题浏览每页显示的数量
+PAGE_SIZE = 20
+
+_WRONG_QUESTION_SELECT = '''
+SELECT q.id, q.content, q.type, q.is_subquestion, q.options, q.difficulty,
+       q.analysis, q.answer, q.score, w.user_answer, w.added_at
+FROM wrong_questions w
+JOIN questions q ON w.question_id = q.id
+'''
+
+
+def page_key(question):
+    """错题在排序中的位置，作为下一页的起点"""
+    return question.added_at, question.id
+
+
+def count_wrong_questions(conn, bank_id):
+    """错题数量"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM wrong_questions WHERE bank_id = ?", (bank_id,))
+    return cursor.fetchone()[0]
+
+
+def load_all_wrong_questions(conn, bank_id):
+    """按加入时间倒序读取题库的全部错题"""
+    cursor = conn.cursor()
+    cursor.execute(
+        _WRONG_QUESTION_SELECT +
+        "WHERE w.bank_id = ? ORDER BY w.added_at DESC, w.question_id DESC",
+        (bank_id,)
+    )
+    return [WrongQuestion.from_row(row) for row in cursor.fetchall()]
+
+
+def fetch_wrong_page(conn, bank_id, after=None, limit=PAGE_SIZE):
+    """
+    读取一页错题
+
+    Args:
+        after: 上一页最后一道错题的page_key，为空时从最新的错题开始
+        limit: 最多读取的数量
+
+    Returns:
+        按加入时间倒序的错题列表
+    """
+    cursor = conn.cursor()
+    if after is None:
+        cursor.execute(
+            _WRONG_QUESTION_SELECT +
+            "WHERE w.bank_id = ? ORDER BY w.added_at DESC, w.question_id DESC LIMIT ?",
+            (bank_id, limit)
+        )
+    else:
+        cursor.execute(
+            _WRONG_QUESTION_SELECT +
+            "WHERE w.bank_id = ? AND (w.added_at, w.question_id) < (?, ?) "
+            "ORDER BY w.added_at DESC, w.question_id DESC LIMIT ?",
+            (bank_id, after[0], after[1], limit)
+        )
+    return [WrongQuestion.from_row(row) for row in cursor.fetchall()]
+
+
+def add_wrong_questions(conn, bank_id, entries, added_at=None):
+    """
+    在一个事务中把多道题加入错题集，已在错题集中的题目保持不变
+
+    Args:
+        entries: [(题目ID, 用户答案), ...]
+        added_at: 加入时间，为空时使用当前时间
+
+    Returns:
+        新加入的数量
+    """
+    if not entries:
+        return 0
+
+    now = added_at or datetime.now()
+    before = conn.total_changes
+    try:
+        conn.executemany('''
+        INSERT OR IGNORE INTO wrong_questions (bank_id, question_id, user_answer, added_at)
+        VALUES (?, ?, ?, ?)
+        ''', [(bank_id, question_id, user_answer, now) for question_id, user_answer in entries])
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    return conn.total_changes - before
+
+
+def remove_wrong_question(conn, bank_id, question_id):
+    """从错题集移除一道题，调用方负责提交事务"""
+    conn.execute(
+        "DELETE FROM wrong_questions WHERE bank_id = ? AND question_id = ?",
+        (bank_id, question_id)
+    )
+
+
+class WrongSet:
+    """
+    内存中的错题集，按加入时间倒序排列，以题目ID为键
+
+    与数据库的写入同步增删，只在启动和切换题库时从数据库重新加载
+    """
+
+    def __init__(self, questions=()):
+        self._questions = OrderedDict((question.id, question) for question in questions)
+
+    def __len__(self):
+        return len(self._questions)
+
+    def __contains__(self, question_id):
+        return question_id in self._questions
+
+    def __iter__(self):
+        return iter(self._questions.values())
+
+    def get(self, question_id):
+        """按ID查找错题，不存在时返回None"""
+        return self._questions.get(question_id)
+
+    def questions(self):
+        """按加入时间倒序的错题列表（新列表）"""
+        return list(self._questions.values())
+
+    def add(self, question, user_answer, added_at):
+        """把题目加入错题集最前面，已存在时不变"""
+        if question.id in self._questions:
+            return
+        wrong = WrongQuestion.from_question(question, user_answer, added_at)
+        self._questions[question.id] = wrong
+        self._questions.move_to_end(question.id, last=False)
+
+    def remove(self, question_id):
+        """从错题集移除，不存在时忽略"""
+        self._questions.pop(question_id, None)
+
+    def new_entries(self, entries):
+        """
+        过滤掉已在错题集中的题目，按题目ID排序
+
+        Args:
+            entries: [(题目ID, 用户答案), ...]
+
+        Returns:
+            需要写入数据库的条目
+        """
+        return sorted((entry for entry in entries if entry[0] not in self._questions),
+                      key=lambda entry: entry[0])
+
+    def add_entries(self, index, entries, added_at):
+        """
+        写入数据库成功后把同一批错题加入内存
+
+        同一批错题加入时间相同，按题目ID倒序排在最前面，与从数据库加载时的顺序一致
+
+        Args:
+            index: 题库的QuestionIndex
+            entries: new_entries()返回的条目
+            added_at: 写入数据库的加入时间
+
+        Returns:
+            是否全部加入；有题目不在题库索引中时返回False，应从数据库重新加载
+        """
+        added_at = added_at.isoformat(" ")
+        for question_id, user_answer in entries:
+            question = index.get(question_id)
+            if question is None:
+                return False
+            self.add(question, user_answer, added_at)
+        return True